@@ -0,0 +1,273 @@
+# bench_intro.py
+# Headless startup / rendering benchmarks for the intro window
+# - Runs under the "offscreen" Qt platform (no display needed)
+# - Times module import, QApplication, IntroWindow construction, each tab
+#   builder, diagram rendering (cold and disk-cached), setHtml parsing of every
+#   content block, show()-to-first-paint latency and resize relayout
+# - Checks that a hidden pre-warmed window reopens as fast after an idle
+#   release as before it (exit 1 otherwise)
+# - Reports peak RSS and compares medians against a stored baseline
+#
+# Usage:
+#   python bench_intro.py                          # print results
+#   python bench_intro.py --save-baseline          # store bench_baseline.json
+#   python bench_intro.py --baseline bench_baseline.json --threshold 0.25 \
+#       --threshold-for first_paint=0.5            # exit 1 on regression
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "bench_baseline.json")
+
+HTML_BLOCKS = (
+    "_overview_html", "_workflow_html_part1", "_workflow_html_part2",
+    "_methodology_html_part1", "_methodology_html_part2", "_data_html", "_references_html",
+)
+RESIZE_SIZES = ((1000, 780), (760, 600), (1280, 900), (900, 700))
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return float("nan")
+        return psutil.Process().memory_info().peak_wset / 2 ** 20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024.0
+
+
+def _wait_for_paint(app, widget, timeout_s: float = 5.0) -> float:
+    from PyQt5.QtCore import QEvent, QObject
+
+    class PaintProbe(QObject):
+        painted = False
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                PaintProbe.painted = True
+            return False
+
+    probe = PaintProbe()
+    widget.installEventFilter(probe)
+    start = time.perf_counter()
+    widget.show()
+    while not PaintProbe.painted and time.perf_counter() - start < timeout_s:
+        app.processEvents()
+    elapsed = _ms(start)
+    widget.removeEventFilter(probe)
+    return elapsed
+
+
+def run_once(app, intro, results: dict):
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage, QPainter, QTextDocument
+
+    def record(name, value):
+        results.setdefault(name, []).append(value)
+
+    # Construction with only the landing tab built (the default lazy path)
+    start = time.perf_counter()
+    win = intro.IntroWindow(prebuild=False)
+    record("construct.lazy", _ms(start))
+    record("first_paint", _wait_for_paint(app, win))
+
+    # Every tab builder on its own
+    for index, (title, _) in enumerate(win._tab_builders):
+        if index in win._realized:
+            continue
+        start = time.perf_counter()
+        win._realize_tab(index)
+        record(f"tab.{title}", _ms(start))
+    app.processEvents()
+
+    # Resize relayout with all tabs built, on the longest text tab
+    win.tabs.setCurrentIndex(2)
+    app.processEvents()
+    start = time.perf_counter()
+    for width, height in RESIZE_SIZES:
+        win.resize(width, height)
+        app.processEvents()
+    record("resize.step", _ms(start) / len(RESIZE_SIZES))
+    win.close()
+    win.deleteLater()
+    app.processEvents()
+
+    # Reopening a hidden pre-warmed window (intro_window / --serve), on the
+    # heaviest tab, before and after its idle release
+    win = intro.IntroWindow()
+    win.hide_on_close = True
+    win.tabs.setCurrentIndex(2)
+    win.warm_up()
+    while len(win._realized) < win.tabs.count():
+        app.processEvents()
+    _wait_for_paint(app, win)
+    win.close()
+    record("reopen.warm", _wait_for_paint(app, win))
+    win.close()
+    app.processEvents()
+    idle_since = time.monotonic() - win.release_after_s - 1
+    win._last_used = {index: idle_since for index in win._last_used}
+    win._release_idle()
+    app.processEvents()
+    record("reopen.after_release", _wait_for_paint(app, win))
+    win.hide_on_close = False
+    win.close()
+    win.deleteLater()
+    app.processEvents()
+
+    # Eager construction (all tabs) for comparison with the lazy path
+    start = time.perf_counter()
+    win = intro.IntroWindow(lazy=False)
+    record("construct.eager", _ms(start))
+    win.deleteLater()
+    app.processEvents()
+
+    # Diagram rendering straight from source, and from the disk cache
+    for name, size in (("workflow.svg", (900, 550)), ("flowchart.svg", (900, 600))):
+        image = QImage(size[0], size[1], QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        start = time.perf_counter()
+        painter = QPainter(image)
+        intro.render_asset(name, painter, image.rect())
+        painter.end()
+        record(f"svg.{name}.render", _ms(start))
+
+        intro.load_diagram_image(name, size[0], size[1], 1.0)  # warms the disk cache
+        start = time.perf_counter()
+        intro.load_diagram_image(name, size[0], size[1], 1.0)
+        record(f"svg.{name}.cached", _ms(start))
+
+    # Rich-text parsing of every content block
+    probe = intro.IntroWindow(lazy=True, prebuild=False)
+    for method in HTML_BLOCKS:
+        html = getattr(probe, method)()
+        start = time.perf_counter()
+        doc = QTextDocument()
+        doc.setHtml(html)
+        doc.setTextWidth(900)
+        doc.size()  # forces layout
+        record(f"html.{method.strip('_')}", _ms(start))
+    probe.deleteLater()
+    app.processEvents()
+
+
+def compare(current: dict, baseline: dict, threshold: float, per_metric: dict, floor_ms: float):
+    regressions = []
+    for name, value in sorted(current.items()):
+        base = baseline.get(name)
+        if base is None or name == "peak_rss_mb":
+            continue
+        limit = per_metric.get(name, threshold)
+        # Tiny timings are dominated by noise; ignore differences below floor_ms
+        if value > base * (1.0 + limit) and value - base > floor_ms:
+            regressions.append((name, base, value, limit))
+    rss_limit = per_metric.get("peak_rss_mb")
+    if rss_limit is not None and "peak_rss_mb" in baseline:
+        if current["peak_rss_mb"] > baseline["peak_rss_mb"] * (1.0 + rss_limit):
+            regressions.append(("peak_rss_mb", baseline["peak_rss_mb"], current["peak_rss_mb"], rss_limit))
+    return regressions
+
+
+def _parse_thresholds(items) -> dict:
+    out = {}
+    for item in items or ():
+        name, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"--threshold-for expects NAME=FRACTION, got {item!r}")
+        out[name] = float(value)
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark intro window startup and rendering")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per metric (median is reported)")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help=f"store results as baseline (default {os.path.basename(DEFAULT_BASELINE)})")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as regressed")
+    parser.add_argument("--threshold-for", action="append", metavar="NAME=FRACTION",
+                        help="per-metric threshold override (repeatable; peak_rss_mb enables the RSS check)")
+    parser.add_argument("--floor-ms", type=float, default=2.0,
+                        help="ignore absolute differences smaller than this")
+    parser.add_argument("--json", metavar="PATH", help="write medians as JSON")
+    args = parser.parse_args(argv)
+
+    # Private cache directory so "render" really measures a cold render
+    cache_dir = tempfile.mkdtemp(prefix="wa_intro_bench_")
+    os.environ["WA_INTRO_CACHE"] = cache_dir
+    try:
+        start = time.perf_counter()
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        qapp_ms = _ms(start)
+
+        start = time.perf_counter()
+        sys.path.insert(0, BASE_DIR)
+        import intro
+        import_ms = _ms(start)
+
+        samples = {}
+        for _ in range(max(1, args.repeat)):
+            run_once(app, intro, samples)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    medians = {name: statistics.median(values) for name, values in samples.items()}
+    medians["startup.qapplication"] = qapp_ms
+    medians["startup.import_intro"] = import_ms
+    medians["peak_rss_mb"] = peak_rss_mb()
+
+    width = max(len(n) for n in medians)
+    for name in sorted(medians):
+        unit = "MB" if name == "peak_rss_mb" else "ms"
+        print(f"{name:<{width}}  {medians[name]:9.2f} {unit}")
+
+    # An idle release must not cost a hidden pre-warmed window its instant reopen
+    status = 0
+    warm, released = medians["reopen.warm"], medians["reopen.after_release"]
+    if released - warm > max(args.floor_ms, warm):
+        print(f"\nSLOW REOPEN: {warm:.2f} ms warm, {released:.2f} ms after an idle release")
+        status = 1
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(medians, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(medians, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(medians, baseline, args.threshold,
+                              _parse_thresholds(args.threshold_for), args.floor_ms)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for name, base, value, limit in regressions:
+                print(f"  {name}: {base:.2f} -> {value:.2f} (+{(value / base - 1) * 100:.0f}%, limit {limit * 100:.0f}%)")
+            return 1
+        print("\nno regressions against baseline")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
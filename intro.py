@@ -2,27 +2,1357 @@
 # WA+ Water Accounting Framework (IWMI) - Intro / Welcome window
 # - Overview & Workflow refined for both non-technical and technical users
 # - Methodology shown as flowcharts + concise details
-# - Data Sources tab with authoritative links
+# - Data Sources tab: sortable, filterable catalog (data_catalog.json) with authoritative links
 # - References & Credits tab
 # - Uses QTextBrowser (links work), styled, scrollable
-
+# - Tabs are built lazily on first selection, the rest prebuilt in idle time
+# - Diagrams are rendered once and cached on disk as pre-scaled pixmaps (intro_cache)
+# - Assets load by name from the packed bundle when built (intro_assets)
+# - Opt-in Chrome-trace spans via --trace / WA_INTRO_TRACE (intro_trace)
+# - Fast start: QtSvg imported on demand, last Overview frame shown as a splash
+# - Long Workflow/Methodology text uses RichTextBlock (width-bucketed, debounced layout)
+# - Diagrams are zoomable: visible tiles rendered off-thread per level of detail
+# - Diagram previews decode on a worker thread behind a sized placeholder
+# - Previews are kept per device pixel ratio; moving to a screen with a new ratio
+#   re-renders in the background while the current variant stays on screen
+# - Search box (Ctrl+F) over all tabs, backed by a cached inverted index (intro_search)
+# - Text lives in per-locale content bundles loaded lazily (intro_content, --locale)
+# - Headless --export {html,pdf} (intro_export) and --check-links (intro_links) modes
+# - Embeddable: intro_window()/open_intro() reuse one hidden, pre-warmed window per locale
+# - Idle tabs and decoded images are released after WA_INTRO_RELEASE_S; memory_report() per tab
+# - --serve keeps a pre-built window in a background process per user session,
+#   driven over a local socket by the Qt-free intro_client
+# - Methodology tab: live calculator for equations (1)-(3) over gridded sample
+#   inputs (intro_balance, numpy optional)
+# - Methodology tab / --soil-moisture: reference pixel soil moisture balance
+#   (ET green/blue split) over memory-mapped monthly stacks in a process pool
+# - Workflow tab / --harmonize: chunked regridding of catalog inputs onto one
+#   basin grid with cached weights (intro_harmonize)
+# - Data Sources tab: acquisition volume / harmonization memory planner for the
+#   filtered products (intro_planner)
+# - Data Sources tab: preview map + time-series sparkline for entries with a
+#   local NetCDF/GeoTIFF/.npy copy, sampled in the background and cached (intro_preview)
+#
+# Requires PyQt5 (with QtSvg). numpy is optional (pip install numpy): without it
+# the calculator, soil moisture, harmonization, planner and preview panels say
+# so in place and everything else works unchanged
+
+import argparse
+import json
+import math
 import sys
 import os
-import base64
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+# Only the modules needed for the window shell are imported up front;
+# QtSvg is imported when a diagram actually has to be rendered, and the numpy
+# based panels (intro_balance, intro_soil_moisture, intro_harmonize,
+# intro_planner, intro_preview) when their tab is built
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel,
-    QPushButton, QScrollArea, QTabWidget, QTextBrowser, QSizePolicy
+    QPushButton, QScrollArea, QTabWidget, QTextBrowser, QSplashScreen, QSizePolicy,
+    QGraphicsItem, QGraphicsScene, QGraphicsView, QStyleOptionGraphicsItem,
+    QComboBox, QHBoxLayout, QHeaderView, QLineEdit, QTableView, QListWidget, QListWidgetItem, QShortcut,
+    QDoubleSpinBox, QGridLayout, QTableWidget, QTableWidgetItem
+)
+from PyQt5.QtCore import (
+    Qt, QTimer, QBuffer, QByteArray, QIODevice, QPoint, QPointF, QRectF, QSize, QUrl,
+    QObject, QRunnable, QThread, QThreadPool, pyqtSignal, QAbstractTableModel, QModelIndex
+)
+from PyQt5.QtGui import (
+    QAbstractTextDocumentLayout, QColor, QDesktopServices, QFont, QImage, QKeySequence, QPainter,
+    QPixmap, QTextCharFormat, QTextCursor, QTextDocument
 )
-from PyQt5.QtSvg import QSvgWidget
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont
 
+from intro_assets import AssetBundle, pack_source, svg_size
+from intro_cache import DiskCache
+from intro_catalog import (
+    ALL_FIELDS, COLUMNS as CATALOG_COLUMNS, FILTER_FIELDS, CatalogIndex, catalog_html, default_index
+)
+from intro_content import DEFAULT_LOCALE, ContentStore
+from intro_search import SearchIndex
+from intro_trace import DEFAULT_TRACE, tracer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_cache = DiskCache()
+_assets = AssetBundle.open_default()  # built by intro_assets.py; None in dev checkouts
+
+DEFAULT_GEOMETRY = (100, 100, 1000, 780)
+SNAPSHOT_DELAY_MS = 400
+# Tabs not looked at for this long (and everything once the window is hidden
+# that long) are dropped and rebuilt on demand; 0 disables releasing
+RELEASE_AFTER_S = float(os.environ.get("WA_INTRO_RELEASE_S", 300))
+
+# Rough per-object costs for memory_report(); Qt does not expose exact sizes
+_LAID_OUT_CHAR_BYTES = 26  # UTF-16 text + glyph/advance/cluster data per character
+_TEXT_BLOCK_BYTES = 256
+_WIDGET_BYTES = 2048
+
+
+def _splash_key(locale: str, version: str, width: int, height: int, dpr: float) -> str:
+    # Tied to this file and the content version so an edited intro never shows a stale frame
+    code = _cache.content_hash(os.path.abspath(__file__))[:16]
+    return f"splash_{code}_{locale}-{version}_{width}x{height}@{dpr:g}.png"
+
+
+def show_splash_snapshot(app: QApplication, content: ContentStore):
+    # Show the last captured Overview frame where the window will appear, so
+    # something is on screen while the real widgets are built behind it
+    x, y, width, height = DEFAULT_GEOMETRY
+    dpr = app.primaryScreen().devicePixelRatio()
+    path = _cache.get(_splash_key(content.locale, content.version, width, height, dpr))
+    if path is None:
+        return None
+    pixmap = QPixmap(path)
+    if pixmap.isNull():
+        return None
+    pixmap.setDevicePixelRatio(dpr)
+    splash = QSplashScreen(pixmap)
+    splash.move(x, y)
+    splash.show()
+    app.processEvents()
+    return splash
+
+
+def asset_bytes(name: str) -> QByteArray:
+    # From the bundle this wraps the mapped bytes without copying them (the
+    # bundle stays mapped for the life of the process); Qt copies on write only
+    if _assets is not None and name in _assets:
+        return QByteArray.fromRawData(_assets.get(name))
+    with open(os.path.join(BASE_DIR, name), "rb") as f:
+        return QByteArray(f.read())
+
+
+def asset_size(name: str) -> QSize:
+    # Intrinsic diagram size without rendering it
+    if _assets is not None and name in _assets:
+        info = _assets.info(name)
+        return QSize(int(info["width"]), int(info["height"]))
+    with open(os.path.join(BASE_DIR, name), "r", encoding="utf-8", errors="replace") as f:
+        size = svg_size(f.read(4096))
+    return QSize(int(size[0]), int(size[1])) if size else QSize(900, 550)
+
+
+def render_asset(name: str, painter: QPainter, target):
+    # Draw a diagram by name, from the packed bundle if present else the loose file
+    from PyQt5.QtSvg import QSvgRenderer
+    if _assets is not None and name in _assets:
+        kind = _assets.info(name)["type"]
+        data = asset_bytes(name)
+        if kind == "svg":
+            QSvgRenderer(data).render(painter, QRectF(target))
+        else:
+            painter.drawImage(QRectF(target), QImage.fromData(data))
+    else:
+        QSvgRenderer(os.path.join(BASE_DIR, name)).render(painter, QRectF(target))
+
+
+def document_bytes(doc: QTextDocument) -> int:
+    return doc.characterCount() * _LAID_OUT_CHAR_BYTES + doc.blockCount() * _TEXT_BLOCK_BYTES
+
+
+def find_occurrence(doc: QTextDocument, text: str, occurrence: int = 0):
+    # Cursor selecting the n-th case-insensitive match of text, or None
+    cursor = doc.find(text, 0)
+    for _ in range(occurrence):
+        if cursor.isNull():
+            break
+        cursor = doc.find(text, cursor)
+    return None if cursor.isNull() else cursor
+
+
+class RichTextBlock(QWidget):
+    # Word-wrapped rich text painted from a QTextDocument. Laid-out copies are
+    # kept per width bucket, so revisiting a width is free, and during a live
+    # resize unseen widths get an estimated height while the real layout is
+    # debounced until the resize settles.
+    BUCKET_PX = 16
+    MAX_LAYOUTS = 4
+    RELAYOUT_DELAY_MS = 80
+
+    def __init__(self, html: str, parent=None):
+        super().__init__(parent)
+        self._source = QTextDocument(self)
+        self._source.setDocumentMargin(14)
+        self._source.setDefaultFont(self.font())
+        self._source.setHtml(html)
+        self._layouts = OrderedDict()  # width bucket -> (laid-out document, height)
+        self._current = None
+        self._selection = (0, 0)  # (anchor, position) character offsets
+        self._pressed_anchor = None
+
+        self._relayout = QTimer(self)
+        self._relayout.setSingleShot(True)
+        self._relayout.setInterval(self.RELAYOUT_DELAY_MS)
+        self._relayout.timeout.connect(self._relayout_now)
+
+        policy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.ClickFocus)
+
+    def document(self) -> QTextDocument:
+        return self._source
+
+    def memory_bytes(self) -> int:
+        # Source document plus every cached width-bucket layout
+        docs = [self._source] + [doc for doc, _ in self._layouts.values()]
+        return sum(document_bytes(doc) for doc in docs)
+
+    # ---------- Layout ----------
+    def _bucket(self, width: int) -> int:
+        return max(1, width // self.BUCKET_PX)
+
+    def _layout_for(self, bucket: int):
+        entry = self._layouts.get(bucket)
+        if entry is not None:
+            self._layouts.move_to_end(bucket)
+            return entry
+        doc = self._source.clone(self)
+        doc.setTextWidth(bucket * self.BUCKET_PX)
+        entry = (doc, math.ceil(doc.size().height()))
+        self._layouts[bucket] = entry
+        while len(self._layouts) > self.MAX_LAYOUTS:
+            _, (old, _) = self._layouts.popitem(last=False)
+            if self._current is None or old is not self._current[0]:
+                old.deleteLater()
+        return entry
+
+    def _set_current(self, entry):
+        previous = self._current
+        self._current = entry
+        # A layout evicted while it was on screen is dropped once replaced
+        if previous is not None and previous is not entry and previous not in self._layouts.values():
+            previous[0].deleteLater()
+        self.update()
+
+    def _relayout_now(self):
+        self._set_current(self._layout_for(self._bucket(self.width())))
+        self.updateGeometry()
+
+    def hasHeightForWidth(self) -> bool:
+        return True
+
+    def heightForWidth(self, width: int) -> int:
+        bucket = self._bucket(width)
+        entry = self._layouts.get(bucket)
+        if entry is not None:
+            return entry[1]
+        if self._current is None:
+            return self._layout_for(bucket)[1]
+        # Text area stays roughly constant, so scale the current height
+        doc, height = self._current
+        self._relayout.start()
+        return int(height * doc.textWidth() / (bucket * self.BUCKET_PX))
+
+    def sizeHint(self) -> QSize:
+        width = self.width() if self.width() > 0 else 600
+        return QSize(width, self.heightForWidth(width))
+
+    def minimumSizeHint(self) -> QSize:
+        return QSize(200, 0)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        bucket = self._bucket(event.size().width())
+        if self._current is None or bucket in self._layouts:
+            self._set_current(self._layout_for(bucket))
+        else:
+            self._relayout.start()
+
+    # ---------- Painting ----------
+    def paintEvent(self, event):
+        if self._current is None:
+            return
+        doc = self._current[0]
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        ctx = QAbstractTextDocumentLayout.PaintContext()
+        ctx.clip = QRectF(event.rect())
+        ctx.palette = self.palette()
+        anchor, position = self._selection
+        if anchor != position:
+            cursor = QTextCursor(doc)
+            cursor.setPosition(anchor)
+            cursor.setPosition(position, QTextCursor.KeepAnchor)
+            selection = QAbstractTextDocumentLayout.Selection()
+            selection.cursor = cursor
+            fmt = QTextCharFormat()
+            fmt.setBackground(self.palette().highlight())
+            fmt.setForeground(self.palette().highlightedText())
+            selection.format = fmt
+            ctx.selections = [selection]
+        doc.documentLayout().draw(painter, ctx)
+        painter.end()
+
+    # ---------- Links & selection ----------
+    def _anchor_at(self, pos) -> str:
+        if self._current is None:
+            return ""
+        return self._current[0].documentLayout().anchorAt(QPointF(pos))
+
+    def _hit(self, pos) -> int:
+        if self._current is None:
+            return 0
+        return max(0, self._current[0].documentLayout().hitTest(QPointF(pos), Qt.FuzzyHit))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._pressed_anchor = self._anchor_at(event.pos())
+            hit = self._hit(event.pos())
+            self._selection = (hit, hit)
+            self.update()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self._selection = (self._selection[0], self._hit(event.pos()))
+            self.update()
+        else:
+            self.setCursor(Qt.PointingHandCursor if self._anchor_at(event.pos()) else Qt.IBeamCursor)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self._pressed_anchor:
+            anchor, position = self._selection
+            if anchor == position and self._anchor_at(event.pos()) == self._pressed_anchor:
+                QDesktopServices.openUrl(QUrl(self._pressed_anchor))
+        self._pressed_anchor = None
+        super().mouseReleaseEvent(event)
+
+    def select_text(self, text: str, occurrence: int = 0) -> int:
+        # Select the n-th occurrence of text; returns its y offset or -1
+        doc = self._current[0] if self._current is not None else self._source
+        cursor = find_occurrence(doc, text, occurrence)
+        if cursor is None:
+            return -1
+        self._selection = (cursor.selectionStart(), cursor.selectionEnd())
+        self.update()
+        block = cursor.block()
+        line = block.layout().lineForTextPosition(cursor.selectionStart() - block.position())
+        top = doc.documentLayout().blockBoundingRect(block).top()
+        return int(top + (line.y() if line.isValid() else 0))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy) and self._current is not None:
+            anchor, position = self._selection
+            cursor = QTextCursor(self._current[0])
+            cursor.setPosition(anchor)
+            cursor.setPosition(position, QTextCursor.KeepAnchor)
+            QApplication.clipboard().setText(cursor.selectedText().replace("\u2029", "\n"))
+            return
+        super().keyPressEvent(event)
+
+
+def load_diagram_image(name: str, width: int, height: int, dpr: float) -> QImage:
+    # Rendered diagrams are cached on disk keyed by content hash, size and DPR,
+    # so warm starts load one pre-scaled PNG instead of parsing the SVG
+    # (workflow.svg wraps a large base64 PNG that would be decoded every time).
+    # Uses QImage only, so it is safe to call from worker threads.
+    with tracer.span(f"diagram {name}", width=width, height=height, dpr=dpr):
+        if _assets is not None and name in _assets:
+            digest = _assets.info(name)["sha1"]
+        else:
+            digest = _cache.content_hash(os.path.join(BASE_DIR, name))
+        key = f"{digest[:16]}_{width}x{height}@{dpr:g}.png"
+        cached = _cache.get(key)
+        if cached is not None:
+            image = QImage(cached)
+            if not image.isNull():
+                image.setDevicePixelRatio(dpr)
+                tracer.instant("diagram cache hit", asset=name)
+                return image
+
+        image = QImage(round(width * dpr), round(height * dpr), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        with tracer.span(f"render {name}"):
+            render_asset(name, painter, image.rect())
+        painter.end()
+
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.WriteOnly)
+        image.save(buf, "PNG")
+        buf.close()
+        try:
+            _cache.put(key, bytes(data))
+        except OSError:
+            pass  # read-only profile: still show the freshly rendered image
+        image.setDevicePixelRatio(dpr)
+        return image
+
+
+class _ImageSignals(QObject):
+    done = pyqtSignal(QImage)
+
+
+class _ImageJob(QRunnable):
+    def __init__(self, args, signals: _ImageSignals):
+        super().__init__()
+        self.args, self.signals = args, signals
 
-class IntroWindow(QMainWindow):
-    def __init__(self):
+    def run(self):
+        image = load_diagram_image(*self.args)
+        try:
+            self.signals.done.emit(image)
+        except RuntimeError:
+            pass  # receiver was destroyed before the image was ready
+
+
+_pool = None
+
+
+def _worker_pool() -> QThreadPool:
+    # Python background jobs never use the global pool: Qt splits large image
+    # conversions (QPixmap.fromImage) across QThreadPool.globalInstance() and
+    # waits for them while the GUI thread holds the GIL, so Python jobs
+    # occupying those threads would deadlock it
+    global _pool
+    if _pool is None:
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(2)
+    return _pool
+
+
+_side_pools = {}
+
+
+def _side_pool(name: str) -> QThreadPool:
+    # Single-thread pools for work that must not hold up diagram decodes on
+    # _worker_pool: "long" for Try-it runs that take seconds to minutes,
+    # "preview" for cold catalog previews that may sample multi-GB rasters
+    pool = _side_pools.get(name)
+    if pool is None:
+        pool = _side_pools[name] = QThreadPool()
+        pool.setMaxThreadCount(1)
+    return pool
+
+
+class AssetLoader:
+    # Decodes/rasterizes diagrams on a worker pool; results reach the GUI thread
+    # through a queued signal owned by the receiving widget, so a widget
+    # destroyed meanwhile simply never gets the callback
+    @staticmethod
+    def request(name: str, width: int, height: int, dpr: float, callback, owner: QObject):
+        signals = _ImageSignals(owner)
+        signals.done.connect(callback)
+        _worker_pool().start(_ImageJob((name, width, height, dpr), signals))
+
+
+class _ResultSignals(QObject):
+    done = pyqtSignal(object)
+
+
+class _CallJob(QRunnable):
+    def __init__(self, fn, signals: _ResultSignals):
+        super().__init__()
+        self.fn, self.signals = fn, signals
+
+    def run(self):
+        result = self.fn()
+        try:
+            self.signals.done.emit(result)
+        except RuntimeError:
+            pass  # receiver was destroyed before the result was ready
+
+
+def run_in_background(fn, callback, owner: QObject, pool: QThreadPool = None):
+    # fn() on the worker pool (or the given one), callback(result) on the GUI
+    # thread while owner lives
+    signals = _ResultSignals(owner)
+    signals.done.connect(callback)
+    (pool or _worker_pool()).start(_CallJob(fn, signals))
+
+
+class _TileSources:
+    # Per-asset sources shared by tile workers: a raster is decoded once and
+    # shallow-copied per job (QImage copies are safe to read concurrently);
+    # SVG renderers are not thread-safe, so each worker thread keeps its own
+    _lock = threading.Lock()
+    _rasters = {}
+    _local = threading.local()
+
+    @classmethod
+    def raster(cls, name: str):
+        with cls._lock:
+            if name not in cls._rasters:
+                image = None
+                if _assets is not None and name in _assets:
+                    if _assets.info(name)["type"] != "svg":
+                        image = QImage.fromData(asset_bytes(name))
+                else:
+                    # Loose SVG that only wraps a raster: draw from the raster directly
+                    _, payload, meta = pack_source(os.path.join(BASE_DIR, name), recompress=False)
+                    if meta["type"] != "svg":
+                        image = QImage.fromData(QByteArray(payload))
+                cls._rasters[name] = image
+            image = cls._rasters[name]
+        return QImage(image) if image is not None else None
+
+    @classmethod
+    def memory_bytes(cls) -> int:
+        with cls._lock:
+            return sum(image.sizeInBytes() for image in cls._rasters.values() if image is not None)
+
+    @classmethod
+    def release(cls):
+        # Decoded rasters are rebuilt from the bundle the next time a tile needs them
+        with cls._lock:
+            cls._rasters.clear()
+
+    @classmethod
+    def svg(cls, name: str):
+        from PyQt5.QtSvg import QSvgRenderer
+        renderers = getattr(cls._local, "renderers", None)
+        if renderers is None:
+            renderers = cls._local.renderers = {}
+        if name not in renderers:
+            renderers[name] = QSvgRenderer(asset_bytes(name))
+        return renderers[name]
+
+
+class _TileSignals(QObject):
+    done = pyqtSignal(object, QImage)
+
+
+class _TileJob(QRunnable):
+    def __init__(self, name: str, key, tile_px: int, source_size: QSize, signals: _TileSignals):
         super().__init__()
+        self.name, self.key, self.tile_px = name, key, tile_px
+        self.source_size, self.signals = source_size, signals
+
+    def run(self):
+        scale, tx, ty = self.key
+        with tracer.span("diagram tile", asset=self.name, scale=scale):
+            image = QImage(self.tile_px, self.tile_px, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.white)
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            # Item coordinates covered by this tile
+            span = self.tile_px / scale
+            source_rect = QRectF(tx * span, ty * span, span, span)
+            raster = _TileSources.raster(self.name)
+            if raster is not None:
+                sx = raster.width() / self.source_size.width()
+                sy = raster.height() / self.source_size.height()
+                painter.drawImage(QRectF(0, 0, self.tile_px, self.tile_px), raster,
+                                  QRectF(source_rect.x() * sx, source_rect.y() * sy,
+                                         span * sx, span * sy))
+            else:
+                painter.scale(scale, scale)
+                painter.translate(-source_rect.topLeft())
+                _TileSources.svg(self.name).render(
+                    painter, QRectF(0, 0, self.source_size.width(), self.source_size.height()))
+            painter.end()
+        try:
+            self.signals.done.emit(self.key, image)
+        except RuntimeError:
+            pass  # the view was destroyed while this tile was rendering
+
+
+class TileCache:
+    # Bounded LRU of rendered tiles keyed by (scale, tx, ty)
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._tiles = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        image = self._tiles.get(key)
+        if image is not None:
+            self._tiles.move_to_end(key)
+        return image
+
+    def put(self, key, image: QImage):
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self._bytes -= old.sizeInBytes()
+        self._tiles[key] = image
+        self._bytes += image.sizeInBytes()
+        while self._bytes > self.max_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self._bytes -= evicted.sizeInBytes()
+
+    def clear(self):
+        self._tiles.clear()
+        self._bytes = 0
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+
+class TiledDiagramItem(QGraphicsItem):
+    # Paints only the tiles intersecting the exposed area at the current level
+    # of detail (power-of-two scales); missing tiles are rendered on a worker
+    # pool and the pre-scaled preview pixmap is drawn underneath meanwhile.
+    TILE_PX = 256
+    MIN_SCALE, MAX_SCALE = 0.25, 8.0
+
+    def __init__(self, name: str, size: QSize, cache: TileCache, pool: QThreadPool, owner: QObject):
+        super().__init__()
+        self.name, self.size = name, size
+        self.preview = QPixmap()
+        self.cache, self.pool = cache, pool
+        self._pending = set()
+        self._level = None
+        self._signals = _TileSignals(owner)
+        self._signals.done.connect(self._tile_ready)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self.size.width(), self.size.height())
+
+    def _scale_for(self, lod: float) -> float:
+        scale = 2.0 ** math.ceil(math.log2(max(lod, 1e-6)))
+        return min(self.MAX_SCALE, max(self.MIN_SCALE, scale))
+
+    def paint(self, painter, option, widget=None):
+        exposed = option.exposedRect
+        if self.preview.isNull():
+            painter.fillRect(self.boundingRect(), QColor("#F4F6F7"))
+            painter.setPen(QColor("#7F8C8D"))
+            painter.drawText(self.boundingRect(), Qt.AlignCenter, "Loading diagram...")
+            return
+        painter.drawPixmap(self.boundingRect(), self.preview, QRectF(self.preview.rect()))
+
+        dpr = widget.devicePixelRatioF() if widget is not None else 1.0
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform()) * dpr
+        scale = self._scale_for(lod)
+        if scale != self._level:
+            # Zoom changed: drop queued (not yet running) jobs for the old level
+            self._level = scale
+            self.cancel_pending()
+
+        span = self.TILE_PX / scale
+        bounds = exposed.intersected(self.boundingRect())
+        x0, y0 = int(bounds.left() // span), int(bounds.top() // span)
+        x1, y1 = int(math.ceil(bounds.right() / span)), int(math.ceil(bounds.bottom() / span))
+        for ty in range(y0, y1):
+            for tx in range(x0, x1):
+                key = (scale, tx, ty)
+                target = QRectF(tx * span, ty * span, span, span)
+                tile = self.cache.get(key)
+                if tile is not None:
+                    painter.drawImage(target, tile)
+                elif key not in self._pending:
+                    self._pending.add(key)
+                    self.pool.start(_TileJob(self.name, key, self.TILE_PX, self.size, self._signals))
+
+    def cancel_pending(self):
+        self.pool.clear()
+        self._pending.clear()
+
+    def _tile_ready(self, key, image: QImage):
+        self._pending.discard(key)
+        self.cache.put(key, image)
+        if key[0] == self._level:
+            span = self.TILE_PX / key[0]
+            self.update(QRectF(key[1] * span, key[2] * span, span, span))
+
+
+class DiagramView(QGraphicsView):
+    # Zoom (wheel) / pan (drag) viewer; double-click returns to fit-to-view
+    TILE_CACHE_BYTES = 48 * 1024 * 1024
+    MAX_PREVIEW_VARIANTS = 2  # previews kept per device pixel ratio (e.g. laptop + external monitor)
+
+    def __init__(self, name: str, preview_size: QSize = QSize(900, 550), parent=None):
+        super().__init__(parent)
+        self.name, self.preview_size = name, preview_size
+        self._variants = OrderedDict()  # dpr -> QPixmap
+        self._wanted_dpr = None
+        self.setScene(QGraphicsScene(self))
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.setFrameShape(QGraphicsView.NoFrame)
+        self.setBackgroundBrush(Qt.white)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, QThread.idealThreadCount() - 1))
+        self._cache = TileCache(self.TILE_CACHE_BYTES)
+        self._item = TiledDiagramItem(name, asset_size(name), self._cache, self._pool, self)
+        self.scene().addItem(self._item)
+        self.scene().setSceneRect(self._item.boundingRect())
+        self._fit = True
+
+    def memory_bytes(self) -> int:
+        return self._cache.bytes + sum(p.width() * p.height() * p.depth() // 8 for p in self._variants.values())
+
+    def show_for_dpr(self, dpr: float):
+        # Swap to the variant for this ratio at once if held; otherwise keep the
+        # current one on screen and render the new one on a worker thread
+        self._wanted_dpr = dpr
+        pixmap = self._variants.get(dpr)
+        if pixmap is not None:
+            self._variants.move_to_end(dpr)
+            self._use(pixmap)
+            return
+        AssetLoader.request(self.name, self.preview_size.width(), self.preview_size.height(), dpr,
+                            self.set_preview, owner=self)
+
+    def set_preview(self, image: QImage):
+        dpr = image.devicePixelRatio()
+        self._variants[dpr] = QPixmap.fromImage(image)
+        self._variants.move_to_end(dpr)
+        while len(self._variants) > self.MAX_PREVIEW_VARIANTS:
+            self._variants.popitem(last=False)
+        # A late result for a screen the window has already left is only cached
+        if dpr == self._wanted_dpr or self._item.preview.isNull():
+            self._use(self._variants[dpr])
+
+    def _use(self, pixmap: QPixmap):
+        if pixmap is not self._item.preview:
+            self._item.preview = pixmap
+            self._item.update()
+
+    def fit(self):
+        self._fit = True
+        self.fitInView(self._item, Qt.KeepAspectRatio)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._fit:
+            self.fit()
+
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        current = self.transform().m11()
+        fit_scale = min(self.viewport().width() / self._item.size.width(),
+                        self.viewport().height() / self._item.size.height())
+        target = min(TiledDiagramItem.MAX_SCALE, max(fit_scale * 0.5, current * factor))
+        self._fit = False
+        self.scale(target / current, target / current)
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit()
+
+    def hideEvent(self, event):
+        self._item.cancel_pending()
+        super().hideEvent(event)
+
+
+class WaterBalancePanel(QWidget):
+    # Live evaluation of equations (1)-(3) on a gridded sample basin. The grid is
+    # reduced to per-class sums once, off the GUI thread; every edit afterwards
+    # re-evaluates only those sums (intro_balance.BalanceGrid.evaluate)
+    SAMPLE_CELL_M = 250.0
+    # Illustrative basin-wide values (Mm3/year) for the sample basin
+    FLOWS = (("Q_in", "Q<sub>in</sub>", 80.0), ("Q_wwt", "Q<sub>WWT</sub>", 60.0),
+             ("Q_re", "Q<sub>re</sub>", 40.0), ("Q_natural", "Q<sub>natural</sub>", 10.0))
+    SECTOR_DEFAULTS = {"domestic": 90.0, "industrial": 15.0, "livestock": 5.0, "tourism": 3.0}
+    CW_CLASS_DEFAULTS = (0.0, 0.0, 5.0, 60.0)  # mm/year per land-use class
+    TABLE_COLUMNS = ("Area (km²)", "CW (mm/yr)", "ΔS eq. (1)", "ΔS eq. (2)")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import intro_balance
+        self._engine = intro_balance  # imported with the panel, not at startup
+        self._grid = None
+        self.setStyleSheet("background-color: white;")
+        v = QVBoxLayout(); v.setContentsMargins(14, 4, 14, 4)
+        title = QLabel("<b style='color:#2E86C1;'>Try it: water balance of a sample basin</b> "
+                       f"<span style='color:#7F8C8D;'>({intro_balance.DEFAULT_SAMPLE_SHAPE[0]}×"
+                       f"{intro_balance.DEFAULT_SAMPLE_SHAPE[1]} cells at {self.SAMPLE_CELL_M:g} m, "
+                       "volumes in Mm³/year)</span>")
+        title.setWordWrap(True)
+        v.addWidget(title)
+        self.result = QLabel("Preparing sample grid...")
+        self.result.setWordWrap(True)
+        self.result.setStyleSheet("background:#F8F9F9; border-left:4px solid #2874A6; padding:8px;")
+        if intro_balance.np is None:
+            self.result.setText("The calculator needs numpy (pip install numpy).")
+            v.addWidget(self.result)
+            self.setLayout(v)
+            return
+
+        inputs = QGridLayout()
+        self._spins = {}
+        fields = [(f"{t}_scale", f"<i>{t.replace('_out', '<sub>out</sub>')}</i> (% of sample)", 100.0, " %")
+                  for t in ("P", "ET", "Q_out")]
+        fields += [(key, f"<i>{label}</i>", value, "") for key, label, value in self.FLOWS]
+        fields += [(f"supply_{s}", f"<i>Supply<sub>{s}</sub></i>", value, "")
+                   for s, value in self.SECTOR_DEFAULTS.items()]
+        for i, (key, label, value, suffix) in enumerate(fields):
+            spin = QDoubleSpinBox()
+            spin.setRange(0.0, 1000.0 if suffix else 100000.0)
+            spin.setDecimals(0 if suffix else 1)
+            spin.setSuffix(suffix)
+            spin.setValue(value)
+            spin.valueChanged.connect(self._update)
+            self._spins[key] = spin
+            row, col = divmod(i, 3)
+            inputs.addWidget(QLabel(label), row, 2 * col)
+            inputs.addWidget(spin, row, 2 * col + 1)
+        v.addLayout(inputs)
+
+        self.table = QTableWidget(len(intro_balance.CLASSES), len(self.TABLE_COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.TABLE_COLUMNS)
+        self.table.setVerticalHeaderLabels(intro_balance.CLASSES)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setFixedHeight(self.table.horizontalHeader().height()
+                                  + 30 * len(intro_balance.CLASSES) + 4)
+        self.table.verticalHeader().setDefaultSectionSize(30)
+        for row, value in enumerate(self.CW_CLASS_DEFAULTS):
+            for col in range(len(self.TABLE_COLUMNS)):
+                item = QTableWidgetItem(f"{value:g}" if col == 1 else "")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if col != 1:
+                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(row, col, item)
+        self.table.itemChanged.connect(lambda item: item.column() == 1 and self._update())
+        v.addWidget(self.table)
+        v.addWidget(self.result)
+        self.setLayout(v)
+        self.setEnabled(False)
+
+        cell_area = self.SAMPLE_CELL_M ** 2
+        run_in_background(lambda: intro_balance.BalanceGrid(*intro_balance.sample_inputs(), cell_area),
+                          self._grid_ready, owner=self)
+
+    def _grid_ready(self, grid):
+        self._grid = grid
+        self.setEnabled(True)
+        self._update()
+
+    def _cw_class_mm(self):
+        values = []
+        for row in range(self.table.rowCount()):
+            try:
+                values.append(max(0.0, float(self.table.item(row, 1).text())))
+            except ValueError:
+                values.append(0.0)
+        return values
+
+    def _update(self):
+        if self._grid is None:
+            return
+        start = time.perf_counter()
+        spins = {key: spin.value() for key, spin in self._spins.items()}
+        result = self._grid.evaluate(
+            scale={t: spins[f"{t}_scale"] / 100.0 for t in ("P", "ET", "Q_out")},
+            cw_class_mm=self._cw_class_mm(),
+            sectors={s: spins[f"supply_{s}"] for s in self._engine.SECTORS},
+            flows={key: spins[key] for key, _, _ in self.FLOWS})
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        self.table.blockSignals(True)
+        for row, values in enumerate(result["classes"]):
+            for col, key in ((0, "area_km2"), (2, "eq1"), (3, "eq2")):
+                self.table.item(row, col).setText(f"{values[key]:,.1f}")
+        self.table.blockSignals(False)
+        basin = result["basin"]
+        self.result.setText(
+            f"<b>Basin ΔS/Δt</b> &nbsp; eq. (1): <b>{basin['eq1']:,.1f}</b> &nbsp;·&nbsp; "
+            f"eq. (2): <b>{basin['eq2']:,.1f}</b> Mm³/year<br>"
+            f"<i>P</i> {basin['P']:,.1f} &nbsp; <i>ET</i> {basin['ET']:,.1f} &nbsp; "
+            f"<i>Q<sub>out</sub></i> {basin['Q_out']:,.1f} &nbsp; <i>CW<sub>sec</sub></i> {basin['CW_sec']:,.1f}"
+            f" &nbsp; <span style='color:#7F8C8D;'>({basin['area_km2']:,.0f} km², "
+            f"evaluated in {elapsed_ms:.2f} ms)</span>")
+
+
+# Try-it runs write their synthetic inputs to the temp dir: years are capped so a
+# sample stays below this, and a run is refused when the disk cannot hold it
+DEMO_MAX_SAMPLE_BYTES = 4 << 30
+
+
+def _demo_years_limit(bytes_per_year: int) -> int:
+    return max(1, min(40, DEMO_MAX_SAMPLE_BYTES // bytes_per_year))
+
+
+def _format_size(n: float) -> str:
+    return f"{n / 2**30:.1f} GB" if n >= 2**30 else f"{n / 2**20:,.0f} MB"
+
+
+def _scratch_space_problem(needed: int):
+    # Message when `needed` bytes (plus 10 % headroom) do not fit in the temp dir, else None
+    scratch = tempfile.gettempdir()
+    free = shutil.disk_usage(scratch).free
+    if needed * 1.1 <= free:
+        return None
+    return (f"Not enough space in {scratch}: the sample needs {_format_size(needed)}, "
+            f"{_format_size(free)} free. Choose a smaller grid or fewer years.")
+
+
+class SoilMoisturePanel(QWidget):
+    # Runs intro_soil_moisture on a synthetic monthly series on request. The run
+    # (sample generation + process pool) is driven from the long-job thread, so
+    # the window stays responsive and diagram decodes on the worker pool never
+    # queue behind it; the report comes back through run_in_background
+    SIZES = ((320, 256), (1000, 1000), (2000, 2000))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import intro_soil_moisture
+        self._engine = intro_soil_moisture  # imported with the panel, not at startup
+        self.setStyleSheet("background-color: white;")
+        v = QVBoxLayout(); v.setContentsMargins(14, 4, 14, 4)
+        title = QLabel("<b style='color:#2E86C1;'>Try it: soil moisture balance and the ET green/blue split</b> "
+                       "<span style='color:#7F8C8D;'>(synthetic monthly rainfall, ET and LAI "
+                       "at 250 m, volumes in Mm³/year)</span>")
+        title.setWordWrap(True)
+        v.addWidget(title)
+        self.result = QLabel("Steps every pixel through the series and reports pixel-steps per second.")
+        self.result.setWordWrap(True)
+        self.result.setTextFormat(Qt.RichText)
+        self.result.setStyleSheet("background:#F8F9F9; border-left:4px solid #2874A6; padding:8px;")
+        if intro_soil_moisture.np is None:
+            self.result.setText("The soil moisture balance needs numpy (pip install numpy).")
+            v.addWidget(self.result)
+            self.setLayout(v)
+            return
+
+        row = QHBoxLayout()
+        self.size = QComboBox()
+        for rows, cols in self.SIZES:
+            self.size.addItem(f"{rows}×{cols} cells", (rows, cols))
+        self.years = QDoubleSpinBox()
+        self.years.setRange(1, 40); self.years.setDecimals(0); self.years.setValue(10)
+        self.years.setSuffix(" years")
+        self.size.currentIndexChanged.connect(self._limit_years)
+        self._limit_years()
+        self.run = QPushButton("Run")
+        self.run.clicked.connect(self._start)
+        row.addWidget(QLabel("Grid")); row.addWidget(self.size)
+        row.addWidget(self.years); row.addWidget(self.run); row.addStretch()
+        v.addLayout(row)
+        v.addWidget(self.result)
+        self.setLayout(v)
+
+    def _limit_years(self):
+        self.years.setMaximum(_demo_years_limit(self._engine.sample_bytes(self.size.currentData(), 1)))
+
+    def _start(self):
+        shape, years = self.size.currentData(), int(self.years.value())
+        needed = self._engine.sample_bytes(shape, years)
+        problem = _scratch_space_problem(needed)
+        if problem:
+            self.result.setText(problem)
+            return
+        self.run.setEnabled(False)
+        self.result.setText(f"Running {12 * years} monthly steps over {shape[0]}×{shape[1]} cells "
+                            f"({_format_size(needed)} of sample inputs)...")
+        engine = self._engine
+        run_in_background(lambda: self._simulate(engine, shape, years), self._finished, owner=self,
+                          pool=_side_pool("long"))
+
+    @staticmethod
+    def _simulate(engine, shape, years):
+        # Worker thread; errors are returned, not raised, so the button comes back
+        try:
+            with tempfile.TemporaryDirectory(prefix="wa_sm_") as scratch:
+                engine.make_sample(scratch, shape, years)
+                return engine.run(scratch)
+        except Exception as exc:
+            return exc
+
+    def _finished(self, report):
+        self.run.setEnabled(True)
+        if isinstance(report, Exception):
+            self.result.setText(f"Run failed: {report}")
+            return
+        years = report["years"]
+        mean = {name: sum(y[name] for y in years.values()) / len(years) for name in self._engine.FLUXES}
+        steps, rows, cols = report["shape"]
+        self.result.setText(
+            f"<b>Mean annual</b> &nbsp; <i>ET<sub>green</sub></i> <b>{mean['ET_green']:,.1f}</b> &nbsp;·&nbsp; "
+            f"<i>ET<sub>blue</sub></i> <b>{mean['ET_blue']:,.1f}</b> &nbsp;·&nbsp; "
+            f"runoff {mean['runoff']:,.1f} &nbsp;·&nbsp; percolation {mean['percolation']:,.1f}<br>"
+            f"<span style='color:#7F8C8D;'>{rows * cols * steps:,d} pixel-steps in {report['seconds']:.2f} s: "
+            f"<b>{report['pixel_steps_per_s'] / 1e6:,.1f} M pixel-steps/s</b> on {report['workers']} "
+            f"process{'es' if report['workers'] > 1 else ''}</span>")
+
+
+class HarmonizePanel(QWidget):
+    # Runs intro_harmonize on a synthetic decade of CHIRPS/GLEAM/MODIS-like inputs
+    # onto the chosen basin grid, on the long-job thread like SoilMoisturePanel
+    TARGETS = (("WaPOR 250 m", "wapor_eta"), ("MODIS 500 m", "mod15_lai"), ("SSEBop 1 km", "ssebop_eta"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import intro_harmonize
+        self._engine = intro_harmonize  # imported with the panel, not at startup
+        self.setStyleSheet("background-color: white;")
+        v = QVBoxLayout(); v.setContentsMargins(14, 4, 14, 4)
+        west, south, east, north = intro_harmonize.DEFAULT_BBOX
+        sources = ", ".join(intro_harmonize.SAMPLE_INPUTS.values())
+        title = QLabel("<b style='color:#2E86C1;'>Try it: harmonize inputs onto one basin grid</b> "
+                       f"<span style='color:#7F8C8D;'>(synthetic monthly {sources} over "
+                       f"{west:g}–{east:g}°E, {south:g}–{north:g}°N)</span>")
+        title.setWordWrap(True)
+        v.addWidget(title)
+        self.result = QLabel("Regrids every month onto the target grid with cached conservative weights.")
+        self.result.setWordWrap(True)
+        self.result.setTextFormat(Qt.RichText)
+        self.result.setStyleSheet("background:#F8F9F9; border-left:4px solid #2874A6; padding:8px;")
+        if intro_harmonize.np is None:
+            self.result.setText("Harmonization needs numpy (pip install numpy).")
+            v.addWidget(self.result)
+            self.setLayout(v)
+            return
+
+        row = QHBoxLayout()
+        self.target = QComboBox()
+        for label, dataset_id in self.TARGETS:
+            self.target.addItem(label, dataset_id)
+        self.years = QDoubleSpinBox()
+        self.years.setRange(1, 40); self.years.setDecimals(0); self.years.setValue(10)
+        self.years.setSuffix(" years")
+        self.target.currentIndexChanged.connect(self._limit_years)
+        self._limit_years()
+        self.run = QPushButton("Run")
+        self.run.clicked.connect(self._start)
+        row.addWidget(QLabel("Target grid")); row.addWidget(self.target)
+        row.addWidget(self.years); row.addWidget(self.run); row.addStretch()
+        v.addLayout(row)
+        v.addWidget(self.result)
+        self.setLayout(v)
+
+    def _target_grid(self, dataset_id: str):
+        return self._engine.Grid.covering(self._engine.DEFAULT_BBOX, self._engine.catalog_step_deg(dataset_id))
+
+    def _limit_years(self):
+        target = self._target_grid(self.target.currentData())
+        self.years.setMaximum(_demo_years_limit(self._engine.sample_bytes(target, years=1)))
+
+    def _start(self):
+        dataset_id, years = self.target.currentData(), int(self.years.value())
+        needed = self._engine.sample_bytes(self._target_grid(dataset_id), years=years)
+        problem = _scratch_space_problem(needed)
+        if problem:
+            self.result.setText(problem)
+            return
+        self.run.setEnabled(False)
+        self.result.setText(f"Harmonizing {12 * years} monthly steps onto the {self.target.currentText()} grid "
+                            f"({_format_size(needed)} of sample inputs and outputs)...")
+        engine = self._engine
+        run_in_background(lambda: self._harmonize(engine, dataset_id, years), self._finished, owner=self,
+                          pool=_side_pool("long"))
+
+    @staticmethod
+    def _harmonize(engine, dataset_id, years):
+        # Worker thread; errors are returned, not raised, so the button comes back
+        try:
+            bbox = engine.DEFAULT_BBOX
+            target = engine.Grid.covering(bbox, engine.catalog_step_deg(dataset_id))
+            with tempfile.TemporaryDirectory(prefix="wa_harmonize_") as scratch:
+                inputs = engine.make_sample(scratch, bbox, years)
+                return engine.harmonize(inputs, target, os.path.join(scratch, "out"))
+        except Exception as exc:
+            return exc
+
+    def _finished(self, report):
+        self.run.setEnabled(True)
+        if isinstance(report, Exception):
+            self.result.setText(f"Run failed: {report}")
+            return
+        target = self._engine.Grid(**report["target"])
+        lines = []
+        for name, entry in report["inputs"].items():
+            source = self._engine.Grid(**entry["source"])
+            lines.append(f"<i>{name}</i> {source.rows}×{source.cols} at {source.step_x:.4g}° "
+                         f"({entry['weights']} weights, {entry['gap_cells']:,d} gap cells)")
+        self.result.setText(
+            f"<b>{target.rows}×{target.cols} basin grid</b> at {target.step_x:.4g}° &nbsp;·&nbsp; "
+            + " &nbsp;·&nbsp; ".join(lines) + "<br>"
+            f"<span style='color:#7F8C8D;'>{report['cells']:,d} cells in {report['seconds']:.2f} s: "
+            f"<b>{report['cells_per_s'] / 1e6:,.1f} M cells/s</b> on {report['workers']} "
+            f"process{'es' if report['workers'] > 1 else ''}</span>")
+
+
+class PlannerPanel(QWidget):
+    # Acquisition volumes and harmonization memory (intro_planner) for the gridded
+    # products currently listed in the catalog table; a plan takes milliseconds,
+    # so it runs on the GUI thread and follows the filter once shown
+    COLUMNS = ("Native grid", "Steps", "Files", "Raw", "Download", "Harmonized")
+    ROW_HEIGHT = 24
+
+    def __init__(self, model: "CatalogModel", parent=None):
+        super().__init__(parent)
+        import intro_harmonize
+        import intro_planner
+        self._engine = intro_planner  # imported with the panel, not at startup
+        self._grids = None  # product grids, looked up on the first estimate
+        self._model = model
+        self._shown = False
+        v = QVBoxLayout(); v.setContentsMargins(0, 4, 0, 0)
+        self.result = QLabel()
+        self.result.setWordWrap(True)
+        self.result.setTextFormat(Qt.RichText)
+        self.result.setStyleSheet("background:#F8F9F9; border-left:4px solid #2874A6; padding:6px 8px;")
+        if intro_planner.np is None:
+            self.result.setText("The acquisition planner needs numpy (pip install numpy).")
+            v.addWidget(self.result)
+            self.setLayout(v)
+            return
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("<b>Plan</b> basin W/S/E/N"))
+        self._spins = []
+        for value, low, high in zip(intro_harmonize.DEFAULT_BBOX, (-180, -90, -180, -90), (180, 90, 180, 90)):
+            self._spins.append(self._spin(value, low, high, 2, "°"))
+        self._spins += [self._spin(2015, 1979, 2100, 0, ""), self._spin(2024, 1979, 2100, 0, ""),
+                        self._spin(8, 0.5, 4096, 1, " GB")]
+        for i, spin in enumerate(self._spins):
+            if i == 4:
+                row.addWidget(QLabel("years"))
+            elif i == 6:
+                row.addWidget(QLabel("RAM"))
+            row.addWidget(spin)
+        estimate = QPushButton("Estimate")
+        estimate.clicked.connect(self._estimate)
+        row.addWidget(estimate)
+        row.addStretch()
+        v.addLayout(row)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSizeAdjustPolicy(QTableWidget.AdjustToContents)
+        self.table.hide()
+        self.result.hide()
+        v.addWidget(self.table)
+        v.addWidget(self.result)
+        self.setLayout(v)
+        model.modelReset.connect(lambda: self._shown and self._estimate())
+
+    def _spin(self, value, low, high, decimals, suffix) -> QDoubleSpinBox:
+        spin = QDoubleSpinBox()
+        spin.setRange(low, high); spin.setDecimals(decimals); spin.setSuffix(suffix); spin.setValue(value)
+        spin.valueChanged.connect(lambda _: self._shown and self._estimate())
+        return spin
+
+    def _show_rows(self, labels, rows):
+        self.table.setRowCount(len(rows))
+        self.table.setVerticalHeaderLabels(labels)
+        bold = QFont(); bold.setBold(True)
+        for r, values in enumerate(rows):
+            for c, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if r == len(rows) - 1:
+                    item.setFont(bold)
+                self.table.setItem(r, c, item)
+        # Grows to fit its rows, but shares the tab height with the catalog table
+        self.table.setMaximumHeight(self.table.horizontalHeader().sizeHint().height()
+                                    + self.table.verticalHeader().length() + 2 * self.table.frameWidth())
+        self.table.setVisible(bool(rows))
+
+    def _estimate(self):
+        self._shown = True
+        self.result.show()
+        west, south, east, north, first, last, ram = (spin.value() for spin in self._spins)
+        if self._grids is None:
+            self._grids = self._engine.product_grids()
+        products = [row["id"] for row in self._model.visible_rows() if row.get("id") in self._grids]
+        if not products:
+            self._show_rows([], [])
+            self.result.setText("None of the listed products is gridded.")
+            return
+        try:
+            report = self._engine.plan((west, south, east, north), (str(int(first)), str(int(last))),
+                                        products, ram_gb=ram)
+        except (KeyError, ValueError) as exc:
+            self._show_rows([], [])
+            self.result.setText(f"Cannot plan: {exc}")
+            return
+        size = self._engine.format_bytes
+        rows = [(f"{p['grid'][0]}×{p['grid'][1]}", f"{p['steps']:,d} × {p['timestep']}", f"{p['files']:,d}",
+                 size(p["raw_bytes"]), size(p["download_bytes"]), size(p["harmonized_bytes"]))
+                for p in report["products"]]
+        totals = report["totals"]
+        rows.append((f"{report['area_km2']:,.0f} km²", "", f"{totals['files']:,d}", size(totals["raw_bytes"]),
+                     size(totals["download_bytes"]), size(totals["harmonized_bytes"])))
+        self._show_rows([p["id"] for p in report["products"]] + ["Total"], rows)
+
+        memory = report["memory"]
+        suggested = memory["suggested"]
+        if suggested is None:
+            advice = f"no worker layout fits {size(memory['ram_bytes'])}; use a smaller basin or a coarser grid"
+        else:
+            advice = (f"fits {size(memory['ram_bytes'])} with <b>{suggested['workers']} worker"
+                      f"{'s' if suggested['workers'] > 1 else ''} × {suggested['band_rows']}-row bands</b> "
+                      f"(peak {size(suggested['peak_bytes'])}, <code>intro_harmonize.py --workers "
+                      f"{suggested['workers']} --band-rows {suggested['band_rows']}</code>)")
+        target = self._engine.Grid(**report["target"])
+        self.result.setText(f"<b>Harmonization</b> onto the {self._engine.format_step(target.step_x)} basin grid "
+                            f"({target.rows}×{target.cols}): {advice}")
+
+
+PREVIEW_ICON = QSize(84, 24)
+
+
+def load_preview_icon(previewer, row: dict, dpr: float):
+    # Worker: (row id, icon QImage or None, tooltip note) for a catalog row; the
+    # raster sample itself is cached by previewer (intro_preview), composing the
+    # icon is cheap
+    try:
+        found = previewer.dataset_preview(row, _cache)
+    except Exception as exc:
+        return row["id"], None, f"Local copy: no preview ({exc})"
+    if found is None:
+        return row["id"], None, ""
+    path, preview, _ = found
+    width, height = PREVIEW_ICON.width(), PREVIEW_ICON.height()
+    icon = QImage(round(width * dpr), round(height * dpr), QImage.Format_ARGB32_Premultiplied)
+    icon.setDevicePixelRatio(dpr)
+    icon.fill(Qt.transparent)
+    painter = QPainter(icon)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # Map on the left, scaled into a height x height box
+    rgba = preview["image"]
+    rows, cols = rgba.shape[:2]
+    image = QImage(rgba.tobytes(), cols, rows, 4 * cols, QImage.Format_RGBA8888)
+    box = QRectF(0, 0, height, height)
+    scale = min(box.width() / cols, box.height() / rows)
+    target = QRectF(0, 0, cols * scale, rows * scale)
+    target.moveCenter(box.center())
+    painter.drawImage(target, image)
+
+    # Sparkline of the spatial mean per time step on the right
+    series = [float(v) for v in preview["series"]]
+    finite = [v for v in series if math.isfinite(v)]
+    if len(finite) > 1:
+        lo, hi = min(finite), max(finite)
+        span = (hi - lo) or 1.0
+        left, right, top, bottom = height + 4, width - 1, 3, height - 3
+        pen = painter.pen(); pen.setColor(QColor("#2874A6")); pen.setWidthF(1.2)
+        painter.setPen(pen)
+        previous = None
+        for i, value in enumerate(series):
+            if not math.isfinite(value):
+                previous = None  # gaps break the line
+                continue
+            point = QPointF(left + (right - left) * i / (len(series) - 1),
+                            bottom - (bottom - top) * (value - lo) / span)
+            if previous is not None:
+                painter.drawLine(previous, point)
+            previous = point
+    painter.end()
+
+    shape = "x".join(str(int(n)) for n in preview["shape"])
+    lo, hi = preview["range"]
+    note = f"Local copy: {path}\n{shape}, values {lo:.3g}..{hi:.3g} (2-98 %)"
+    return row["id"], icon, note
+
+
+class CatalogModel(QAbstractTableModel):
+    # Table model over CatalogIndex rows; only the visible row ids are held, so
+    # filtering/sorting reorders a list of ints rather than rebuilding widgets
+    def __init__(self, index: CatalogIndex, parent=None):
+        super().__init__(parent)
+        self._index = index
+        self._visible = list(range(len(index.rows)))
+        self._sort = None  # (field, descending)
+        # Local-copy previews, requested the first time a row is painted
+        import intro_preview
+        self._previewer = intro_preview  # imported with the tab, not at startup
+        self._previews = {}  # row id -> (QPixmap or None, tooltip note)
+        self._pending = set()
+        app = QApplication.instance()
+        self._dpr = app.devicePixelRatio() if app is not None else 1.0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(CATALOG_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return CATALOG_COLUMNS[section][1]
+        return None
+
+    def row(self, index: QModelIndex) -> dict:
+        return self._index.rows[self._visible[index.row()]]
+
+    def visible_rows(self) -> list:
+        return [self._index.rows[i] for i in self._visible]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.row(index)
+        field = CATALOG_COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole:
+            return row.get(field, "")
+        if role == Qt.ToolTipRole:
+            note = self._previews.get(row.get("id"), (None, ""))[1] if index.column() == 0 else ""
+            return f"{row.get(field, '')}\n{note}" if note else row.get(field, "")
+        if role == Qt.DecorationRole and index.column() == 0:
+            return self._preview(row)
+        if field == "source" and row.get("url"):
+            if role == Qt.ForegroundRole:
+                return QColor("#2874A6")
+            if role == Qt.FontRole:
+                font = QFont(); font.setUnderline(True)
+                return font
+        if role == Qt.UserRole:
+            return row.get("url") or row.get("info_url") or ""
+        return None
+
+    def _preview(self, row: dict):
+        dataset_id = row.get("id")
+        if dataset_id in self._previews:
+            return self._previews[dataset_id][0]
+        if dataset_id and self._previewer.np is not None and dataset_id not in self._pending:
+            self._pending.add(dataset_id)
+            previewer, dpr = self._previewer, self._dpr
+            run_in_background(lambda: load_preview_icon(previewer, row, dpr), self._preview_ready, owner=self,
+                              pool=_side_pool("preview"))
+        return None
+
+    def _preview_ready(self, result):
+        dataset_id, image, note = result
+        self._pending.discard(dataset_id)
+        self._previews[dataset_id] = (QPixmap.fromImage(image) if image is not None else None, note)
+        rows = self._index.rows
+        for position, i in enumerate(self._visible):
+            if rows[i].get("id") == dataset_id:
+                cell = self.index(position, 0)
+                self.dataChanged.emit(cell, cell, [Qt.DecorationRole, Qt.ToolTipRole])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0:
+            return
+        self._sort = (CATALOG_COLUMNS[column][0], order == Qt.DescendingOrder)
+        self.layoutAboutToBeChanged.emit()
+        self._visible = self._index.sort(self._visible, *self._sort)
+        self.layoutChanged.emit()
+
+    def set_filter(self, query: str, field: str = ALL_FIELDS):
+        self.beginResetModel()
+        visible = self._index.filter(query, field)
+        self._visible = self._index.sort(visible, *self._sort) if self._sort else visible
+        self.endResetModel()
+
+    def open_link(self, index: QModelIndex):
+        url = self.data(index, Qt.UserRole)
+        if url:
+            QDesktopServices.openUrl(QUrl(url))
+
+
+class IntroWindow(QMainWindow):
+    def __init__(self, lazy=True, prebuild=True, locale=None, parent=None, release_after_s=None):
+        super().__init__(parent)
+        self._content = ContentStore(locale)
+        self.hide_on_close = False  # set by intro_window(): Close only hides, so reopening is instant
+        if self._content.right_to_left:
+            self.setLayoutDirection(Qt.RightToLeft)
         self.setWindowTitle("WA+ Water Accounting Framework - International Water Management Institute (IWMI)")
-        self.setGeometry(100, 100, 1000, 780)
+        self.setGeometry(*DEFAULT_GEOMETRY)
 
         main = QWidget()
         layout = QVBoxLayout()
@@ -34,6 +1364,27 @@ class IntroWindow(QMainWindow):
         title.setStyleSheet("color:#2E86C1; margin-bottom: 16px;")
         layout.addWidget(title)
 
+        # Search across all tabs (index built on first use, cached on disk)
+        self._search_index = None
+        self._block_widgets = {}
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search all tabs...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setMaximumWidth(320)
+        self.search_box.textChanged.connect(self._run_search)
+        self.search_box.returnPressed.connect(self._jump_to_first_result)
+        search_row = QHBoxLayout()
+        search_row.addStretch()
+        search_row.addWidget(self.search_box)
+        layout.addLayout(search_row)
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.setVisible(False)
+        self.search_results.itemActivated.connect(self._jump_to_result)
+        self.search_results.itemClicked.connect(self._jump_to_result)
+        layout.addWidget(self.search_results)
+        QShortcut(QKeySequence.Find, self, activated=self.search_box.setFocus)
+
         # Tabs
         self.tabs = QTabWidget()
         self.tabs.setStyleSheet("""
@@ -55,11 +1406,37 @@ class IntroWindow(QMainWindow):
             }
         """)
 
-        self._add_overview_tab()
-        self._add_workflow_tab()
-        self._add_methodology_tab()  # moved earlier so users see it quickly
-        self._add_data_tab()
-        self._add_references_tab()
+        # Each tab starts as a lightweight placeholder; its real widget tree is
+        # built the first time it is selected (or in idle time after first paint)
+        self._tab_builders = [
+            ("Overview", self._build_overview_tab),
+            ("Workflow", self._build_workflow_tab),
+            ("Methodology", self._build_methodology_tab),  # moved earlier so users see it quickly
+            ("Data Sources", self._build_data_tab),
+            ("References & Credits", self._build_references_tab),
+        ]
+        self._realized = set()
+        self._last_used = {}  # tab index -> time.monotonic() it was last current
+        self._prebuild = lazy and prebuild
+        self._first_paint_done = False
+        self._screen_hooked = False
+        self._show_ts = 0.0
+        for title, _ in self._tab_builders:
+            self.tabs.addTab(self._placeholder(), title)
+
+        # Also connected when eager, so released tabs come back on demand
+        self.tabs.currentChanged.connect(self._realize_tab)
+        if lazy:
+            self._realize_tab(self.tabs.currentIndex())
+        else:
+            for index in range(self.tabs.count()):
+                self._realize_tab(index)
+
+        self.release_after_s = RELEASE_AFTER_S if release_after_s is None else release_after_s
+        self._release_timer = QTimer(self)
+        self._release_timer.timeout.connect(self._release_idle)
+        if self.release_after_s > 0:
+            self._release_timer.start(int(max(1.0, self.release_after_s / 4) * 1000))
 
         layout.addWidget(self.tabs)
 
@@ -83,21 +1460,292 @@ class IntroWindow(QMainWindow):
         main.setLayout(layout)
         self.setCentralWidget(main)
 
+    # ---------- Lazy tabs ----------
+    def _placeholder(self) -> QWidget:
+        page = QWidget()
+        v = QVBoxLayout(); v.setContentsMargins(0, 0, 0, 0)
+        v.addWidget(self._loading_label())
+        page.setLayout(v)
+        return page
+
+    @staticmethod
+    def _loading_label() -> QLabel:
+        loading = QLabel("Loading...")
+        loading.setAlignment(Qt.AlignCenter)
+        loading.setStyleSheet("color:#7F8C8D;")
+        return loading
+
+    @staticmethod
+    def _clear_page(page: QWidget):
+        layout = page.layout()
+        while layout.count():
+            item = layout.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
+
+    def _realize_tab(self, index: int):
+        if index < 0:
+            return
+        self._last_used[index] = time.monotonic()
+        if index in self._realized:
+            return
+        self._realized.add(index)
+        page = self.tabs.widget(index)
+        self._clear_page(page)
+        title, build = self._tab_builders[index]
+        with tracer.span(f"{build.__name__} ({title})"):
+            page.layout().addWidget(build())
+
+    # ---------- Memory ----------
+    def release_tab(self, index: int):
+        # Drop a tab's widget tree (documents, diagram pixmaps and tiles) back to
+        # the placeholder; it is rebuilt, mostly from the disk cache, when selected
+        if index not in self._realized:
+            return
+        self._realized.discard(index)
+        for name, tab in self.SEARCH_BLOCKS:
+            if tab == index:
+                self._block_widgets.pop(name, None)
+        page = self.tabs.widget(index)
+        self._clear_page(page)
+        page.layout().addWidget(self._loading_label())
+        tracer.instant("release tab", tab=self._tab_builders[index][0])
+
+    def release_memory(self, idle_s: float = 0.0):
+        # Release every tab unused for idle_s (the current one only while hidden,
+        # and never for hide-on-close windows, which are kept to reopen instantly);
+        # with nothing left on screen, shared decoded data goes too
+        now = time.monotonic()
+        keep_current = self.isVisible() or self.hide_on_close
+        for index in sorted(self._realized):
+            if keep_current and index == self.tabs.currentIndex():
+                continue
+            if now - self._last_used.get(index, 0.0) >= idle_s:
+                self.release_tab(index)
+        if not self._realized:
+            self._search_index = None
+            self._content.release()
+            _TileSources.release()
+
+    def _release_idle(self):
+        if self.isVisible():
+            self._last_used[self.tabs.currentIndex()] = time.monotonic()
+        self.release_memory(self.release_after_s)
+
+    def memory_report(self) -> list:
+        # Approximate bytes held per tab: {"tab", "realized", "idle_s", "widgets",
+        # "documents", "images", "total"}, plus a final "(shared)" entry
+        now = time.monotonic()
+        report = []
+        for index, (title, _) in enumerate(self._tab_builders):
+            page = self.tabs.widget(index)
+            widgets = page.findChildren(QWidget)
+            documents = images = 0
+            for widget in widgets:
+                if isinstance(widget, RichTextBlock):
+                    documents += widget.memory_bytes()
+                elif isinstance(widget, QTextBrowser):
+                    documents += document_bytes(widget.document())
+                elif isinstance(widget, DiagramView):
+                    images += widget.memory_bytes()
+            widget_bytes = len(widgets) * _WIDGET_BYTES
+            report.append({"tab": title, "realized": index in self._realized,
+                           "idle_s": round(now - self._last_used[index], 1) if index in self._last_used else None,
+                           "widgets": len(widgets), "documents": documents, "images": images,
+                           "total": documents + images + widget_bytes})
+        search = 0
+        if self._search_index is not None:
+            search = sum(len(block["text"]) * 2 for block in self._search_index.blocks.values())
+        images = _TileSources.memory_bytes()
+        report.append({"tab": "(shared)", "realized": True, "idle_s": None, "widgets": 0,
+                       "documents": search, "images": images, "total": search + images})
+        return report
+
+    def _prebuild_next(self):
+        pending = [i for i in range(self.tabs.count()) if i not in self._realized]
+        if not pending:
+            if not self.isVisible():
+                self._ensure_search_index()  # hidden warm-up: make the first search instant too
+            return
+        self._realize_tab(pending[0])
+        # One tab per event-loop turn keeps the window responsive while building
+        QTimer.singleShot(0, self._prebuild_next)
+
+    def showEvent(self, event):
+        if not self._first_paint_done:
+            self._show_ts = tracer.now_us()
+        self._realize_tab(self.tabs.currentIndex())  # may have been released while hidden
+        if self._first_paint_done and self._prebuild and len(self._realized) < self.tabs.count():
+            QTimer.singleShot(0, self._prebuild_next)  # rebuild released tabs in idle time again
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None and not self._screen_hooked:
+            self._screen_hooked = True
+            handle.screenChanged.connect(self._screen_changed)
+
+    def _screen_changed(self, screen):
+        # Only a different device pixel ratio needs new previews; diagram tiles
+        # follow on their own since their level of detail includes the ratio
+        dpr = screen.devicePixelRatio() if screen is not None else self.devicePixelRatioF()
+        with tracer.span("screen changed", dpr=dpr):
+            for view in self.findChildren(DiagramView):
+                view.show_for_dpr(dpr)
+
+    def hideEvent(self, event):
+        self._last_used[self.tabs.currentIndex()] = time.monotonic()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        if self.hide_on_close:
+            event.ignore()
+            self.hide()
+            return
+        super().closeEvent(event)
+
+    # ---------- Embedding ----------
+    def open(self, tab=None):
+        # Show (or re-show) the window, optionally on a tab given by index or title
+        if tab is not None:
+            self.tabs.setCurrentIndex(self._tab_index(tab))
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def _tab_index(self, tab) -> int:
+        if isinstance(tab, int):
+            if not 0 <= tab < self.tabs.count():
+                raise IndexError(f"no intro tab {tab}")
+            return tab
+        for index, (title, _) in enumerate(self._tab_builders):
+            if tab.lower() in (title.lower(), self.tabs.tabText(index).lower()):
+                return index
+        raise ValueError(f"no intro tab named {tab!r}")
+
+    def warm_up(self):
+        # Build every tab (and the search index) in idle time while still hidden
+        self._prebuild = True
+        QTimer.singleShot(0, self._prebuild_next)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            tracer.complete("first paint", self._show_ts)
+            if self._prebuild:
+                QTimer.singleShot(0, self._prebuild_next)
+            QTimer.singleShot(SNAPSHOT_DELAY_MS, self._save_snapshot)
+
+    def _save_snapshot(self):
+        # Capture the Overview frame for the next fast start (default size only,
+        # since that is where the splash is shown)
+        if self.tabs.currentIndex() != 0 or not self.isVisible():
+            return
+        if (self.width(), self.height()) != DEFAULT_GEOMETRY[2:]:
+            return
+        pixmap = self.grab()
+        key = _splash_key(self._content.locale, self._content.version,
+                          self.width(), self.height(), pixmap.devicePixelRatio())
+        if _cache.get(key) is not None:
+            return
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.WriteOnly)
+        pixmap.save(buf, "PNG")
+        buf.close()
+        try:
+            _cache.put(key, bytes(data))
+        except OSError:
+            pass
+
+    # ---------- Search ----------
+    # Content blocks and the tab each one lives on
+    SEARCH_BLOCKS = (
+        ("_overview_html", 0),
+        ("_workflow_html_part1", 1), ("_workflow_html_part2", 1),
+        ("_methodology_html_part1", 2), ("_methodology_html_part2", 2),
+        ("_data_html", 3),
+        ("_references_html", 4),
+    )
+
+    def _block(self, name: str, widget):
+        self._block_widgets[name] = widget
+        return widget
+
+    def _ensure_search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            with tracer.span("search index"):
+                path = _cache.path(f"search_index_{self._content.locale}.json")
+                index = SearchIndex.load(path)
+                changed = index.update({name: getattr(self, name)() for name, _ in self.SEARCH_BLOCKS})
+                if changed:
+                    try:
+                        index.save(path)
+                    except OSError:
+                        pass
+                self._search_index = index
+        return self._search_index
+
+    def _run_search(self, text: str):
+        self.search_results.clear()
+        results = self._ensure_search_index().search(text) if text.strip() else []
+        tab_of = dict(self.SEARCH_BLOCKS)
+        for result in results:
+            item = QListWidgetItem(f"{self.tabs.tabText(tab_of[result['block']])}:  {result['snippet']}")
+            item.setData(Qt.UserRole, result)
+            self.search_results.addItem(item)
+        self.search_results.setVisible(bool(results))
+
+    def _jump_to_first_result(self):
+        if self.search_results.count():
+            self._jump_to_result(self.search_results.item(0))
+
+    def _jump_to_result(self, item: QListWidgetItem):
+        result = item.data(Qt.UserRole)
+        self.tabs.setCurrentIndex(dict(self.SEARCH_BLOCKS)[result["block"]])  # realizes the tab
+        # Highlight once the (possibly just built) tab has been laid out
+        QTimer.singleShot(0, lambda: self._highlight_result(result))
+
+    def _highlight_result(self, result: dict):
+        widget = self._block_widgets.get(result["block"])
+        if isinstance(widget, QLineEdit):  # catalog: filter to the match
+            widget.setText(result["match"])
+        elif isinstance(widget, QTextBrowser):
+            cursor = find_occurrence(widget.document(), result["match"], result["occurrence"])
+            if cursor is not None:
+                widget.setTextCursor(cursor)
+                widget.ensureCursorVisible()
+        elif isinstance(widget, RichTextBlock):
+            y = widget.select_text(result["match"], result["occurrence"])
+            area = self._scroll_area_of(widget)
+            if y >= 0 and area is not None:
+                top = widget.mapTo(area.widget(), QPoint(0, y)).y()
+                area.ensureVisible(0, top, 0, area.viewport().height() // 3)
+
+    @staticmethod
+    def _scroll_area_of(widget):
+        parent = widget.parentWidget()
+        while parent is not None and not isinstance(parent, QScrollArea):
+            parent = parent.parentWidget()
+        return parent
+
     # ---------- Tabs ----------
-    def _add_overview_tab(self):
+    def _build_overview_tab(self) -> QWidget:
         tab = QWidget(); v = QVBoxLayout()
         scroll = QScrollArea(); scroll.setWidgetResizable(True)
         content = QWidget(); cv = QVBoxLayout()
 
-        w = self._browser(self._overview_html())
+        w = self._block("_overview_html", self._browser(self._overview_html()))
         cv.addWidget(w)
         content.setLayout(cv)
         scroll.setWidget(content)
         v.addWidget(scroll)
         tab.setLayout(v)
-        self.tabs.addTab(tab, "Overview")
+        return tab
 
-    def _add_workflow_tab(self):
+    def _build_workflow_tab(self) -> QWidget:
         tab = QWidget()
         v_layout = QVBoxLayout()
         scroll = QScrollArea()
@@ -108,34 +1756,20 @@ class IntroWindow(QMainWindow):
         content_layout = QVBoxLayout()
         content_layout.setContentsMargins(10, 10, 10, 10)
 
-        lbl_part1 = QLabel(self._workflow_html_part1())
-        lbl_part1.setWordWrap(True)
-        lbl_part1.setOpenExternalLinks(True)
-        lbl_part1.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse)
-        lbl_part1.setStyleSheet("border: none; padding: 14px;")
-        content_layout.addWidget(lbl_part1)
-
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        img_path = os.path.join(base_dir, "workflow.svg")
-        svg_widget = QSvgWidget(img_path)
-        svg_widget.setFixedSize(900, 550)
-        content_layout.addWidget(svg_widget, alignment=Qt.AlignCenter)
-
-        lbl_part2 = QLabel(self._workflow_html_part2())
-        lbl_part2.setWordWrap(True)
-        lbl_part2.setOpenExternalLinks(True)
-        lbl_part2.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse)
-        lbl_part2.setStyleSheet("border: none; padding: 14px;")
-        content_layout.addWidget(lbl_part2)
+        content_layout.addWidget(self._text_block("_workflow_html_part1"))
+        content_layout.addWidget(self._diagram("workflow.svg", 900, 550))
+        content_layout.addWidget(self._text_block("_workflow_html_part2"))
+        # The "Pre-process & Harmonize" step, runnable on sample inputs
+        content_layout.addWidget(HarmonizePanel())
 
         content_layout.addStretch()
         content_widget.setLayout(content_layout)
         scroll.setWidget(content_widget)
         v_layout.addWidget(scroll)
         tab.setLayout(v_layout)
-        self.tabs.addTab(tab, "Workflow")
+        return tab
 
-    def _add_methodology_tab(self):
+    def _build_methodology_tab(self) -> QWidget:
         tab = QWidget()
         v_layout = QVBoxLayout()
         scroll = QScrollArea()
@@ -149,29 +1783,20 @@ class IntroWindow(QMainWindow):
         content_layout.setContentsMargins(10, 10, 10, 10)
 
         # Part 1: Text content before the flowchart
-        # Use QLabel to ensure it expands fully without internal scrollbars
-        lbl_part1 = QLabel(self._methodology_html_part1())
-        lbl_part1.setWordWrap(True)
-        lbl_part1.setOpenExternalLinks(True)
-        lbl_part1.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse)
-        lbl_part1.setStyleSheet("border: none; padding: 14px;")
-        content_layout.addWidget(lbl_part1)
-
-        # Part 2: The flowchart SVG image
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        img_path = os.path.join(base_dir, "flowchart.svg")
-        svg_widget = QSvgWidget(img_path)
-        # Fix size to fit comfortably within the 1000px window width (approx 960 viewable)
-        svg_widget.setFixedSize(900, 600)
-        content_layout.addWidget(svg_widget, alignment=Qt.AlignCenter)
+        # RichTextBlock expands fully (no internal scrollbars) and relayouts cheaply on resize
+        content_layout.addWidget(self._text_block("_methodology_html_part1"))
+
+        # Interactive evaluation of the equations above on a gridded sample basin
+        content_layout.addWidget(WaterBalancePanel())
+
+        # Part 2: The flowchart SVG image, zoomable; 600px high fits the 1000px window comfortably
+        content_layout.addWidget(self._diagram("flowchart.svg", 900, 600))
 
         # Part 3: Text content after the flowchart (Caption + Text)
-        lbl_part2 = QLabel(self._methodology_html_part2())
-        lbl_part2.setWordWrap(True)
-        lbl_part2.setOpenExternalLinks(True)
-        lbl_part2.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse)
-        lbl_part2.setStyleSheet("border: none; padding: 14px;")
-        content_layout.addWidget(lbl_part2)
+        content_layout.addWidget(self._text_block("_methodology_html_part2"))
+
+        # Runnable reference of the soil moisture balance described in part 2
+        content_layout.addWidget(SoilMoisturePanel())
 
         # Add stretch to push content up if needed (though content is long enough)
         content_layout.addStretch()
@@ -180,400 +1805,294 @@ class IntroWindow(QMainWindow):
         scroll.setWidget(content_widget)
         v_layout.addWidget(scroll)
         tab.setLayout(v_layout)
-        self.tabs.addTab(tab, "Methodology")
+        return tab
 
-    def _add_data_tab(self):
+    def _build_data_tab(self) -> QWidget:
         tab = QWidget(); v = QVBoxLayout()
-        scroll = QScrollArea(); scroll.setWidgetResizable(True)
-        content = QWidget(); cv = QVBoxLayout()
 
-        w = self._browser(self._data_html())
-        cv.addWidget(w)
-        content.setLayout(cv)
-        scroll.setWidget(content)
-        v.addWidget(scroll)
+        heading = QLabel(self._data_intro_html())
+        heading.setWordWrap(True)
+        heading.setStyleSheet("background:white; padding:14px 14px 0 14px;")
+        v.addWidget(heading)
+
+        # Incremental filter over the precomputed catalog index
+        filter_row = QHBoxLayout()
+        query = self._block("_data_html", QLineEdit()); query.setPlaceholderText("Filter datasets...")
+        query.setClearButtonEnabled(True)
+        field = QComboBox()
+        field.addItem("All fields", ALL_FIELDS)
+        for label, key in FILTER_FIELDS:
+            field.addItem(label, key)
+        filter_row.addWidget(query, 1)
+        filter_row.addWidget(field)
+        v.addLayout(filter_row)
+
+        model = CatalogModel(default_index(), tab)
+        table = QTableView()
+        table.setModel(model)
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)  # catalog order until a header is clicked
+        table.setSortingEnabled(True)
+        table.setSelectionBehavior(QTableView.SelectRows)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        table.setAlternatingRowColors(True)
+        table.setWordWrap(False)
+        table.setIconSize(PREVIEW_ICON)
+        # Fixed row heights keep the view virtualized (no per-row size hints)
+        table.verticalHeader().setVisible(False)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.verticalHeader().setDefaultSectionSize(28)
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        for column, width in enumerate((320, 140, 150, 200)):
+            header.resizeSection(column, width)
+        table.doubleClicked.connect(lambda index: model.open_link(index))
+        v.addWidget(table, 1)  # the table takes any height the planner does not need
+
+        def apply_filter():
+            model.set_filter(query.text(), field.currentData())
+        query.textChanged.connect(apply_filter)
+        field.currentIndexChanged.connect(apply_filter)
+
+        # What acquiring and harmonizing the filtered products would cost
+        v.addWidget(PlannerPanel(model))
+
         tab.setLayout(v)
-        self.tabs.addTab(tab, "Data Sources")
+        return tab
 
-    def _add_references_tab(self):
+    def _build_references_tab(self) -> QWidget:
         tab = QWidget(); v = QVBoxLayout()
         scroll = QScrollArea(); scroll.setWidgetResizable(True)
         content = QWidget(); cv = QVBoxLayout()
 
-        w = self._browser(self._references_html())
+        w = self._block("_references_html", self._browser(self._references_html()))
         cv.addWidget(w)
         content.setLayout(cv)
         scroll.setWidget(content)
         v.addWidget(scroll)
         tab.setLayout(v)
-        self.tabs.addTab(tab, "References & Credits")
+        return tab
 
     # ---------- Helpers ----------
     def _browser(self, html: str) -> QTextBrowser:
         b = QTextBrowser()
         b.setOpenExternalLinks(True)
         b.setStyleSheet("QTextBrowser { background:white; border:none; padding:14px; }")
-        b.setHtml(html)
+        with tracer.span("_browser setHtml", chars=len(html)):
+            b.setHtml(html)
         return b
 
+    def _text_block(self, name: str) -> RichTextBlock:
+        # Rich text from one content method, registered for search
+        html = getattr(self, name)()
+        with tracer.span("_text_block setHtml", chars=len(html)):
+            return self._block(name, RichTextBlock(html))
+
+    def _diagram(self, name: str, width: int, height: int) -> DiagramView:
+        # A sized placeholder is shown at once; the pre-scaled preview is decoded
+        # (or rendered and cached) on a worker thread and swapped in when ready,
+        # and sharper tiles are rendered in the background when zoomed
+        view = DiagramView(name, QSize(width, height))
+        view.setMinimumSize(min(width, 480), height)
+        view.setMaximumHeight(height)
+        view.setToolTip("Scroll to zoom, drag to pan, double-click to fit")
+        view.show_for_dpr(self.devicePixelRatioF())
+        return view
+
     # ---------- Content ----------
+    # Blocks come from the per-locale content store (content/<locale>/*.html),
+    # decoded on first use from the locale's memory-mapped bundle
     def _overview_html(self) -> str:
-        return """
-        <h2 style="color:#2E86C1;">Introduction</h2>
-        <p>Increasing water scarcity is an entrenched problem that faces Jordan. The country is naturally characterized by an arid to semi-arid climate. Water scarcity is compounded by population growth and increasing demands on limited water resources. Climate change is anticipated to reduce long-term conventional water resources (Ministry of Environment, 2021). The combined impact of these factors will likely affect all human activities and the country's economic development. The Water Efficiency and Conservation (WEC) Activity contributes to USAID/Jordan's Country Development Cooperation Strategy's (CDC: 2020-2025) five-year goals of supporting Jordan to advance its stability, prosperity, and self-reliance by spurring including private sector-led economic growth, improving water security, strengthening accountable governance, fostering a healthy, well-educated population, and enhancing the agency and leadership of women and youth. The International Water Management Institute (IWMI) is non-profit research for development organization headquartered in Colombo, Sri Lanka, with offices throughout Asia, and Africa, including a regional office for the MENA region in Egypt with a team in Jordan. IWMI is a member of the CGIAR System of international agricultural research centers, a global research partnership for a food-secure future dedicated to reducing poverty, enhancing food and nutrition security, and improving natural resources. IWMI's vision is a water-secure world, and our mission is to provide water solutions for sustainable, climate-resilient development. IWMI has conducted active research programs in Jordan since the 2000s and the latest contributions in Jordan included Monitoring & Evaluation (M&E) inputs to the USAID’s Water Innovation Technologies (WIT) project, leading the field-scale monitoring and evaluation of water savings generated from adopting water-saving technologies across agriculture and domestic sectors and communal water use.</p>
-
-        <h2 style="color:#2E86C1;">What is WA+?</h2>
-        <p><b>Water Accounting Plus (WA+)</b> is a standardized framework developed by the
-        International Water Management Institute (IWMI) and partners to measure, monitor,
-        and communicate how water is <i>available</i>, <i>used</i>, and <i>shared</i> in river basins.</p>
-
-        <div style="background:#EBF5FB; padding:12px; border-left:5px solid #2E86C1; margin:12px 0;">
-            <p style="margin:0;">
-            <b>For non-technical users:</b> WA+ is like a financial account for water - tracking each inflow,
-            outflow, and change in storage to build trust and support fair allocation.<br><br>
-            <b>For technical users:</b> WA+ provides consistent definitions, spatially explicit datasets, and
-            reproducible calculations for basin-scale auditing, with options to validate against independent observations.
-            </p>
-        </div>
-
-        <h3 style="color:#2874A6;">What problems does WA+ solve?</h3>
-        <ul>
-          <li><b>Transparency:</b> A clear, shared picture of availability, use, and trends</li>
-          <li><b>Comparability:</b> Standard “Sheets” enable apples-to-apples comparison across basins/years</li>
-          <li><b>Decision support:</b> Identifies scarcity, inefficiency, and trade-offs for planning & policy</li>
-        </ul>
-
-        <h3 style="color:#2874A6;">Core concepts</h3>
-        <ul>
-          <li><b>Water balance:</b> Inflows = Outflows ± ΔStorage (soil, groundwater, surface water)</li>
-          <li><b>Consumptive use (ETa):</b> Water actually consumed by vegetation, open water, and urban areas</li>
-          <li><b>Beneficial vs. non-beneficial consumption:</b> Productive transpiration vs. losses like bare-soil evaporation</li>
-          <li><b>Green vs. Blue water:</b> Rain-fed consumption vs. managed supply (e.g., irrigation)</li>
-        </ul>
-
-        <h3 style="color:#2874A6;">WA+ Sheets (standard outputs)</h3>
-        <ul>
-            <li><b>Sheet 1 - Resource Base:</b> Precipitation & inflows, outflows, ΔStorage</li>
-            <li><b>Sheet 2 - Evapotranspiration (Use):</b> ETa by land use; beneficial vs. non-beneficial</li>
-        </ul>
-        """
+        return self._content.get("overview")
 
     def _workflow_html_part1(self) -> str:
-        return """
-        <h2 style="color:#2E86C1;">Customized Workflow</h2>
-        <p>WA+ turns heterogeneous data into standard accounts through a transparent, repeatable process.</p>
-        """
+        return self._content.get("workflow_part1")
 
     def _workflow_html_part2(self) -> str:
-        return """
-        <div style="background:#F8F9F9; padding:14px; border:1px solid #E5E7E9; border-radius:8px;">
-          <h3 style="color:#2874A6; margin-top:0;">High-level stages</h3>
-          <ol>
-            <li><b>Define the Basin & Period:</b> AOI/basin boundary, reporting year(s) or seasons</li>
-            <li><b>Acquire Inputs:</b> Precipitation, ET, vegetation, DEM, soil moisture, surface water, land cover</li>
-            <li><b>Pre-process & Harmonize:</b> Reprojection, resampling, QA/QC, gap-filling; convert to common grids (NetCDF)</li>
-            <li><b>Compute Fluxes & Stores:</b> ETa, runoff proxies, ΔStorage; decompose ET (T/E) and green/blue shares</li>
-            <li><b>Stratify by Land Use:</b> Protected / Utilized(Modified) / Managed water-use classes</li>
-            <li><b>Assemble WA+ Sheets:</b> Resource base, ET use, productivity, withdrawals, surface water, groundwater</li>
-            <li><b>Validate & Review:</b> Cross-check ΔS with GRACE; compare flows with gauges; stakeholder review</li>
-            <li><b>Report & Share:</b> Maps, charts, time series, and sheet summaries</li>
-          </ol>
-        </div>
-
-        <p style="margin-top:12px;"><b>Tip for users:</b> In this app, the <i>NetCDF</i> step standardizes inputs so downstream
-        analysis and reporting are consistent and reproducible.</p>
-        """
+        return self._content.get("workflow_part2")
 
     def _methodology_html_part1(self) -> str:
-        return """
-        <h2 style="color:#2E86C1;">Customized WA+ Analytical Framework for Jordan</h2>
-        <p>WA+ is a robust framework that harnesses the potential of publicly available remote sensing data to assess water resources and their consumption. Its reliance on such data is particularly beneficial in data scarce areas and transboundary basins. A significant benefit of WA+ lies in its incorporation of land use classification into water resource assessments, promoting a holistic approach to land and water management. This integration is crucial for sustaining food production amidst a changing climate, especially in regions where water is scarce. Notably, WA+ application has predominantly centered on monitoring water consumption in irrigated agriculture.</p>
-
-        <p>The WA+ approach builds on a simplified water balance equation for a basin (Karimi et al., 2013):</p>
-
-        <div style="background:#F8F9F9; padding:10px; margin:10px 0; border-left:4px solid #2874A6;">
-            <p style="text-align:center; font-family:'Times New Roman', serif; font-size:16px;">
-            <i>&Delta;S</i>/<i>&Delta;t</i> = <i>P</i> - <i>ET</i> - <i>Q<sub>out</sub></i> &nbsp;&nbsp;&nbsp;&nbsp;&nbsp; (1)
-            </p>
-            <p style="font-size:14px; margin-left:20px;">
-            Where:<br>
-            <i>&Delta;S</i> is the change in storage<br>
-            <i>&Delta;t</i> is the change in time<br>
-            <i>P</i> is precipitation (mm/year or m<sup>3</sup>/year)<br>
-            <i>ET</i> is total actual evapotranspiration (mm/year or m<sup>3</sup>/year)<br>
-            <i>Q<sub>out</sub></i> is total surface water outflow (mm/year or m<sup>3</sup>/year)
-            </p>
-        </div>
-
-        <p>To utilize the WA+ approach for water budget reporting in Jordan, it is important to account for all water users, other than irrigation, and their return flows into equation 1. Also, in Jordan, man-made inflows and outflows of great importance especially in heavily populated basins (Amdar et al., 2024). Therefore, an updated water balance incorporating various sectoral water consumption in addition to inflow and outflows is proposed (Amdar et al., 2024). Hence, equation (2) represents the updated WA+ water balance equation in the context of Jordan. This modification will further be refined following detailed discussions and consultations with the WEC and MWI team to ensure complete understanding and consensus of the customized framework for Jordan.</p>
-
-        <div style="background:#F8F9F9; padding:10px; margin:10px 0; border-left:4px solid #2874A6;">
-            <p style="text-align:center; font-family:'Times New Roman', serif; font-size:16px;">
-            <i>&Delta;S</i>/<i>&Delta;t</i> = (<i>P</i> + <i>Q<sub>in</sub></i>) - (<i>ET</i> + <i>CW<sub>sec</sub></i> + <i>Q<sub>WWT</sub></i> + <i>Q<sub>re</sub></i> + <i>Q<sub>natural</sub></i>) &nbsp;&nbsp;&nbsp;&nbsp;&nbsp; (2)
-            </p>
-            <p style="font-size:14px; margin-left:20px;">
-            Where:<br>
-            <i>P</i> is the total precipitation (Mm<sup>3</sup>/year)<br>
-            <i>ET</i> is the total actual evapotranspiration (Mm<sup>3</sup>/year)<br>
-            <i>Q<sub>in</sub></i> is the total inflows into the basin consisting of both surface water inflows and any other inter-basin transfers (Mm<sup>3</sup>/year)<br>
-            <i>Q<sub>re</sub></i> is the total recharge to groundwater from precipitation and return flow (Mm<sup>3</sup>/year)<br>
-            <i>Q<sub>WWT</sub></i> is the total treated waste water that is returned to the river system after treatment. This could be from domestic, industry and tourism sectors (Mm<sup>3</sup>/year)<br>
-            <i>Q<sub>natural</sub></i> is the naturalized streamflow from the basin (Mm<sup>3</sup>/year)<br>
-            <i>CW<sub>sec</sub></i> is the total non-irrigated water use/consumption (ie water that is not returned to the system but is consumed by humans) and is given by:
-            </p>
-
-            <p style="text-align:center; font-family:'Times New Roman', serif; font-size:16px;">
-            <i>CW<sub>sec</sub></i> = <i>Supply<sub>domestic</sub></i> + <i>Supply<sub>industrial</sub></i> + <i>Supply<sub>livestock</sub></i> + <i>Supply<sub>tourism</sub></i> &nbsp;&nbsp;&nbsp;&nbsp;&nbsp; (3)
-            </p>
-
-            <p style="font-size:14px; margin-left:20px;">
-            Where:<br>
-            <i>Supply<sub>domestic</sub></i> is the water supply for the domestic sector (Mm<sup>3</sup>/year)<br>
-            <i>Supply<sub>industrial</sub></i> is the water supply for the industrial sector (Mm<sup>3</sup>/year)<br>
-            <i>Supply<sub>livestock</sub></i> is the water supply for the livestock sector (Mm<sup>3</sup>/year)<br>
-            <i>Supply<sub>tourism</sub></i> is the water supply for the tourism sector (Mm<sup>3</sup>/year)
-            </p>
-        </div>
-
-        <p>The customized WA+ framework thus takes into account both agricultural and non-irrigated water consumption, water imports and the return of treated wastewater into the basin.</p>
-        """
+        return self._content.get("methodology_part1")
 
     def _methodology_html_part2(self) -> str:
-        return """
-        <div style="text-align:center; font-weight:bold; margin:10px 0 20px 0; color:#2E86C1;">
-            Figure 2. The WA+ toolbox: main processing modules of the customized WA+ Framework for Jordan.
-        </div>
-
-        <p>Implementation of the WA+ framework involves automated collection, pre-processing and computation of the water balance for a river basin and its sub-basins through the WA+ toolbox. The customized framework for the Amman Zarqa basin consists of six major steps to calculate and present the water accounts: data download and pre-processing, water balance modeling, calibration/validation of streamflow, estimation of non-agricultural water consumption, generation of water accounts, and interpretation and presentation of results.</p>
-
-        <p>During the data preparation step, various remote sensing datasets and tabular data are acquired from different sources. These datasets are then prepared for input and analyzed to select the most representative datasets for the basin of interest. This involves comparison with available in situ data, and any calibration needed to address systematic errors in the remotely sensed data.</p>
-
-        <p>During the second step, the hydrological variability of the basin is characterized by computing various water balance indicators across the watershed using a water balance model. Assessment of the water balance is the core component of the approach; water balance equations are used to describe the flow of water in and out of a system. For the customized WA+ approach for Jordan, the water balance equation is calculated following Equation 4. The change in water storage (<i>&Delta;S</i>) within a river basin (or sub-basin) is calculated over a monitoring period (<i>&Delta;t</i>) as the difference between the incoming and outgoing water flows. The incoming flows consist of rainfall (precipitation; <i>P</i>) and manmade inflows (<i>Q<sub>in</sub></i>), and the outgoing flows consist of evapotranspiration (<i>ET</i>), treated waste water returned to stream (<i>Q<sub>wwt</sub></i>), sectorial water consumption (<i>CW<sub>sec</sub></i>), and outflows (<i>Q<sub>out</sub></i>).</p>
+        return self._content.get("methodology_part2")
 
-        <div style="background:#F8F9F9; padding:10px; margin:10px 0; border-left:4px solid #2874A6;">
-            <p style="text-align:center; font-family:'Times New Roman', serif; font-size:16px;">
-            <i>&Delta;S</i>/<i>&Delta;t</i> = (<i>P</i> + <i>Q<sub>in</sub></i>) - (<i>ET</i> + <i>CW<sub>sec</sub></i> + <i>Q<sub>WWT</sub></i> + <i>Q<sub>natural</sub></i>) &nbsp;&nbsp;&nbsp;&nbsp;&nbsp; (4)
-            </p>
-        </div>
-
-        <p>Precipitation and evaporation data were extracted from various remote sensing datasets; data on inflows (water imports for municipal use) and outflows (streamflows from gauge stations used for runoff calibration) were acquired from provided national databases.</p>
-
-        <p>In the fourth step, the water balance results were validated and the model was calibrated by comparing the water balance parameters with in situ data.</p>
-
-        <p>Following this, estimated internal withdrawals, treated waste water and water imports the basin were incorporated into the WA+ toolbox. These were summarized and interpolated from national databases from the governorate level to the basin scale. A full description is provided in section 2.6.1. Basin wide water balance parameters/indicators were then presented for each major land use class (agriculture, urban and natural) through a series of water accounts. The customized WA+ toolbox is summarized in Figure 2 and definitions of the water accounting indicators and a full description of the computation of indicators are provided in Appendix A and B respectively. Briefly, on downloading and gathering remote sensing and tabular data, the observed discharge estimates are combined with the other remote sensing data (precipitation, evapotranspiration, leaf area index etc.) for the soil moisture balance modeling. The soil moisture balance model is a pixel based vertical water balance model for the unsaturated root zone of every pixel that describes the exchanges between land and atmosphere fluxes (i.e. rainfall and evapotranspiration) by partitioning flow into infiltration and surface runoff. The model calculates for each pixel, the ET that is due to rainfall ET (<i>ET<sub>green</sub></i>) and that due to additional supply termed incremental ET (<i>ET<sub>blue</sub></i>) by keeping track of the soil moisture balance (Figure 2). In the final step, non-irrigated water consumption data are combined with the outputs from the soil moisture balance model to generate water accounts at the basin scale.</p>
-        """
+    def _data_intro_html(self) -> str:
+        return self._content.get("data_intro")
 
     def _data_html(self) -> str:
-        return """
-        <h2 style="color:#2E86C1;">Data Sources Used in WA+</h2>
-        <p>WA+ relies on open, global datasets for transparency and repeatability. Key sources include:</p>
-
-        <table border="1" cellspacing="0" cellpadding="8" width="100%" style="border-collapse:collapse;">
-          <tr style="background:#EAF2F8;">
-            <th>Data</th>
-            <th>Scale</th>
-            <th>Source</th>
-            <th>Data Description</th>
-          </tr>
-          <tr>
-            <td>Elevation (DEM)</td>
-            <td>90 m</td>
-            <td>U.S Geological Survey- HydroSHEDS</td>
-            <td>Digital Elevation model</td>
-          </tr>
-          <tr>
-            <td>Landuse</td>
-            <td>250 m</td>
-            <td><a href="https://wapor.apps.fao.org/catalog/">FAO WaPOR database</a></td>
-            <td>Landuse for year 2018-2022</td>
-          </tr>
-          <tr>
-            <td>MSWEP Precipitation</td>
-            <td>0.1°</td>
-            <td><a href="https://www.gloh2o.org/mswep/">GloH2O MSWEP</a></td>
-            <td>MSWEP is a global precipitation product with a 3 hourly 0.1° resolution available from 1979 to ~3 hours from real-time</td>
-          </tr>
-          <tr>
-            <td>CHIRPS Precipitation</td>
-            <td>5 km resolution, Daily and monthly temporal resolution</td>
-            <td>The Climate Hazards Group, The University of California, Santa Barbara, <a href="https://www.chc.ucsb.edu/data/chirps">CHIRPS</a></td>
-            <td>Climate Hazards Group InfraRed Precipitation with Station data</td>
-          </tr>
-          <tr>
-            <td>Actual Evapotranspiration GLEAM</td>
-            <td>0.25 degrees</td>
-            <td><a href="https://www.gleam.eu/">GLEAM</a></td>
-            <td>The Global Land Evaporation Amsterdam Model (GLEAM) is a satellite remote sensing-based set of algorithms dedicated to the estimation of evaporation and soil moisture at global scales (Miralles et al. 2011)</td>
-          </tr>
-          <tr>
-            <td>Actual Evapotranspiration ETAV6</td>
-            <td>1-kilometer (km)</td>
-            <td></td>
-            <td>Actual ET (ETa) is produced using the operational Simplified Surface Energy Balance (SSEBop) model</td>
-          </tr>
-          <tr>
-            <td>Actual Evapotranspiration MOD16</td>
-            <td>500 meter (m)</td>
-            <td><a href="https://modis.gsfc.nasa.gov/data/">NASA MODIS</a></td>
-            <td>The algorithm used for the MOD16 data product collection is based on the logic of the Penman-Monteith equation</td>
-          </tr>
-          <tr>
-            <td>Actual Evapotranspiration WaPOR</td>
-            <td>250m (0.00223 degree), Monthly</td>
-            <td><a href="https://wapor.apps.fao.org/catalog/WAPOR_2">FAO WaPOR database</a></td>
-            <td>The calculation of the ETIa is based on the ETLook model described in Bastiaanssen et al. (2012). The monthy total is obtained by taking the ETIa in mm/day, multiplying by the number of days in a dekad, and summing the dekads of each month</td>
-          </tr>
-          <tr>
-            <td>Potential Evaporation GLEAM</td>
-            <td>0.25 degrees</td>
-            <td><a href="https://www.gleam.eu/">GLEAM</a></td>
-            <td></td>
-          </tr>
-          <tr>
-            <td>Reference ET Wapor</td>
-            <td>Approximately 20km (0.17 degree),Monthly</td>
-            <td><a href="https://wapor.apps.fao.org/catalog/WAPOR_2/">FAO WaPOR database</a></td>
-            <td>Data component developed through collaboration with the FRAME Consortium. <a href="http://www.fao.org/in-action/remote-sensing-for-water-productivity/en/">More info</a></td>
-          </tr>
-          <tr>
-            <td>Leaf Area Index (LAI) MOD15A2</td>
-            <td>500m monthly</td>
-            <td><a href="https://lpdaac.usgs.gov/">NASA LP DAAC</a></td>
-            <td>NASA Moderate Resolution Imaging Spectroradiometer  MODIS Product</td>
-          </tr>
-          <tr>
-            <td>Net Primary Productivity (NPP) MOD17A3</td>
-            <td>500m Yearly</td>
-            <td><a href="https://lpdaac.usgs.gov/">NASA LP DAAC</a></td>
-            <td>NASA Moderate Resolution Imaging Spectroradiometer  MODIS Product</td>
-          </tr>
-          <tr>
-            <td>Gross Primary Productivity (GPP) MOD17A2</td>
-            <td>500m monthly</td>
-            <td></td>
-            <td></td>
-          </tr>
-          <tr>
-            <td>Normalized Dry Matter NDM</td>
-            <td>500m monthly</td>
-            <td></td>
-            <td>Created using NPP and GPP data</td>
-          </tr>
-          <tr>
-            <td>Global Map of Irrigation Areas (GMIA)</td>
-            <td>5 arc minutes</td>
-            <td><a href="https://data.apps.fao.org/map/catalog/srv/eng/catalog.search?uuid=f79213a0-88fd-11da-a88f-000d939bc5d8#/metadata/f79213a0-88fd-11da-a88f-000d939bc5d8">FAO GMIA</a></td>
-            <td>The map shows the amount of area equipped for irrigation around the turn of the 20th century as a percentage of the total area on a Raster with a resolution of 5 arc minutes</td>
-          </tr>
-          <tr>
-            <td>Population Data</td>
-            <td>100m</td>
-            <td><a href="https://hub.worldpop.org/">WorldPop</a></td>
-            <td></td>
-          </tr>
-          <tr>
-            <td>Environmental Water Requirements</td>
-            <td>10 km resolution</td>
-            <td><a href="https://waterdata.iwmi.org/">IWMI Water Data</a></td>
-            <td>Environmental water requirements for sustaining ecological processes and biodiversity</td>
-          </tr>
-          <tr>
-            <td>saturated soil moisture content (theta(sat)</td>
-            <td>~1km</td>
-            <td></td>
-            <td></td>
-          </tr>
-          <tr>
-            <td>Protected Areas (WDPA)</td>
-            <td>Shapefile</td>
-            <td><a href="https://www.protectedplanet.net/en/thematic-areas/wdpa?tab=WDPA">Protected Planet (WDPA)</a></td>
-            <td>Joint project between UN Environment Programme and the International Union for Conservation of Nature (IUCN)</td>
-          </tr>
-          <tr>
-            <td>Basin Imports</td>
-            <td>Monthly time series(2018-2022)</td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Water imports for domestic use to various Governorates in Jordan</td>
-          </tr>
-          <tr>
-            <td>Consumptions</td>
-            <td>Monthly time series(2018-2022)</td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Water Consumption for Domestic, Industrial, Tourism and Livestock</td>
-          </tr>
-          <tr>
-            <td>Treated wastewater</td>
-            <td>Monthly time series(2018-2022)</td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Wastewater influent and effluent discharged to streams as return flow</td>
-          </tr>
-          <tr>
-            <td>Outflow data</td>
-            <td>Monthly time series(2018-2022)</td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Streamflow discharge from spring and rivers</td>
-          </tr>
-          <tr>
-            <td>Shapefiles( Surface basins, Governorates and Country )</td>
-            <td></td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Surface basins, Governorates and Country</td>
-          </tr>
-          <tr>
-            <td>Pan and Piche- difference Evaporation data</td>
-            <td>stations, Daily time Series (2010-2022)</td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Measured ET data for various gauge stations within the Jordan</td>
-          </tr>
-          <tr>
-            <td>Rainfall data</td>
-            <td>stations, Daily time Series (2010-2022)</td>
-            <td>Assembled by MWI Jordan</td>
-            <td>Measured rainfall data for various gauge stations within the Jordan</td>
-          </tr>
-        </table>
-        """
+        # Static rendering of the catalog (export, search); the tab itself uses CatalogModel
+        return self._data_intro_html() + catalog_html(default_index().rows)
 
     def _references_html(self) -> str:
-        return """
-        <h2 style="color:#2E86C1;">References & Credits</h2>
-        <p><b>Developed by:</b> Water Accounting Team, International Water Management Institute (IWMI), with partners MWI- Jordan, and WEC Team _ Jordan.</p>
-
-        <h3 style="color:#2874A6;">Key References (selected)</h3>
-        <ul>
-          <li>Karimi, P., Bastiaanssen, W.G.M., et al. (2013). <i>Water Accounting Plus (WA+) - a water accounting procedure for complex river basins.</i></li>
-          <li>IWMI / IHE Delft - WA+ manuals, case studies, and methodological notes.</li>
-          <li>ET products documentation (SSEBop, MOD16, GLEAM) and CHIRPS precipitation product notes.</li>
-        </ul>
-
-        <h3 style="color:#2874A6;">Official Resources</h3>
-        <ul>
-          <li><a href="https://www.iwmi.org">International Water Management Institute (IWMI)</a></li>
-          <li><a href="https://www.ihe-delft.nl">IHE Delft Institute for Water Education</a></li>
-        </ul>
-
-        <h3 style="color:#2874A6;">Data Portals (again)</h3>
-        <ul>
-          <li><a href="https://wapor.apps.fao.org/catalog/">FAO WaPOR</a></li>
-          <li><a href="https://www.gloh2o.org/mswep/">GloH2O MSWEP</a></li>
-          <li><a href="https://www.chc.ucsb.edu/data/chirps">CHIRPS</a></li>
-          <li><a href="https://www.gleam.eu/">GLEAM</a></li>
-          <li><a href="https://modis.gsfc.nasa.gov/data/">NASA MODIS</a></li>
-          <li><a href="https://lpdaac.usgs.gov/">NASA LP DAAC</a></li>
-          <li><a href="https://data.apps.fao.org/map/catalog/srv/eng/catalog.search?uuid=f79213a0-88fd-11da-a88f-000d939bc5d8#/metadata/f79213a0-88fd-11da-a88f-000d939bc5d8">FAO GMIA</a></li>
-          <li><a href="https://hub.worldpop.org/">WorldPop</a></li>
-          <li><a href="https://waterdata.iwmi.org/">IWMI Water Data</a></li>
-          <li><a href="https://www.protectedplanet.net/en/thematic-areas/wdpa?tab=WDPA">Protected Planet (WDPA)</a></li>
-        </ul>
-
-        <h3 style="color:#2874A6;">Credits & License</h3>
-        <p>Water Accounting Plus (WA+) Tool - &copy; 2025 IWMI, Water Accounting Team. Licensed under CC BY 4.0.
-        For formal publications using WA+ outputs, obtain prior written permission from IWMI as per the included license.</p>
-        """
+        return self._content.get("references")
+
+
+# ---------- Embedding API ----------
+# Host applications (the WA+ toolbox Help menu) keep one window per locale alive
+# between openings; they own the QApplication, this module never creates one here
+_windows = {}
+
+
+def intro_window(locale: str = None, parent: QWidget = None) -> IntroWindow:
+    # Cached IntroWindow for this locale; Close hides it instead of destroying it
+    if QApplication.instance() is None:
+        raise RuntimeError("intro_window() needs the host's QApplication to exist")
+    key = locale or os.environ.get("WA_INTRO_LOCALE") or DEFAULT_LOCALE
+    win = _windows.get(key)
+    if win is None:
+        with tracer.span("IntroWindow() embedded", locale=key):
+            win = IntroWindow(locale=key, parent=parent)
+        win.hide_on_close = True
+        win.destroyed.connect(lambda *_: _windows.pop(key, None))
+        _windows[key] = win
+    return win
+
+
+def open_intro(tab=None, locale: str = None, parent: QWidget = None) -> IntroWindow:
+    win = intro_window(locale, parent)
+    win.open(tab)
+    return win
+
+
+def prewarm_intro(locale: str = None, parent: QWidget = None, delay_ms: int = 2000):
+    # Call once after the host has started: builds the window hidden, one tab per
+    # event-loop turn, once the host has had delay_ms to settle
+    QTimer.singleShot(delay_ms, lambda: intro_window(locale, parent).warm_up())
+
+
+class IntroServer(QObject):
+    # Serves intro_client requests (one JSON object per line) on a QLocalServer;
+    # QtNetwork is only imported in server mode
+    def __init__(self, name: str, locale: str = None, parent=None):
+        super().__init__(parent)
+        from PyQt5.QtNetwork import QLocalServer
+        self.name, self.locale = name, locale
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)  # only this user may connect
+        self._server.newConnection.connect(self._accept)
+
+    @staticmethod
+    def already_running(name: str) -> bool:
+        from PyQt5.QtNetwork import QLocalSocket
+        socket = QLocalSocket()
+        socket.connectToServer(name)
+        alive = socket.waitForConnected(500)
+        socket.abort()
+        return alive
+
+    def listen(self) -> bool:
+        # False when another server already owns this session's name
+        from PyQt5.QtNetwork import QLocalServer
+        if self.already_running(self.name):
+            return False
+        if not self._server.listen(self.name):
+            QLocalServer.removeServer(self.name)  # stale socket left by a crashed server
+            return self._server.listen(self.name)
+        return True
+
+    def _accept(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self._read(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _read(self, socket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode("utf-8", "replace")
+            try:
+                reply = self.handle(json.loads(line))
+            except (ValueError, IndexError, KeyError, TypeError) as exc:
+                reply = {"ok": False, "error": str(exc)}
+            socket.write(json.dumps(reply).encode("utf-8") + b"\n")
+            socket.flush()
+
+    def handle(self, message: dict) -> dict:
+        cmd = message.get("cmd")
+        locale = message.get("locale") or self.locale
+        with tracer.span(f"serve {cmd}"):
+            if cmd == "ping":
+                return {"ok": True, "pid": os.getpid()}
+            if cmd == "show":
+                open_intro(message.get("tab"), locale)
+                return {"ok": True}
+            if cmd == "hide":
+                for win in _windows.values():
+                    win.hide()
+                return {"ok": True}
+            if cmd == "memory":
+                return {"ok": True, "tabs": intro_window(locale).memory_report()}
+            if cmd == "quit":
+                QTimer.singleShot(0, QApplication.instance().quit)
+                return {"ok": True}
+        return {"ok": False, "error": f"unknown command {cmd!r}"}
+
+
+def serve(app: QApplication, locale: str = None) -> int:
+    # Background intro process: window built hidden up front, shown on request
+    from intro_client import server_name
+    server = IntroServer(server_name(), locale)
+    if not server.listen():
+        print(f"intro server already running for this session ({server.name})", file=sys.stderr)
+        return 0
+    app.setQuitOnLastWindowClosed(False)
+    intro_window(locale).warm_up()
+    code = app.exec_()
+    tracer.finish()
+    return code
+
+
+def main(argv=None) -> int:
+    argv = sys.argv if argv is None else argv
+    parser = argparse.ArgumentParser(description="WA+ intro / welcome window")
+    parser.add_argument("--trace", nargs="?", const=DEFAULT_TRACE, metavar="PATH",
+                        help=f"record startup spans as Chrome trace JSON (default {DEFAULT_TRACE})")
+    parser.add_argument("--no-splash", action="store_true",
+                        help="do not show the cached Overview snapshot while starting")
+    parser.add_argument("--locale", help=f"content locale (default $WA_INTRO_LOCALE or {DEFAULT_LOCALE})")
+    parser.add_argument("--check-links", action="store_true",
+                        help="check every external link in the content and exit (see intro_links.py --help)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run as the background intro server for this session (see intro_client.py)")
+    parser.add_argument("--export", choices=("html", "pdf"),
+                        help="write all tabs to one document without a window and exit (see intro_export.py --help)")
+    parser.add_argument("--soil-moisture", action="store_true",
+                        help="run the reference soil moisture balance and exit (see intro_soil_moisture.py --help)")
+    parser.add_argument("--harmonize", action="store_true",
+                        help="regrid inputs onto one basin grid and exit (see intro_harmonize.py --help)")
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if args.export:
+        import intro_export
+        return intro_export.main([args.export] + qt_args + (["--locales", args.locale] if args.locale else []))
+    if args.soil_moisture:
+        import intro_soil_moisture
+        return intro_soil_moisture.main(qt_args)
+    if args.harmonize:
+        import intro_harmonize
+        return intro_harmonize.main(qt_args)
+    if args.check_links:
+        import intro_links
+        return intro_links.main(qt_args + (["--locale", args.locale] if args.locale else []))
+    if args.trace:
+        tracer.enable(args.trace)
+
+    with tracer.span("QApplication"):
+        app = QApplication.instance() or QApplication(argv[:1] + qt_args)
+    if args.serve:
+        return serve(app, args.locale)
+    splash = None
+    if not args.no_splash:
+        with tracer.span("splash snapshot"):
+            splash = show_splash_snapshot(app, ContentStore(args.locale))
+    with tracer.span("IntroWindow()"):
+        win = IntroWindow(locale=args.locale)
+    win.show()
+    if splash is not None:
+        splash.finish(win)
+    code = app.exec_()
+    tracer.finish()
+    return code
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    win = IntroWindow()
-    win.show()
-    sys.exit(app.exec_())
+    sys.exit(main())
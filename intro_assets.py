@@ -0,0 +1,208 @@
+# intro_assets.py
+# Build-time asset packing + runtime bundle reader for the intro window
+# - SVGs that only wrap an embedded base64 raster are unwrapped to the raster
+#   itself (no base64 bloat, no XML parse at runtime) and the PNG is recompressed
+# - Vector SVGs are stored minified
+# - Everything goes into one indexed file read through mmap, so the window
+#   resolves assets by name with a single open() on slow network shares
+#
+# Bundle layout:
+#   b"WAPK" | u16 version | u32 index length | JSON index | padding | blobs
+#   index = {"meta": {...}, "entries": {name: {"offset", "size", "type", "sha1", ...metadata}}}
+#   (v1 bundles hold the entries dict alone and are still read, with empty meta)
+#
+# Usage: python intro_assets.py [--out intro_assets.pak] [file.svg ...]
+
+import argparse
+import base64
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUNDLE = os.path.join(BASE_DIR, "intro_assets.pak")
+DEFAULT_SOURCES = ("workflow.svg", "flowchart.svg")
+
+MAGIC = b"WAPK"
+VERSION = 2
+_HEADER = struct.Struct("<4sHI")
+_ALIGN = 16
+
+_EMBEDDED_RASTER = re.compile(
+    r'^\s*(?:<\?xml[^>]*\?>\s*)?<svg\b[^>]*>\s*'
+    r'<image\b[^>]*href="data:image/(png|jpeg);base64,([A-Za-z0-9+/=\s]+)"[^>]*/>\s*</svg>\s*$',
+    re.S,
+)
+_SVG_SIZE = re.compile(r'<svg\b[^>]*?\bwidth="(\d+(?:\.\d+)?)"[^>]*?\bheight="(\d+(?:\.\d+)?)"', re.S)
+
+# PNG chunks that affect how pixels are displayed; everything else is dropped
+_PNG_KEEP = {b"IHDR", b"PLTE", b"tRNS", b"sRGB", b"gAMA", b"cHRM", b"iCCP"}
+
+
+# ---------- Packing ----------
+def recompress_png(data: bytes) -> bytes:
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        return data
+    chunks, idat = [], []
+    pos = 8
+    while pos < len(data):
+        length, ctype = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if ctype == b"IDAT":
+            idat.append(body)
+        elif ctype in _PNG_KEEP:
+            chunks.append((ctype, body))
+        elif ctype == b"IEND":
+            break
+    raw = zlib.decompress(b"".join(idat))
+    chunks.append((b"IDAT", zlib.compress(raw, 9)))
+    chunks.append((b"IEND", b""))
+
+    out = [data[:8]]
+    for ctype, body in chunks:
+        out.append(struct.pack(">I", len(body)) + ctype + body
+                   + struct.pack(">I", zlib.crc32(ctype + body) & 0xFFFFFFFF))
+    packed = b"".join(out)
+    return packed if len(packed) < len(data) else data
+
+
+def minify_svg(text: str) -> str:
+    text = re.sub(r"<!--.*?-->", "", text, flags=re.S)
+    text = re.sub(r">\s+<", "><", text)
+    return text.strip()
+
+
+def svg_size(text: str):
+    # Intrinsic (width, height) from the root <svg> element, or None
+    size = _SVG_SIZE.search(text)
+    return (float(size.group(1)), float(size.group(2))) if size else None
+
+
+def pack_source(path: str, recompress: bool = True):
+    # Returns (bundle name, payload, metadata) for one source file
+    name = os.path.basename(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if not name.lower().endswith(".svg"):
+        return name, data, {"type": "raw"}
+
+    text = data.decode("utf-8")
+    meta = {}
+    size = svg_size(text)
+    if size:
+        meta["width"], meta["height"] = size
+    embedded = _EMBEDDED_RASTER.match(text)
+    if embedded:
+        raster = base64.b64decode(re.sub(r"\s+", "", embedded.group(2)))
+        if recompress and embedded.group(1) == "png":
+            raster = recompress_png(raster)
+        meta["type"] = embedded.group(1)
+        return name, raster, meta
+    meta["type"] = "svg"
+    return name, minify_svg(text).encode("utf-8"), meta
+
+
+def write_bundle(entries, out_path: str, meta: dict = None):
+    # entries: iterable of (name, payload bytes, metadata dict); meta describes
+    # the bundle as a whole and comes back as AssetBundle.meta
+    entries = list(entries)
+    index, offset = {}, 0
+    for name, payload, entry_meta in entries:
+        index[name] = dict(entry_meta, offset=offset, size=len(payload),
+                           sha1=hashlib.sha1(payload).hexdigest())
+        offset += len(payload) + (-len(payload) % _ALIGN)
+
+    index_bytes = json.dumps({"meta": meta or {}, "entries": index},
+                             separators=(",", ":"), sort_keys=True).encode("utf-8")
+    header_len = _HEADER.size + len(index_bytes)
+    data_start = header_len + (-header_len % _ALIGN)
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        f.write(b"\0" * (data_start - header_len))
+        for _, payload, _ in entries:
+            f.write(payload)
+            f.write(b"\0" * (-len(payload) % _ALIGN))
+    os.replace(tmp, out_path)
+    return index
+
+
+# ---------- Reading ----------
+class AssetBundle:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise
+        magic, version, index_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            self.close()
+            raise ValueError(f"{path}: not a WA+ asset bundle (v1-v{VERSION})")
+        start = _HEADER.size
+        index = json.loads(bytes(self._map[start:start + index_len]).decode("utf-8"))
+        if version == 1:
+            self.meta, self._index = {}, index
+        else:
+            self.meta, self._index = index["meta"], index["entries"]
+        header_len = start + index_len
+        self._data_start = header_len + (-header_len % _ALIGN)
+
+    @classmethod
+    def open_default(cls, path: str = DEFAULT_BUNDLE):
+        # The bundle is optional: development checkouts run from loose files
+        try:
+            return cls(path)
+        except (OSError, ValueError):
+            return None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def names(self):
+        return list(self._index)
+
+    def info(self, name: str) -> dict:
+        return self._index[name]
+
+    def get(self, name: str) -> memoryview:
+        # Zero-copy view into the mapped file; valid until close()
+        entry = self._index[name]
+        start = self._data_start + entry["offset"]
+        return memoryview(self._map)[start:start + entry["size"]]
+
+    def close(self):
+        try:
+            self._map.close()
+        except (AttributeError, BufferError):
+            pass
+        self._file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack intro assets into one indexed bundle")
+    parser.add_argument("sources", nargs="*", help="asset files (default: bundled diagrams)")
+    parser.add_argument("--out", default=DEFAULT_BUNDLE, help="bundle path")
+    args = parser.parse_args(argv)
+
+    sources = args.sources or [os.path.join(BASE_DIR, s) for s in DEFAULT_SOURCES]
+    before = sum(os.path.getsize(s) for s in sources)
+    index = write_bundle((pack_source(s) for s in sources), args.out)
+    for name, entry in sorted(index.items()):
+        print(f"{name:<20} {entry['type']:<5} {entry['size']:>9,d} bytes")
+    print(f"{len(index)} assets: {before:,d} -> {os.path.getsize(args.out):,d} bytes ({args.out})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
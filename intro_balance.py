@@ -0,0 +1,205 @@
+# intro_balance.py
+# Water-balance engine behind the Methodology tab calculator
+# - Equation (1): dS/dt = P - ET - Q_out
+# - Equation (2): dS/dt = (P + Q_in) - (ET + CW_sec + Q_WWT + Q_re + Q_natural),
+#   with CW_sec = Supply_domestic + Supply_industrial + Supply_livestock + Supply_tourism (3)
+# - Gridded terms (mm/year per cell) are reduced once, in row chunks, to per-class
+#   sums with np.bincount over the land-use labels; both equations are linear, so
+#   any later change of inputs only touches n_classes numbers and basin totals
+#   update in microseconds whatever the grid size
+# - balance_map() evaluates the per-cell map chunk by chunk into any output
+#   array, so grids larger than memory can stream through np.memmap
+# - numpy is optional: the intro itself works without it
+#
+# Usage: python intro_balance.py [--shape ROWS COLS] [--cell 250]   # timings on sample grids
+
+import argparse
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # the calculator panel explains what is missing
+    np = None
+
+# WA+ land-use categories
+CLASSES = ("Protected", "Utilized", "Modified", "Managed")
+# Terms that may be gridded (mm/year per cell)
+GRID_TERMS = ("P", "ET", "Q_out", "Q_in", "Q_wwt", "Q_re", "Q_natural")
+SECTORS = ("domestic", "industrial", "livestock", "tourism")
+# Sign of each term in equations (1) and (2); CW_sec is handled separately
+EQ1 = {"P": 1.0, "ET": -1.0, "Q_out": -1.0}
+EQ2 = {"P": 1.0, "Q_in": 1.0, "ET": -1.0, "Q_wwt": -1.0, "Q_re": -1.0, "Q_natural": -1.0}
+
+MM_M2_TO_MM3 = 1e-9  # 1 mm of water over 1 m2 = 1e-3 m3 = 1e-9 Mm3
+DEFAULT_CHUNK_CELLS = 4 * 1024 * 1024
+DEFAULT_SAMPLE_SHAPE = (320, 256)  # ~5,100 km2 at 250 m, the size of the Amman-Zarqa basin
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("the water-balance calculator needs numpy (pip install numpy)")
+
+
+def row_chunks(shape, chunk_cells: int = DEFAULT_CHUNK_CELLS):
+    # Row slices of at most ~chunk_cells cells
+    rows, cols = shape
+    step = max(1, chunk_cells // max(1, cols))
+    for start in range(0, rows, step):
+        yield slice(start, min(rows, start + step))
+
+
+class BalanceGrid:
+    # Per-class sums of every gridded term over one label raster. Grids and
+    # labels may be np.memmap; they are read once, chunk by chunk, and not kept.
+    def __init__(self, grids: dict, labels, cell_area_m2: float, n_classes: int = len(CLASSES),
+                 chunk_cells: int = DEFAULT_CHUNK_CELLS):
+        require_numpy()
+        unknown = set(grids) - set(GRID_TERMS)
+        if unknown:
+            raise ValueError(f"unknown gridded terms: {sorted(unknown)}")
+        self.terms = tuple(t for t in GRID_TERMS if t in grids)
+        self.n_classes = n_classes
+        self.cell_area_m2 = float(cell_area_m2)
+        self.shape = labels.shape
+        sums = np.zeros((len(self.terms), n_classes))
+        cells = np.zeros(n_classes, dtype=np.int64)
+        for rows in row_chunks(labels.shape, chunk_cells):
+            # Label indices are computed once per chunk and shared by every term;
+            # cells outside the basin (label < 0 or >= n_classes) are skipped
+            lab = np.asarray(labels[rows]).ravel()
+            inside = (lab >= 0) & (lab < n_classes)
+            lab = lab[inside].astype(np.intp, copy=False)
+            cells += np.bincount(lab, minlength=n_classes)
+            for i, term in enumerate(self.terms):
+                values = np.asarray(grids[term][rows], dtype=np.float64).ravel()[inside]
+                sums[i] += np.bincount(lab, weights=np.nan_to_num(values), minlength=n_classes)
+        self.sums = sums      # (terms, classes) in mm * cells
+        self.cells = cells
+
+    @property
+    def class_area_km2(self):
+        return self.cells * self.cell_area_m2 / 1e6
+
+    def class_volumes(self, scale: dict = None):
+        # {term: per-class volume in Mm3/year}, each gridded term optionally scaled
+        scale = scale or {}
+        factor = self.cell_area_m2 * MM_M2_TO_MM3
+        return {t: self.sums[i] * (scale.get(t, 1.0) * factor) for i, t in enumerate(self.terms)}
+
+    def evaluate(self, scale: dict = None, cw_class_mm=None, sectors: dict = None, flows: dict = None) -> dict:
+        # scale: {term: factor} on gridded terms (e.g. {"P": 0.9} for a 10% drier year)
+        # cw_class_mm: non-irrigated consumption per class (mm/year), adds to CW_sec
+        # sectors: {sector: Mm3/year} basin supplies for equation (3)
+        # flows: {term: Mm3/year} basin-wide flows added to any gridded term
+        # Returns {"classes": [...], "basin": {...}} with volumes in Mm3/year
+        volumes = self.class_volumes(scale)
+        zero = np.zeros(self.n_classes)
+        cw_class = zero if cw_class_mm is None else \
+            np.asarray(cw_class_mm, dtype=np.float64) * self.cells * self.cell_area_m2 * MM_M2_TO_MM3
+        eq1 = sum((sign * volumes.get(t, zero) for t, sign in EQ1.items()), zero)
+        eq2 = sum((sign * volumes.get(t, zero) for t, sign in EQ2.items()), zero) - cw_class
+
+        flows, sectors = flows or {}, sectors or {}
+        basin = {t: float(volumes[t].sum()) + flows.get(t, 0.0) for t in self.terms}
+        for t, value in flows.items():
+            basin.setdefault(t, value)
+        basin["CW_sec"] = float(cw_class.sum()) + sum(sectors.get(s, 0.0) for s in SECTORS)
+        basin["eq1"] = float(eq1.sum()) + sum(sign * flows.get(t, 0.0) for t, sign in EQ1.items())
+        basin["eq2"] = float(eq2.sum()) + sum(sign * flows.get(t, 0.0) for t, sign in EQ2.items()) \
+            - sum(sectors.get(s, 0.0) for s in SECTORS)
+        basin["area_km2"] = float(self.class_area_km2.sum())
+
+        classes = []
+        for c in range(self.n_classes):
+            row = {"class": CLASSES[c] if c < len(CLASSES) else str(c),
+                   "area_km2": float(self.class_area_km2[c]), "CW": float(cw_class[c]),
+                   "eq1": float(eq1[c]), "eq2": float(eq2[c])}
+            row.update((t, float(volumes[t][c])) for t in self.terms)
+            classes.append(row)
+        return {"classes": classes, "basin": basin}
+
+
+def balance_map(grids: dict, labels, equation: int = 2, scale: dict = None, cw_class_mm=None,
+                out=None, chunk_cells: int = DEFAULT_CHUNK_CELLS):
+    # Per-cell dS/dt in mm/year (NaN outside the basin); out may be an np.memmap
+    require_numpy()
+    signs = EQ1 if equation == 1 else EQ2
+    scale = scale or {}
+    if out is None:
+        out = np.empty(labels.shape, dtype=np.float32)
+    lookup = None if cw_class_mm is None or equation == 1 else np.asarray(cw_class_mm, dtype=np.float32)
+    for rows in row_chunks(labels.shape, chunk_cells):
+        lab = np.asarray(labels[rows])
+        acc = np.zeros(lab.shape, dtype=np.float32)
+        for term, sign in signs.items():
+            if term in grids:
+                acc += np.float32(sign * scale.get(term, 1.0)) * np.asarray(grids[term][rows], dtype=np.float32)
+        inside = lab >= 0
+        if lookup is not None:
+            inside &= lab < len(lookup)
+            acc[inside] -= lookup[lab[inside]]
+        acc[~inside] = np.nan
+        out[rows] = acc
+    return out
+
+
+def sample_inputs(shape=DEFAULT_SAMPLE_SHAPE, seed: int = 0):
+    # Synthetic but plausible basin for the calculator: wetter in the west,
+    # desert rangeland in the east, irrigated valley floor, urban centre.
+    # Returns (grids {term: float32 mm/year}, labels int8 with -1 outside the basin)
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    rows, cols = shape
+    y, x = np.mgrid[0:1:rows * 1j, 0:1:cols * 1j].astype(np.float32)
+    inside = ((x - 0.5) / 0.5) ** 2 + ((y - 0.5) / 0.5) ** 2 <= 1.0
+
+    labels = np.full(shape, 1, dtype=np.int8)                           # utilized rangeland
+    labels[(x < 0.35) & (rng.random(shape) < 0.6)] = 2                  # rainfed, west
+    labels[np.abs(y - 0.55 - 0.1 * np.sin(6 * x)) < 0.04] = 3           # irrigated valley
+    labels[((x - 0.3) ** 2 + (y - 0.4) ** 2) < 0.01] = 3                # urban centre
+    labels[((x - 0.15) ** 2 + (y - 0.8) ** 2) < 0.006] = 0              # reserve
+    labels[~inside] = -1
+
+    noise = rng.normal(1.0, 0.08, shape).astype(np.float32)
+    p = (480.0 - 400.0 * x) * noise                                      # ~80-480 mm/year
+    et_ratio = np.choose(np.clip(labels, 0, 3), [0.85, 0.92, 0.88, 1.0]).astype(np.float32)
+    et = p * et_ratio + np.where(labels == 3, 450.0, 0.0).astype(np.float32)  # irrigation ET
+    q_out = p * 0.04
+    grids = {"P": p.astype(np.float32), "ET": et.astype(np.float32), "Q_out": q_out.astype(np.float32)}
+    return grids, labels
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time the water-balance engine on sample grids")
+    parser.add_argument("--shape", nargs=2, type=int, default=DEFAULT_SAMPLE_SHAPE, metavar=("ROWS", "COLS"))
+    parser.add_argument("--cell", type=float, default=250.0, help="cell size in metres")
+    args = parser.parse_args(argv)
+    require_numpy()
+
+    start = time.perf_counter()
+    grids, labels = sample_inputs(tuple(args.shape))
+    made = time.perf_counter()
+    grid = BalanceGrid(grids, labels, args.cell ** 2)
+    reduced = time.perf_counter()
+    repeats = 1000
+    for i in range(repeats):
+        result = grid.evaluate(scale={"P": 1.0 + i * 1e-4}, cw_class_mm=[0, 0, 5, 60],
+                               sectors={"domestic": 150.0}, flows={"Q_in": 100.0})
+    evaluated = time.perf_counter()
+    balance_map(grids, labels)
+    mapped = time.perf_counter()
+
+    cells = labels.size
+    print(f"grid {args.shape[0]}x{args.shape[1]} ({cells:,d} cells, {grid.class_area_km2.sum():,.0f} km2)")
+    print(f"sample inputs    {1000 * (made - start):9.2f} ms")
+    print(f"class reduction  {1000 * (reduced - made):9.2f} ms  ({cells / (reduced - made) / 1e6:,.0f} Mcells/s)")
+    print(f"evaluate         {1e6 * (evaluated - reduced) / repeats:9.2f} us")
+    print(f"balance map      {1000 * (mapped - evaluated):9.2f} ms")
+    basin = result["basin"]
+    print(f"basin dS/dt: eq (1) {basin['eq1']:,.1f} Mm3/yr, eq (2) {basin['eq2']:,.1f} Mm3/yr")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# intro_cache.py
+# Small on-disk cache shared by the intro window
+# - Files are addressed by a string key (callers encode hash/size/DPR into it)
+# - Least-recently-used entries are evicted once the directory exceeds max_bytes
+# - Content hashes of source files are memoised by (path, mtime, size) so a warm
+#   start does not have to re-read large assets just to compute their key
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+def default_cache_dir() -> str:
+    override = os.environ.get("WA_INTRO_CACHE")
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "wa_intro")
+
+
+class DiskCache:
+    def __init__(self, directory: str = None, max_bytes: int = 32 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._hashes = None
+        self._lock = threading.Lock()  # entries may be written from worker threads
+
+    # ---------- Entries ----------
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str):
+        # Returns the entry path (touched for LRU) or None on a miss
+        path = self.path(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self.evict(keep=key)
+        return path
+
+    def evict(self, keep: str = None):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        entries = []
+        total = 0
+        for name in names:
+            if name.startswith(".") or name == keep:
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+            total += st.st_size
+        if keep is not None:
+            try:
+                total += os.path.getsize(self.path(keep))
+            except OSError:
+                pass
+        entries.sort()
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                total -= size
+            except OSError:
+                pass
+
+    # ---------- Content hashes ----------
+    def content_hash(self, path: str) -> str:
+        st = os.stat(path)
+        stamp = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+        with self._lock:
+            return self._content_hash(path, stamp)
+
+    def _content_hash(self, path: str, stamp: str) -> str:
+        hashes = self._load_hashes()
+        digest = hashes.get(stamp)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            # Drop stamps of older versions of the same file
+            prefix = stamp.split("|", 1)[0] + "|"
+            for old in [s for s in hashes if s.startswith(prefix)]:
+                del hashes[old]
+            hashes[stamp] = digest
+            self._save_hashes(hashes)
+        return digest
+
+    def _hash_index_path(self) -> str:
+        return os.path.join(self.directory, ".hashes.json")
+
+    def _load_hashes(self) -> dict:
+        if self._hashes is None:
+            try:
+                with open(self._hash_index_path(), "r", encoding="utf-8") as f:
+                    self._hashes = json.load(f)
+            except (OSError, ValueError):
+                self._hashes = {}
+        return self._hashes
+
+    def _save_hashes(self, hashes: dict):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._hash_index_path(), "w", encoding="utf-8") as f:
+                json.dump(hashes, f)
+        except OSError:
+            pass
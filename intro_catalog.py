@@ -0,0 +1,165 @@
+# intro_catalog.py
+# Data Sources catalog for the intro window
+# - Datasets live in data_catalog.json (one object per dataset) instead of HTML
+# - CatalogIndex precomputes a prefix-searchable inverted index per field and a
+#   sort rank per column, so filtering and sorting stay instant with thousands
+#   of rows; a query that extends the previous one only narrows its result
+# - catalog_html() renders the same rows as the legacy HTML table (export/search)
+
+import bisect
+import html
+import json
+import os
+import re
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(BASE_DIR, "data_catalog.json")
+
+# (field, header) in display order
+COLUMNS = (
+    ("name", "Data"),
+    ("variable", "Variable"),
+    ("resolution", "Scale"),
+    ("source", "Source"),
+    ("description", "Data Description"),
+)
+ALL_FIELDS = "*"
+FILTER_FIELDS = (("Variable", "variable"), ("Resolution", "resolution"), ("Source", "source"))
+
+_TOKEN = re.compile(r"[\w.°~-]+")
+_NARROW_SCAN_LIMIT = 256  # below this many candidates, scanning beats index lookups
+
+# Ground resolution parsing: "250m (0.00223 degree)", "0.1°", "5 arc minutes", "1-kilometer (km)"
+_RES_PATTERNS = (
+    (re.compile(r"(\d+(?:\.\d+)?)\s*arc\s*min", re.I), 1852.0),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*arc\s*sec", re.I), 30.87),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*(?:°|deg)", re.I), 111320.0),
+    (re.compile(r"(\d+(?:\.\d+)?)[\s-]*(?:km|kilomet)", re.I), 1000.0),
+    (re.compile(r"(\d+(?:\.\d+)?)\s*(?:m\b|met)", re.I), 1.0),
+)
+
+
+def tokenize(text: str):
+    return _TOKEN.findall(text.lower())
+
+
+def resolution_m(text: str):
+    # Approximate ground resolution in metres (degrees at the equator), or None;
+    # the first quantity mentioned wins ("250m (0.00223 degree)" -> 250)
+    best = None
+    for pattern, factor in _RES_PATTERNS:
+        match = pattern.search(text or "")
+        if match and (best is None or match.start() < best[0]):
+            best = (match.start(), float(match.group(1)) * factor)
+    return best[1] if best else None
+
+
+def load_catalog(path: str = CATALOG_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["datasets"]
+
+
+class CatalogIndex:
+    def __init__(self, rows):
+        self.rows = rows
+        fields = [f for f, _ in COLUMNS]
+        self._row_tokens = {}   # field -> [set(tokens) per row]
+        self._vocab = {}        # field -> sorted token list
+        self._postings = {}     # field -> {token: set(row ids)}
+        for field in fields + [ALL_FIELDS]:
+            per_row, postings = [], {}
+            for i, row in enumerate(rows):
+                text = " ".join(row.get(f, "") for f in fields) if field == ALL_FIELDS else row.get(field, "")
+                tokens = set(tokenize(text))
+                per_row.append(tokens)
+                for token in tokens:
+                    postings.setdefault(token, set()).add(i)
+            self._row_tokens[field] = per_row
+            self._postings[field] = postings
+            self._vocab[field] = sorted(postings)
+
+        # rank[field][row] = position of row when sorted ascending by that column
+        self._rank = {}
+        for field in fields:
+            if field == "resolution":
+                def key(i):
+                    metres = resolution_m(rows[i].get("resolution", ""))
+                    return (metres is None, metres or 0.0, rows[i].get("resolution", "").lower())
+            else:
+                def key(i, field=field):
+                    return rows[i].get(field, "").lower()
+            order = sorted(range(len(rows)), key=key)
+            rank = [0] * len(rows)
+            for position, i in enumerate(order):
+                rank[i] = position
+            self._rank[field] = rank
+
+        self._last = (None, "", list(range(len(rows))))
+
+    def _prefix_rows(self, field: str, token: str) -> set:
+        vocab, postings = self._vocab[field], self._postings[field]
+        hits = set()
+        i = bisect.bisect_left(vocab, token)
+        while i < len(vocab) and vocab[i].startswith(token):
+            hits |= postings[vocab[i]]
+            i += 1
+        return hits
+
+    def filter(self, query: str, field: str = ALL_FIELDS):
+        # Row ids (ascending) whose field has a token starting with every query token
+        tokens = tokenize(query)
+        if not tokens:
+            result = list(range(len(self.rows)))
+        else:
+            last_field, last_query, last_result = self._last
+            narrowing = field == last_field and last_query and query.startswith(last_query)
+            if narrowing and len(last_result) <= _NARROW_SCAN_LIMIT:
+                row_tokens = self._row_tokens[field]
+                result = [i for i in last_result
+                          if all(any(t.startswith(q) for t in row_tokens[i]) for q in tokens)]
+            else:
+                candidate = set(last_result) if narrowing else None
+                for token in sorted(tokens, key=len, reverse=True):  # most selective first
+                    hits = self._prefix_rows(field, token)
+                    candidate = hits if candidate is None else candidate & hits
+                    if not candidate:
+                        break
+                result = sorted(candidate)
+        self._last = (field, query, result)
+        return result
+
+    def sort(self, row_ids, field: str, descending: bool = False):
+        rank = self._rank[field]
+        return sorted(row_ids, key=rank.__getitem__, reverse=descending)
+
+
+@lru_cache(maxsize=1)
+def default_index() -> CatalogIndex:
+    return CatalogIndex(load_catalog())
+
+
+def catalog_html(rows, widths=None, padding: int = 8) -> str:
+    # widths: optional column widths in percent (Data, Scale, Source, Description)
+    headings = ("Data", "Scale", "Source", "Data Description")
+    out = [f'<table border="1" cellspacing="0" cellpadding="{padding}" width="100%" style="border-collapse:collapse;">',
+           '  <tr style="background:#EAF2F8;">']
+    out += [f'    <th width="{width}%">{heading}</th>' if width else f"    <th>{heading}</th>"
+            for heading, width in zip(headings, widths or (None,) * len(headings))]
+    out.append("  </tr>")
+    for row in rows:
+        source = html.escape(row.get("source", ""))
+        if row.get("url"):
+            source = f'<a href="{html.escape(row["url"])}">{source}</a>'
+        description = html.escape(row.get("description", ""))
+        if row.get("info_url"):
+            description += f' <a href="{html.escape(row["info_url"])}">More info</a>'
+        out += ["  <tr>",
+                f"    <td>{html.escape(row.get('name', ''))}</td>",
+                f"    <td>{html.escape(row.get('resolution', ''))}</td>",
+                f"    <td>{source}</td>",
+                f"    <td>{description}</td>",
+                "  </tr>"]
+    out.append("</table>")
+    return "\n".join(out)
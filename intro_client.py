@@ -0,0 +1,148 @@
+# intro_client.py
+# Qt-free client for the out-of-process intro server (python intro.py --serve)
+# - One server per user session, reachable on a local socket (Unix domain
+#   socket / Windows named pipe, as created by QLocalServer)
+# - Requests are one JSON object per line, answered by one JSON line:
+#     {"cmd": "show", "tab": "Methodology", "locale": "en"} -> {"ok": true}
+#   commands: show, hide, ping, memory, quit
+# - Importing this module costs the host nothing beyond the stdlib; the server
+#   is spawned on first use, or early via spawn_server() so it is warm
+#
+# Usage:
+#   python intro_client.py show --tab Methodology
+#   python intro_client.py ping | memory | quit
+
+import argparse
+import getpass
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INTRO_SCRIPT = os.path.join(BASE_DIR, "intro.py")
+REQUEST_TIMEOUT_S = 5.0
+SPAWN_WAIT_S = 20.0
+
+
+def _session_id() -> str:
+    if os.name == "nt":
+        import ctypes
+        session = ctypes.c_ulong()
+        ctypes.windll.kernel32.ProcessIdToSessionId(os.getpid(), ctypes.byref(session))
+        return str(session.value)
+    return os.environ.get("XDG_SESSION_ID", "")
+
+
+def server_name() -> str:
+    # QLocalServer name: a pipe name on Windows, a socket path elsewhere
+    user = re.sub(r"\W", "_", getpass.getuser())
+    session = _session_id()
+    base = f"wa_intro_{user}" + (f"_{session}" if session else "")
+    if os.name == "nt":
+        return base
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime, base + ".sock")
+
+
+def request(message: dict, timeout: float = REQUEST_TIMEOUT_S) -> dict:
+    # Send one command and return the reply; OSError when no server is listening
+    data = json.dumps(message).encode("utf-8") + b"\n"
+    if os.name == "nt":
+        with open(r"\\.\pipe" + "\\" + server_name(), "r+b", buffering=0) as pipe:
+            pipe.write(data)
+            reply = pipe.readline()
+    else:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(server_name())
+            sock.sendall(data)
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                reply += chunk
+    if not reply:
+        raise ConnectionError("intro server closed the connection")
+    return json.loads(reply.decode("utf-8"))
+
+
+def is_running() -> bool:
+    try:
+        return bool(request({"cmd": "ping"}, timeout=1.0).get("ok"))
+    except (OSError, ValueError):
+        return False
+
+
+def spawn_server(locale: str = None):
+    # Start the server in the background (returns at once); a server already
+    # running for this session makes the new one exit immediately
+    args = [sys.executable, INTRO_SCRIPT, "--serve"] + (["--locale", locale] if locale else [])
+    options = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL,
+               "cwd": BASE_DIR}
+    if os.name == "nt":
+        options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options["start_new_session"] = True
+    return subprocess.Popen(args, **options)
+
+
+def _allow_foreground(pid):
+    # Windows only lets the foreground process hand focus to another one
+    if os.name == "nt" and pid:
+        import ctypes
+        ctypes.windll.user32.AllowSetForegroundWindow(int(pid))
+
+
+def show_intro(tab=None, locale: str = None, spawn: bool = True, wait_s: float = SPAWN_WAIT_S) -> dict:
+    # Show the intro window (optionally on a tab given by title or index)
+    message = {"cmd": "show", "tab": tab, "locale": locale}
+    try:
+        _allow_foreground(request({"cmd": "ping"}, timeout=1.0).get("pid"))
+        return request(message)
+    except (OSError, ValueError):
+        if not spawn:
+            raise
+    spawn_server(locale)
+    deadline = time.monotonic() + wait_s
+    while True:
+        try:
+            _allow_foreground(request({"cmd": "ping"}, timeout=1.0).get("pid"))
+            return request(message)
+        except (OSError, ValueError):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"intro server did not start within {wait_s:g} s")
+            time.sleep(0.1)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Talk to the background WA+ intro server")
+    parser.add_argument("cmd", choices=("show", "hide", "ping", "memory", "quit", "spawn"))
+    parser.add_argument("--tab", help="tab title or index to show")
+    parser.add_argument("--locale", help="content locale")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "spawn":
+            if not is_running():
+                spawn_server(args.locale)
+            return 0
+        if args.cmd == "show":
+            tab = int(args.tab) if args.tab and args.tab.isdigit() else args.tab
+            reply = show_intro(tab, args.locale)
+        else:
+            reply = request({"cmd": args.cmd, "locale": args.locale})
+    except (OSError, ValueError) as exc:
+        print(f"intro server: {exc}", file=sys.stderr)
+        return 1
+    print(json.dumps(reply, indent=2))
+    return 0 if reply.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# intro_content.py
+# Per-locale content store for the intro window
+# - Source HTML lives in content/<locale>/<block>.html, versioned by content/manifest.json
+# - The build step sanitizes and normalizes every block once and packs each
+#   locale into its own bundle (content/intro_content_<locale>.pak, same format
+#   as intro_assets), so adding a locale never touches another locale's file
+# - At runtime only the active locale's bundle is opened (mmap) and a block is
+#   decoded the first time a tab asks for it; missing blocks fall back to the
+#   default locale, which is opened only if that happens
+# - Each bundle records the size, mtime and sha1 of the source files it was
+#   built from; if content/<locale>/ has changed since, the source files are
+#   read instead (with a warning to rebuild) so edits are never hidden
+#
+# Usage: python intro_content.py            # build bundles for every locale
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from intro_assets import AssetBundle, write_bundle
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENT_DIR = os.path.join(BASE_DIR, "content")
+MANIFEST_PATH = os.path.join(CONTENT_DIR, "manifest.json")
+DEFAULT_LOCALE = "en"
+
+_UNSAFE_ELEMENTS = re.compile(r"<(script|style|iframe|object|embed)\b.*?</\1\s*>", re.S | re.I)
+_EVENT_ATTRS = re.compile(r"\s+on\w+\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s>]+)", re.I)
+_JS_URLS = re.compile(r"(href|src)\s*=\s*([\"'])\s*javascript:[^\"']*\2", re.I)
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bundle_path(locale: str) -> str:
+    return os.path.join(CONTENT_DIR, f"intro_content_{locale}.pak")
+
+
+def sanitize(html: str) -> str:
+    # Drop active content and normalise whitespace (rich-text layout collapses it anyway)
+    html = _UNSAFE_ELEMENTS.sub("", html)
+    html = _EVENT_ATTRS.sub("", html)
+    html = _JS_URLS.sub(r'\1="#"', html)
+    html = re.sub(r"\s+", " ", html)
+    return html.strip()
+
+
+def _locale_dir(locale: str) -> str:
+    return os.path.join(CONTENT_DIR, locale)
+
+
+def _source_files(locale: str) -> list:
+    return sorted(n for n in os.listdir(_locale_dir(locale)) if n.endswith(".html"))
+
+
+def build_locale(locale: str, version: str) -> dict:
+    entries, sources = [], {}
+    for filename in _source_files(locale):
+        path = os.path.join(_locale_dir(locale), filename)
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        sources[filename] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                             "sha1": hashlib.sha1(data).hexdigest()}
+        text = sanitize(data.decode("utf-8"))
+        entries.append((os.path.splitext(filename)[0], text.encode("utf-8"), {"type": "html", "version": version}))
+    return write_bundle(entries, bundle_path(locale), meta={"sources": sources})
+
+
+def stale_sources(bundle: AssetBundle, locale: str) -> list:
+    # Source files added, removed or edited since the bundle was built; an
+    # install without content/<locale>/ has only the bundle, which then wins
+    try:
+        current = _source_files(locale)
+    except OSError:
+        return []
+    recorded = bundle.meta.get("sources", {})
+    stale = sorted(set(current) ^ set(recorded))
+    for filename in sorted(set(current) & set(recorded)):
+        path, entry = os.path.join(_locale_dir(locale), filename), recorded[filename]
+        try:
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime_ns"]):
+                continue
+            if stat.st_size == entry["size"]:  # touched (checkout, copy): compare contents
+                with open(path, "rb") as f:
+                    if hashlib.sha1(f.read()).hexdigest() == entry["sha1"]:
+                        continue
+        except OSError:
+            pass
+        stale.append(filename)
+    return stale
+
+
+class ContentStore:
+    def __init__(self, locale: str = None):
+        self._manifest = None
+        self.locale = locale or os.environ.get("WA_INTRO_LOCALE") or DEFAULT_LOCALE
+        self._bundles = {}  # locale -> AssetBundle or None (opened on first use)
+        self._blocks = {}   # (locale, name) -> decoded text
+
+    @property
+    def manifest(self) -> dict:
+        if self._manifest is None:
+            try:
+                self._manifest = load_manifest()
+            except (OSError, ValueError):
+                self._manifest = {"version": "dev", "locales": {DEFAULT_LOCALE: {}}}
+        return self._manifest
+
+    @property
+    def version(self) -> str:
+        return str(self.manifest.get("version", "dev"))
+
+    @property
+    def right_to_left(self) -> bool:
+        return self.manifest.get("locales", {}).get(self.locale, {}).get("direction") == "rtl"
+
+    def _bundle(self, locale: str):
+        if locale not in self._bundles:
+            bundle = AssetBundle.open_default(bundle_path(locale))
+            stale = stale_sources(bundle, locale) if bundle is not None else []
+            if stale:
+                print(f"intro content: {bundle.path} is out of date ({', '.join(stale)} changed); "
+                      f"reading content/{locale}/ instead, rebuild with python intro_content.py", file=sys.stderr)
+                bundle.close()
+                bundle = None
+            self._bundles[locale] = bundle
+        return self._bundles[locale]
+
+    def _read(self, locale: str, name: str):
+        bundle = self._bundle(locale)
+        if bundle is not None:
+            if name in bundle:
+                return str(bundle.get(name), "utf-8")  # decoded straight from the mapping
+            return None
+        # No built bundle (development checkout): read and sanitize the source file
+        try:
+            with open(os.path.join(_locale_dir(locale), name + ".html"), "r", encoding="utf-8") as f:
+                return sanitize(f.read())
+        except OSError:
+            return None
+
+    def get(self, name: str) -> str:
+        for locale in (self.locale, DEFAULT_LOCALE):
+            key = (locale, name)
+            if key not in self._blocks:
+                text = self._read(locale, name)
+                if text is None:
+                    continue
+                self._blocks[key] = text
+            return self._blocks[key]
+        raise KeyError(f"content block {name!r} not found for locale {self.locale!r}")
+
+    def release(self):
+        # Forget decoded blocks (they are re-read from the mapped bundle on demand)
+        self._blocks.clear()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build per-locale intro content bundles")
+    parser.add_argument("locales", nargs="*", help="locales to build (default: all in the manifest)")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest()
+    for locale in args.locales or sorted(manifest["locales"]):
+        index = build_locale(locale, str(manifest["version"]))
+        size = os.path.getsize(bundle_path(locale))
+        print(f"{locale}: {len(index)} blocks, {size:,d} bytes -> {bundle_path(locale)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# intro_export.py
+# Headless export of the intro (all tabs, text + diagrams) to one HTML or PDF per locale
+# - Tabs are prepared on a thread pool (HTML assembly, or QTextDocument layout for
+#   PDF) and written strictly in order, with a bounded look-ahead so memory stays
+#   flat however many locales are exported
+# - Output is streamed: diagrams go from the mmap'd asset bundle straight into the
+#   HTML as inline SVG / chunked base64; PDF pages are painted one at a time
+# - HTML needs no Qt at all; PDF uses an offscreen QApplication (no window)
+#
+# Usage:
+#   python intro_export.py html --out wa_intro.html
+#   python intro_export.py pdf --out exports/ --locales all
+#   python intro.py --export pdf [same options]
+
+import argparse
+import base64
+import html
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from intro_assets import AssetBundle, pack_source
+from intro_catalog import catalog_html, default_index
+from intro_content import DEFAULT_LOCALE, ContentStore, load_manifest
+from intro_trace import tracer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TITLE = "Customized Water Accounting Plus Tool for Jordan"
+FORMATS = ("html", "pdf")
+# Data Sources table on a portrait page: compact enough that each column's
+# explicit width still fits its longest word, so cells wrap between words only
+PDF_CATALOG_WIDTHS = (22, 21, 15, 42)
+PDF_CATALOG_POINT_SIZE = 10
+PDF_CATALOG_PADDING = 4
+
+# Tabs in window order; a part is ("block", content name), ("diagram", asset) or ("catalog",)
+SECTIONS = (
+    ("Overview", (("block", "overview"),)),
+    ("Workflow", (("block", "workflow_part1"), ("diagram", "workflow.svg"), ("block", "workflow_part2"))),
+    ("Methodology", (("block", "methodology_part1"), ("diagram", "flowchart.svg"),
+                     ("block", "methodology_part2"))),
+    ("Data Sources", (("block", "data_intro"), ("catalog",))),
+    ("References & Credits", (("block", "references"),)),
+)
+
+_B64_CHUNK = 3 * 16 * 1024  # multiple of 3 so chunks concatenate into valid base64
+_STYLE = """
+body { font-family: Arial, sans-serif; max-width: 1000px; margin: 0 auto; padding: 16px; color: #222; }
+h1.title { color: #2E86C1; text-align: center; }
+nav a { margin-right: 14px; }
+section { border-top: 1px solid #AED6F1; margin-top: 24px; }
+figure { margin: 16px 0; text-align: center; }
+figure svg, figure img { max-width: 100%; height: auto; }
+"""
+
+
+def output_path(out: str, locale: str, fmt: str, batch: bool) -> str:
+    # A directory (or any multi-locale export) gets one wa_intro_<locale>.<fmt> per locale
+    if batch or out.endswith(os.sep) or os.path.isdir(out):
+        return os.path.join(out, f"wa_intro_{locale}.{fmt}")
+    return out
+
+
+def _ordered_map(fn, items, workers: int):
+    # Like executor.map, but never more than 2 * workers results are waiting to
+    # be written, so a slow writer does not let every tab pile up in memory
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _section_parts(store: ContentStore, parts):
+    # Resolve content blocks in the calling thread (the store is not shared across threads)
+    for part in parts:
+        if part[0] == "block":
+            yield ("html", store.get(part[1]))
+        else:
+            yield part
+
+
+# ---------- HTML ----------
+class _Assets:
+    def __init__(self):
+        self.bundle = AssetBundle.open_default()
+
+    def get(self, name: str):
+        # (type, payload) where type is "svg", "png" or "jpeg"; payload is zero-copy from the bundle
+        if self.bundle is not None and name in self.bundle:
+            return self.bundle.info(name)["type"], self.bundle.get(name)
+        _, payload, meta = pack_source(os.path.join(BASE_DIR, name), recompress=False)
+        return meta["type"], memoryview(payload)
+
+
+def _html_section(job):
+    locale, index, title, parts = job
+    with tracer.span(f"export html {locale} {title}"):
+        chunks = [f'<section id="tab{index}">\n<h1>{html.escape(title)}</h1>\n']
+        for part in parts:
+            if part[0] == "html":
+                chunks.append(part[1] + "\n")
+            elif part[0] == "catalog":
+                chunks.append(catalog_html(default_index().rows) + "\n")
+            else:
+                chunks.append(part)  # diagram: streamed from the bundle at write time
+        chunks.append("</section>\n")
+        return locale, chunks
+
+
+def _write_diagram(f, assets: _Assets, name: str):
+    kind, payload = assets.get(name)
+    f.write(f'<figure id="{html.escape(name)}">')
+    if kind == "svg":
+        text = bytes(payload).decode("utf-8")
+        f.write(text[text.find("<svg"):])
+    else:
+        f.write(f'<img alt="{html.escape(name)}" src="data:image/{kind};base64,')
+        for start in range(0, len(payload), _B64_CHUNK):
+            f.write(base64.b64encode(payload[start:start + _B64_CHUNK]).decode("ascii"))
+        f.write('">')
+    f.write("</figure>\n")
+
+
+def _html_header(store: ContentStore) -> str:
+    direction = "rtl" if store.right_to_left else "ltr"
+    nav = " ".join(f'<a href="#tab{i}">{html.escape(t)}</a>' for i, (t, _) in enumerate(SECTIONS))
+    return (f'<!DOCTYPE html>\n<html lang="{html.escape(store.locale)}" dir="{direction}">\n<head>\n'
+            f'<meta charset="utf-8">\n<title>{html.escape(TITLE)}</title>\n'
+            f'<meta name="generator" content="WA+ intro export, content {html.escape(store.version)}">\n'
+            f"<style>{_STYLE}</style>\n</head>\n<body>\n"
+            f'<h1 class="title">{html.escape(TITLE)}</h1>\n<nav>{nav}</nav>\n')
+
+
+def export_html(locales, out: str, workers: int = 4) -> list:
+    stores = {locale: ContentStore(locale) for locale in locales}
+    jobs = ((locale, i, title, list(_section_parts(stores[locale], parts)))
+            for locale in locales for i, (title, parts) in enumerate(SECTIONS))
+    assets = _Assets()
+    written, f, current = [], None, None
+    try:
+        for locale, chunks in _ordered_map(_html_section, jobs, workers):
+            if locale != current:
+                if f is not None:
+                    f.write("</body>\n</html>\n")
+                    f.close()
+                current = locale
+                path = output_path(out, locale, "html", len(locales) > 1)
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                f = open(path, "w", encoding="utf-8")
+                f.write(_html_header(stores[locale]))
+                written.append(path)
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    f.write(chunk)
+                else:
+                    _write_diagram(f, assets, chunk[1])
+        if f is not None:
+            f.write("</body>\n</html>\n")
+    finally:
+        if f is not None:
+            f.close()
+        for store in stores.values():
+            store.release()
+    return written
+
+
+# ---------- PDF ----------
+def _offscreen_app():
+    # PDF rendering needs a GUI application object, never a window
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def export_pdf(locales, out: str, workers: int = 4) -> list:
+    app = _offscreen_app()
+    from PyQt5.QtCore import QMarginsF, QRectF, QSizeF, Qt
+    from PyQt5.QtGui import QFontDatabase, QPageLayout, QPageSize, QPainter, QPdfWriter, QTextDocument, QTextOption
+    from intro import asset_size, render_asset
+
+    resolution = 96  # so px sizes in the content HTML print at their screen size
+    page_size, margins = QPageSize(QPageSize.A4), QMarginsF(15, 15, 15, 15)
+    page = QPageLayout(page_size, QPageLayout.Portrait, margins, QPageLayout.Millimeter).paintRectPixels(resolution)
+    page_w, page_h = float(page.width()), float(page.height())
+    stores = {locale: ContentStore(locale) for locale in locales}
+    if not QFontDatabase.supportsThreadedFontRendering():
+        workers = 1  # text layout must then stay on the GUI thread; run it inline below
+
+    def layout(job):
+        # QTextDocument is reentrant: each tab is laid out on its own worker thread,
+        # then handed to the GUI thread, which owns the single PDF painter
+        locale, index, title, parts = job
+        with tracer.span(f"export pdf layout {locale} {title}"):
+            laid_out, heading = [], f"<h1 style='color:#2E86C1;'>{html.escape(title)}</h1>"
+            for part in parts:
+                if part[0] == "diagram":
+                    laid_out.append(part)
+                    continue
+                doc = QTextDocument()
+                if part[0] == "html":
+                    text = part[1]
+                else:
+                    text = catalog_html(default_index().rows, PDF_CATALOG_WIDTHS, PDF_CATALOG_PADDING)
+                    font = doc.defaultFont()
+                    font.setPointSizeF(PDF_CATALOG_POINT_SIZE)
+                    doc.setDefaultFont(font)
+                option = QTextOption(doc.defaultTextOption())
+                option.setWrapMode(QTextOption.WordWrap)  # a word too long for its cell widens it, never splits
+                if stores[locale].right_to_left:
+                    option.setTextDirection(Qt.RightToLeft)
+                doc.setDefaultTextOption(option)
+                doc.setHtml(heading + text)
+                doc.setPageSize(QSizeF(page_w, page_h))  # paginates
+                if threading.current_thread() is not threading.main_thread():
+                    doc.moveToThread(app.thread())
+                laid_out.append(("doc", doc))
+                heading = ""
+            return locale, laid_out
+
+    jobs = ((locale, i, title, list(_section_parts(stores[locale], parts)))
+            for locale in locales for i, (title, parts) in enumerate(SECTIONS))
+    results = _ordered_map(layout, jobs, workers) if workers > 1 else map(layout, jobs)
+
+    written, writer, painter, current = [], None, None, None
+    fresh_page = True
+    try:
+        for locale, parts in results:
+            if locale != current:
+                if painter is not None:
+                    painter.end()
+                current = locale
+                path = output_path(out, locale, "pdf", len(locales) > 1)
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                writer = QPdfWriter(path)
+                writer.setResolution(resolution)
+                writer.setPageSize(page_size)
+                writer.setPageMargins(margins, QPageLayout.Millimeter)
+                writer.setTitle(TITLE)
+                writer.setCreator(f"WA+ intro export, content {stores[locale].version}")
+                painter = QPainter(writer)
+                painter.setRenderHint(QPainter.Antialiasing)
+                painter.setRenderHint(QPainter.SmoothPixmapTransform)
+                written.append(path)
+                fresh_page = True
+            # Every tab starts on a new page; a diagram follows on the same page when it fits
+            if not fresh_page:
+                writer.newPage()
+            used = 0.0
+            for kind, item in parts:
+                if kind == "doc":
+                    if used:
+                        writer.newPage()
+                    for number in range(item.pageCount()):
+                        if number:
+                            writer.newPage()
+                        painter.save()
+                        painter.translate(0, -number * page_h)
+                        item.drawContents(painter, QRectF(0, number * page_h, page_w, page_h))
+                        painter.restore()
+                    last = item.documentLayout().blockBoundingRect(item.lastBlock()).bottom()
+                    used = last - (item.pageCount() - 1) * page_h
+                else:
+                    size = asset_size(item)
+                    scale = min(page_w / size.width(), page_h / size.height())
+                    w, h = size.width() * scale, size.height() * scale
+                    if used + h > page_h:
+                        writer.newPage()
+                        used = 0.0
+                    # Vector diagrams stay vector in the PDF; rasters are embedded once
+                    render_asset(item, painter, QRectF((page_w - w) / 2, used, w, h))
+                    used += h + 12
+            fresh_page = False
+            del parts  # finished documents are freed before the next tab is painted
+    finally:
+        if painter is not None and painter.isActive():
+            painter.end()
+        for store in stores.values():
+            store.release()
+    return written
+
+
+# ---------- CLI ----------
+def _locales(value: str):
+    if not value:
+        return [os.environ.get("WA_INTRO_LOCALE") or DEFAULT_LOCALE]
+    if value == "all":
+        return sorted(load_manifest()["locales"])
+    return list(dict.fromkeys(v.strip() for v in value.split(",") if v.strip()))  # de-duplicated, in order
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the WA+ intro to HTML or PDF without opening a window")
+    parser.add_argument("format", choices=FORMATS)
+    parser.add_argument("--out", help="output file, or a directory for one file per locale "
+                                      "(default wa_intro_<locale>.<format>)")
+    parser.add_argument("--locales", help="comma-separated locales, or 'all' (default $WA_INTRO_LOCALE or en)")
+    parser.add_argument("--jobs", type=int, default=min(8, os.cpu_count() or 1),
+                        help="tabs prepared in parallel")
+    args = parser.parse_args(argv)
+
+    locales = _locales(args.locales)
+    out = args.out or (os.curdir if len(locales) > 1 else f"wa_intro_{locales[0]}.{args.format}")
+    start = time.perf_counter()
+    export = export_html if args.format == "html" else export_pdf
+    written = export(locales, out, workers=max(1, args.jobs))
+    for path in written:
+        print(f"{path}: {os.path.getsize(path):,d} bytes")
+    print(f"{len(written)} file(s) in {time.perf_counter() - start:.2f} s")
+    tracer.finish()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+# intro_links.py
+# Link-health checker for the intro content (Data Sources catalog + all HTML blocks)
+# - Extracts every external href and checks them concurrently with asyncio
+# - Keep-alive connection pool per host, per-host concurrency and rate limits,
+#   HEAD first with GET fallback, redirects followed, per-request timeouts
+# - Results cached on disk with a TTL so re-runs only hit stale links
+# - Prints a report and optionally writes machine-readable JSON
+# - --selftest covers 200, 404, refused connections and the stale keep-alive
+#   retry against a local http.server
+#
+# Usage:
+#   python intro_links.py [--json report.json] [--ttl 24] [--no-cache] [URL ...]
+#   python intro_links.py --selftest   # against a local stand-in server
+#   python intro.py --check-links [same options]
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import ssl
+import sys
+import threading
+import time
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlsplit
+
+from intro_cache import DiskCache
+from intro_catalog import load_catalog
+from intro_content import ContentStore
+
+USER_AGENT = "WA-intro-linkcheck/1.0"
+MAX_REDIRECTS = 5
+# Servers that reject HEAD (or answer it wrongly) get a GET instead
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 502, 503}
+
+
+# ---------- Extraction ----------
+class _HrefParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.hrefs.append(href)
+
+
+def extract_links(locale: str = None) -> dict:
+    # url -> list of places it appears ("content:references", "catalog:mswep")
+    links = {}
+    store = ContentStore(locale)
+    content_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content", store.locale)
+    names = sorted(os.path.splitext(n)[0] for n in os.listdir(content_dir) if n.endswith(".html"))
+    for name in names:
+        parser = _HrefParser()
+        parser.feed(store.get(name))
+        for href in parser.hrefs:
+            links.setdefault(href, []).append(f"content:{name}")
+    for row in load_catalog():
+        for key in ("url", "info_url"):
+            if row.get(key):
+                links.setdefault(row[key], []).append(f"catalog:{row['id']}")
+    return {url: where for url, where in links.items() if urlsplit(url).scheme in ("http", "https")}
+
+
+# ---------- HTTP ----------
+class _HostLimiter:
+    def __init__(self, concurrency: int, min_interval: float):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.min_interval = min_interval
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait_turn(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.min_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ConnectionPool:
+    # Idle keep-alive connections per (scheme, host, port)
+    def __init__(self, per_host: int = 4, min_interval: float = 0.1, timeout: float = 10.0):
+        self.per_host, self.min_interval, self.timeout = per_host, min_interval, timeout
+        self._idle = {}
+        self._limiters = {}
+        self._ssl = ssl.create_default_context()
+
+    def limiter(self, key) -> _HostLimiter:
+        if key not in self._limiters:
+            self._limiters[key] = _HostLimiter(self.per_host, self.min_interval)
+        return self._limiters[key]
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None,
+                                    server_hostname=host if scheme == "https" else None),
+            self.timeout)
+
+    async def request(self, method: str, url: str):
+        # Returns (status, headers dict); the body is never read for GET, so
+        # that connection is closed instead of being returned to the pool
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request = (f"{method} {path} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode("latin-1")
+
+        limiter = self.limiter(key)
+        async with limiter.slots:
+            await limiter.wait_turn()
+            idle = self._idle.setdefault(key, [])
+            reused = bool(idle)
+            reader, writer = idle.pop() if idle else await self._connect(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers = await asyncio.wait_for(self._read_head(reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+                # Stale keep-alive connection: retry once on a fresh one
+                reader, writer = await self._connect(key)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, headers = await asyncio.wait_for(self._read_head(reader), self.timeout)
+                except BaseException:
+                    writer.close()
+                    raise
+            except BaseException:
+                writer.close()
+                raise
+
+            reusable = (method == "HEAD" or headers.get("content-length") == "0") \
+                and headers.get("connection", "").lower() != "close"
+            if reusable:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+        return status, headers
+
+    @staticmethod
+    async def _read_head(reader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        status = int(line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def _check_one(pool: ConnectionPool, url: str) -> dict:
+    # Result: dict with url, ok, status, final_url, method, error, elapsed_ms, checked_at
+    result = {"url": url, "ok": False, "status": 0, "final_url": url, "method": "HEAD", "error": "",
+              "elapsed_ms": 0.0, "checked_at": time.time()}
+    start = time.perf_counter()
+    try:
+        for method in ("HEAD", "GET"):
+            target = url
+            for _ in range(MAX_REDIRECTS + 1):
+                status, headers = await pool.request(method, target)
+                if status in (301, 302, 303, 307, 308) and headers.get("location"):
+                    target = urljoin(target, headers["location"])
+                    continue
+                break
+            result.update(status=status, final_url=target, method=method)
+            if method == "HEAD" and status in HEAD_FALLBACK_STATUSES:
+                continue
+            break
+        result["ok"] = 200 <= result["status"] < 400
+    except asyncio.TimeoutError:
+        result["error"] = "timeout"
+    except (OSError, ValueError, IndexError) as exc:  # ssl.SSLError is an OSError
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["elapsed_ms"] = (time.perf_counter() - start) * 1000.0
+    return result
+
+
+async def check_links_async(urls, per_host: int = 4, min_interval: float = 0.1, timeout: float = 10.0):
+    pool = ConnectionPool(per_host=per_host, min_interval=min_interval, timeout=timeout)
+    try:
+        return await asyncio.gather(*(_check_one(pool, url) for url in urls))
+    finally:
+        pool.close()
+
+
+# ---------- Self-test ----------
+class _StandInHandler(BaseHTTPRequestHandler):
+    # Local stand-in for link targets: /missing answers 404, /stale answers and
+    # then drops the keep-alive connection unannounced, /drop never answers
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_HEAD(self):
+        if self.path == "/drop":
+            self.close_connection = True
+            return
+        self.send_response(404 if self.path == "/missing" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        if self.path == "/stale":
+            self.close_connection = True
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def _selftest_checks(base: str, refused: str) -> list:
+    failures = []
+    pool = ConnectionPool(per_host=1, min_interval=0.0, timeout=5.0)
+
+    async def expect(label, url, ok, status=0, error=""):
+        result = await _check_one(pool, url)
+        if (result["ok"], result["status"]) != (ok, status) or not result["error"].startswith(error):
+            failures.append(f"{label}: got ok={result['ok']} status={result['status']} error={result['error']!r}")
+
+    try:
+        await expect("200", base + "/ok", True, 200)
+        await expect("404", base + "/missing", False, 404)
+        await expect("keep-alive dropped by server", base + "/stale", True, 200)
+        opened = _StandInHandler.connections
+        await expect("stale keep-alive retry", base + "/ok", True, 200)
+        if _StandInHandler.connections != opened + 1:
+            failures.append("stale keep-alive retry: no fresh connection was opened")
+        await expect("retry that fails too", base + "/drop", False, error="ConnectionError")
+        await expect("refused connection", refused, False, error="ConnectionRefusedError")
+    finally:
+        pool.close()
+    return failures
+
+
+def selftest() -> list:
+    # Checks the HTTP client against a local stand-in server; returns failures
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with socket.socket() as unused:  # a port nothing listens on
+        unused.bind(("127.0.0.1", 0))
+        refused = f"http://127.0.0.1:{unused.getsockname()[1]}/"
+    try:
+        return asyncio.run(_selftest_checks(f"http://127.0.0.1:{server.server_address[1]}", refused))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# ---------- Cache ----------
+def _cache_path() -> str:
+    return DiskCache().path("link_health.json")
+
+
+def _load_cache(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: str, cache: dict):
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def check_links(urls, ttl_hours: float = 24.0, use_cache: bool = True, cache_path: str = None, **options):
+    # Result dicts in urls order; cached results younger than ttl_hours are
+    # reused (marked "cached") and only the rest go out on the network
+    cache_path = cache_path or _cache_path()
+    cache = _load_cache(cache_path) if use_cache else {}
+    now = time.time()
+    results, stale = {}, []
+    for url in urls:
+        entry = cache.get(url)
+        if entry and now - entry.get("checked_at", 0) < ttl_hours * 3600:
+            results[url] = dict(entry, cached=True)
+        else:
+            stale.append(url)
+
+    checked = asyncio.run(check_links_async(stale, **options)) if stale else []
+    for result in checked:
+        cache[result["url"]] = result
+        results[result["url"]] = dict(result, cached=False)
+    if use_cache and checked:
+        _save_cache(cache_path, cache)
+    return [results[url] for url in urls]
+
+
+# ---------- CLI ----------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check external links in the WA+ intro content")
+    parser.add_argument("urls", nargs="*", help="check these URLs instead of the intro content")
+    parser.add_argument("--locale", help="content locale to scan")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--ttl", type=float, default=24.0, help="reuse cached results younger than this (hours)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    parser.add_argument("--per-host", type=int, default=4, help="concurrent requests per host")
+    parser.add_argument("--interval", type=float, default=0.1, help="minimum seconds between requests to one host")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--selftest", action="store_true", help="check the HTTP client against a local server and exit")
+    args = parser.parse_args(argv)
+    if args.selftest:
+        failures = selftest()
+        print("\n".join(failures) or "link checker self-test: 200, 404, refused and stale keep-alive all handled")
+        return 1 if failures else 0
+
+    sources = {url: ["command line"] for url in args.urls} if args.urls else extract_links(args.locale)
+    start = time.perf_counter()
+    results = check_links(list(sources), ttl_hours=args.ttl, use_cache=not args.no_cache,
+                          per_host=args.per_host, min_interval=args.interval, timeout=args.timeout)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        result["sources"] = sources[result["url"]]
+
+    width = max((len(r["url"]) for r in results), default=10)
+    for result in sorted(results, key=lambda r: (r["ok"], r["url"])):
+        state = "OK  " if result["ok"] else "FAIL"
+        detail = str(result["status"]) if result["status"] else result["error"]
+        if result["final_url"] != result["url"]:
+            detail += f" -> {result['final_url']}"
+        if not result["ok"]:
+            detail += f"  [{', '.join(result['sources'])}]"
+        cached = " (cached)" if result["cached"] else ""
+        print(f"{state} {result['url']:<{width}}  {detail}{cached}")
+    broken = [r for r in results if not r["ok"]]
+    print(f"{len(results)} links, {len(broken)} broken, {elapsed:.2f} s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"checked": len(results), "broken": len(broken), "elapsed_s": round(elapsed, 3),
+                       "results": results}, f, indent=2)
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+# intro_planner.py
+# Acquisition volume and I/O planner for the Data Sources catalog
+# - For a basin (bounding box or GeoJSON polygon), a period and a set of catalog
+#   products: native grid size, time steps, tiles and files to fetch,
+#   uncompressed/compressed volumes, download volume and the harmonized stack
+# - Grid arithmetic runs over all products at once as numpy arrays
+# - Per-product grid descriptors (native step from intro_catalog.resolution_m,
+#   snapped like intro_harmonize, plus the distribution layout below) are built
+#   once per catalog version and cached on disk (intro_cache)
+# - Memory: harmonization peak from intro_harmonize.band_memory_bytes, and the
+#   largest worker count / band height that fits a RAM budget, i.e. the
+#   --workers/--band-rows to pass to intro_harmonize.py
+#
+# Usage:
+#   python intro_planner.py --bbox 35.6 31.7 36.6 32.4 --period 2015-01 2024-12 --ram 8
+#   python intro_planner.py --polygon basin.geojson --products chirps gleam_eta wapor_eta --json
+
+import argparse
+import json
+import math
+import os
+import sys
+from functools import lru_cache
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import intro_harmonize
+from intro_cache import DiskCache
+from intro_catalog import CATALOG_PATH, load_catalog
+from intro_harmonize import Grid, catalog_step_deg
+
+EARTH_RADIUS_KM = 6371.0088
+PROCESS_BYTES = 80 * 1024 * 1024  # interpreter + numpy per process
+RAM_HEADROOM = 0.2                # share of the budget left to the OS and page cache
+DEFAULT_PRODUCTS = ("chirps", "gleam_eta", "wapor_eta", "mod15_lai")
+DESCRIPTOR_VERSION = 1
+
+
+class Layout(NamedTuple):
+    # How a product is distributed: time step, tile size in degrees (None: files
+    # are clipped to the basin by the server), time steps per file, stored bytes
+    # per value and compressed/uncompressed ratio
+    timestep: str
+    tile_deg: float = None
+    steps_per_file: int = 1
+    value_bytes: int = 2
+    compression: float = 0.4
+
+
+LAYOUTS = {
+    "dem": Layout("static", 5.0, 1, 2, 0.5),              # HydroSHEDS 5° tiles
+    "wapor_landuse": Layout("year", None, 1, 1, 0.15),
+    "mswep": Layout("3h", None, 1, 4, 0.35),
+    "chirps": Layout("day", None, 1, 4, 0.3),
+    "gleam_eta": Layout("month", None, 12, 4, 0.5),       # one file per year
+    "gleam_ep": Layout("month", None, 12, 4, 0.5),
+    "ssebop_eta": Layout("month", None, 1, 2, 0.4),
+    "mod16_eta": Layout("8day", 10.0, 1, 2, 0.4),         # MODIS tiles, ~10°
+    "wapor_eta": Layout("month", None, 1, 2, 0.35),
+    "wapor_ret": Layout("month", None, 1, 2, 0.35),
+    "mod15_lai": Layout("month", 10.0, 1, 1, 0.4),
+    "mod17_npp": Layout("year", 10.0, 1, 2, 0.4),
+    "mod17_gpp": Layout("month", 10.0, 1, 2, 0.4),
+    "ndm": Layout("month", None, 1, 2, 0.35),
+    "gmia": Layout("static", None, 1, 4, 0.3),
+    "worldpop": Layout("year", None, 1, 4, 0.3),
+    "ewr": Layout("static", None, 1, 4, 0.3),
+    "theta_sat": Layout("static", None, 1, 4, 0.4),
+}
+
+
+class ProductGrid(NamedTuple):
+    id: str
+    name: str
+    step_deg: float
+    timestep: str
+    tile_deg: float
+    steps_per_file: int
+    value_bytes: int
+    compression: float
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("the planner needs numpy (pip install numpy)")
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(n) < 1024 or unit == "TB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024.0
+
+
+def format_step(step_deg: float) -> str:
+    # Grid step as a nominal ground distance, e.g. 1/448° -> "250 m", 1/12° -> "9.3 km"
+    metres = float(f"{step_deg * intro_harmonize.METRES_PER_DEGREE:.2g}")
+    return f"{metres:g} m" if metres < 1000 else f"{metres / 1000:g} km"
+
+
+# ---------- Product descriptors ----------
+@lru_cache(maxsize=1)
+def _product_grids(catalog_hash: str) -> dict:
+    cache = DiskCache()
+    key = f"product_grids_{catalog_hash[:16]}_v{DESCRIPTOR_VERSION}.json"
+    path = cache.get(key)
+    if path is not None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return {pid: ProductGrid(**entry) for pid, entry in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            pass
+    grids = {}
+    for row in load_catalog():
+        step = catalog_step_deg(row["id"])
+        if step is None:
+            continue  # stations, tables and vectors are not gridded
+        layout = LAYOUTS.get(row["id"], Layout("month"))
+        grids[row["id"]] = ProductGrid(row["id"], row.get("name", row["id"]), step, *layout)
+    try:
+        cache.put(key, json.dumps({pid: g._asdict() for pid, g in grids.items()}).encode("utf-8"))
+    except OSError:
+        pass
+    return grids
+
+
+_grids_seen = None  # ((mtime_ns, size) of the catalog, grids)
+
+
+def product_grids() -> dict:
+    # {dataset id: ProductGrid} for every gridded catalog product; the catalog is
+    # only re-hashed when its stat changes, so repeated plans cost one stat()
+    global _grids_seen
+    st = os.stat(CATALOG_PATH)
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _grids_seen is None or _grids_seen[0] != stamp:
+        _grids_seen = (stamp, _product_grids(DiskCache().content_hash(CATALOG_PATH)))
+    return _grids_seen[1]
+
+
+# ---------- Basin ----------
+def load_polygon(path: str):
+    # Rings (lists of (lon, lat)) of a GeoJSON Polygon/MultiPolygon, Feature or FeatureCollection
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    geometries = [data]
+    rings = []
+    while geometries:
+        g = geometries.pop()
+        kind = g.get("type")
+        if kind == "FeatureCollection":
+            geometries.extend(feature for feature in g["features"])
+        elif kind == "Feature":
+            geometries.append(g["geometry"])
+        elif kind == "Polygon":
+            rings.extend(g["coordinates"])
+        elif kind == "MultiPolygon":
+            rings.extend(ring for polygon in g["coordinates"] for ring in polygon)
+    if not rings:
+        raise ValueError(f"{path}: no polygon geometry")
+    return rings
+
+
+def polygon_bbox(rings):
+    points = np.concatenate([np.asarray(r, dtype=np.float64)[:, :2] for r in rings])
+    return (float(points[:, 0].min()), float(points[:, 1].min()),
+            float(points[:, 0].max()), float(points[:, 1].max()))
+
+
+def row_cell_area_km2(grid: Grid):
+    # Area of one cell in each row (spherical earth)
+    lat = np.radians(grid.north - grid.step_y * np.arange(grid.rows + 1))
+    return EARTH_RADIUS_KM ** 2 * math.radians(grid.step_x) * (np.sin(lat[:-1]) - np.sin(lat[1:]))
+
+
+def polygon_mask(rings, grid: Grid):
+    # Cells whose centre is inside the polygon (even-odd rule, so holes work),
+    # one vectorized pass over all cells per polygon edge
+    lon = grid.west + grid.step_x * (np.arange(grid.cols) + 0.5)
+    lat = grid.north - grid.step_y * (np.arange(grid.rows) + 0.5)
+    x, y = np.meshgrid(lon, lat)
+    inside = np.zeros(x.shape, dtype=bool)
+    for ring in rings:
+        ring = np.asarray(ring, dtype=np.float64)[:, :2]
+        for (x0, y0), (x1, y1) in zip(ring, np.roll(ring, -1, axis=0)):
+            if y0 == y1:
+                continue
+            crosses = (y0 > y) != (y1 > y)
+            inside ^= crosses & (x < x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+    return inside
+
+
+# ---------- Time ----------
+def parse_period(start: str, end: str):
+    # "YYYY[-MM[-DD]]" bounds -> (first day, last day) as datetime64[D]
+    first = np.datetime64(start, "D")
+    unit = {4: "Y", 7: "M"}.get(len(end))
+    last = (np.datetime64(end, unit) + 1).astype("datetime64[D]") - 1 if unit else np.datetime64(end, "D")
+    if last < first:
+        raise ValueError(f"period ends before it starts: {start} .. {end}")
+    return first, last
+
+
+def count_steps(timestep: str, first, last) -> int:
+    if timestep == "static":
+        return 1
+    if timestep in ("3h", "day"):
+        days = int((last - first).astype(int)) + 1
+        return days * 8 if timestep == "3h" else days
+    if timestep == "8day":
+        # Composites start on day-of-year 1, 9, 17, ...
+        days = np.arange(first, last + 1)
+        day_of_year = (days - days.astype("datetime64[Y]")).astype(int)
+        return int(np.count_nonzero(day_of_year % 8 == 0))
+    if timestep == "month":
+        return int((last.astype("datetime64[M]") - first.astype("datetime64[M]")).astype(int)) + 1
+    if timestep == "year":
+        return int((last.astype("datetime64[Y]") - first.astype("datetime64[Y]")).astype(int)) + 1
+    raise ValueError(f"unknown timestep {timestep}")
+
+
+# ---------- Plan ----------
+def _suggest(sources, target: Grid, ram_bytes: float, cores: int) -> dict:
+    # Most workers (then tallest bands, up to the harmonizer default) whose peak fits the budget
+    budget = ram_bytes * (1 - RAM_HEADROOM)
+
+    def peak(workers, band_rows):
+        band = max(intro_harmonize.band_memory_bytes(src, target, band_rows) for src in sources)
+        return PROCESS_BYTES + workers * (PROCESS_BYTES + band)
+
+    for workers in range(cores, 0, -1):
+        hi = intro_harmonize.default_band_rows(target, workers)
+        if peak(workers, 1) > budget:
+            continue
+        lo = 1
+        while lo < hi:  # largest band height that fits
+            mid = (lo + hi + 1) // 2
+            lo, hi = (mid, hi) if peak(workers, mid) <= budget else (lo, mid - 1)
+        return {"workers": workers, "band_rows": lo, "peak_bytes": peak(workers, lo),
+                "chunk": (1, lo, target.cols), "chunk_bytes": 4 * lo * target.cols}
+    return None
+
+
+def plan(bbox=None, period=("2015-01", "2024-12"), products=DEFAULT_PRODUCTS, target: str = "wapor_eta",
+         ram_gb: float = 8.0, cores: int = None, polygon=None) -> dict:
+    # Volumes per product and harmonization memory for one basin/period (see main)
+    require_numpy()
+    grids = product_grids()
+    unknown = [p for p in products if p not in grids]
+    if unknown:
+        raise KeyError(f"not gridded catalog products: {', '.join(unknown)}")
+    if polygon is not None and bbox is None:
+        bbox = polygon_bbox(polygon)
+    west, south, east, north = bbox or intro_harmonize.DEFAULT_BBOX
+    if west >= east or south >= north:
+        raise ValueError(f"bbox needs west < east and south < north (got W {west:g}, S {south:g}, "
+                         f"E {east:g}, N {north:g})")
+    if ram_gb <= 0:
+        raise ValueError(f"RAM budget must be positive, not {ram_gb:g} GB")
+    first, last = parse_period(*period)
+    cores = cores or os.cpu_count() or 1
+    selected = [grids[p] for p in products]
+
+    # Native grids covering the bbox on each product's lattice, for all products at once
+    eps = 1e-9
+    step = np.array([g.step_deg for g in selected])
+    cols = np.ceil((east + 180.0) / step - eps) - np.floor((west + 180.0) / step + eps)
+    rows = np.ceil((90.0 - south) / step - eps) - np.floor((90.0 - north) / step + eps)
+    cells = rows * cols
+    tile = np.array([g.tile_deg or np.nan for g in selected])
+    tiled = np.isfinite(tile)
+    with np.errstate(invalid="ignore"):
+        tiles_x = np.floor((east + 180.0) / tile - eps) - np.floor((west + 180.0) / tile) + 1
+        tiles_y = np.floor((90.0 - south) / tile - eps) - np.floor((90.0 - north) / tile) + 1
+        tile_cells = np.round(tile / step) ** 2
+    tiles = np.where(tiled, tiles_x * tiles_y, 1)
+    steps = np.array([count_steps(g.timestep, first, last) for g in selected], dtype=np.float64)
+    per_file = np.array([g.steps_per_file for g in selected])
+    value_bytes = np.array([g.value_bytes for g in selected])
+    ratio = np.array([g.compression for g in selected])
+    files = tiles * np.ceil(steps / per_file)
+    raw = cells * steps * value_bytes
+    compressed = raw * ratio
+    download = np.where(tiled, tiles * tile_cells * steps * value_bytes * ratio, compressed)
+
+    target_grid = Grid.covering((west, south, east, north), intro_harmonize.parse_step(target))
+    harmonized = target_grid.rows * target_grid.cols * steps * 4
+    if polygon is not None:
+        mask = polygon_mask(polygon, target_grid)
+        area_km2 = float((mask.sum(axis=1) * row_cell_area_km2(target_grid)).sum())
+        basin_cells = int(mask.sum())
+    else:
+        area_km2 = float(row_cell_area_km2(target_grid).sum() * target_grid.cols)
+        basin_cells = target_grid.rows * target_grid.cols
+
+    # Harmonization memory: default settings on all cores, and the best fit to the budget
+    sources = [Grid.covering((west, south, east, north), g.step_deg, pad_cells=1) for g in selected]
+    default_rows = intro_harmonize.default_band_rows(target_grid, cores)
+    default_peak = PROCESS_BYTES + cores * (PROCESS_BYTES + max(
+        intro_harmonize.band_memory_bytes(src, target_grid, default_rows) for src in sources))
+    ram_bytes = ram_gb * 1024 ** 3
+
+    rows_out = []
+    for i, g in enumerate(selected):
+        rows_out.append({
+            "id": g.id, "name": g.name, "step_deg": g.step_deg, "timestep": g.timestep,
+            "grid": (int(rows[i]), int(cols[i])), "steps": int(steps[i]), "tiles": int(tiles[i]),
+            "files": int(files[i]), "raw_bytes": float(raw[i]), "compressed_bytes": float(compressed[i]),
+            "download_bytes": float(download[i]), "harmonized_bytes": float(harmonized[i])})
+    return {
+        "bbox": (west, south, east, north), "period": (str(first), str(last)),
+        "target": target_grid.to_json(), "area_km2": area_km2, "basin_cells": basin_cells,
+        "products": rows_out,
+        "totals": {"files": int(files.sum()), "raw_bytes": float(raw.sum()),
+                   "compressed_bytes": float(compressed.sum()), "download_bytes": float(download.sum()),
+                   "harmonized_bytes": float(harmonized.sum())},
+        "memory": {"ram_bytes": ram_bytes, "cores": cores, "default": {
+            "workers": cores, "band_rows": default_rows, "peak_bytes": default_peak,
+            "fits": default_peak <= ram_bytes * (1 - RAM_HEADROOM)},
+            "suggested": _suggest(sources, target_grid, ram_bytes, cores)},
+    }
+
+
+def format_plan(report: dict) -> str:
+    target = Grid(**report["target"])
+    west, south, east, north = report["bbox"]
+    lines = [f"basin {west:g}..{east:g}°E {south:g}..{north:g}°N, {report['area_km2']:,.0f} km2, "
+             f"{report['period'][0]} .. {report['period'][1]}",
+             f"{'product':<14}{'step':>10}{'grid':>12}{'time':>7}{'steps':>7}{'files':>8}"
+             f"{'raw':>11}{'compressed':>12}{'download':>11}{'harmonized':>12}"]
+    for p in report["products"]:
+        lines.append(f"{p['id']:<14}{p['step_deg']:>10.5f}{p['grid'][0]:>6}x{p['grid'][1]:<5}{p['timestep']:>7}"
+                     f"{p['steps']:>7}{p['files']:>8,d}{format_bytes(p['raw_bytes']):>11}"
+                     f"{format_bytes(p['compressed_bytes']):>12}{format_bytes(p['download_bytes']):>11}"
+                     f"{format_bytes(p['harmonized_bytes']):>12}")
+    t = report["totals"]
+    lines.append(f"{'total':<14}{'':>10}{'':>12}{'':>7}{'':>7}{t['files']:>8,d}{format_bytes(t['raw_bytes']):>11}"
+                 f"{format_bytes(t['compressed_bytes']):>12}{format_bytes(t['download_bytes']):>11}"
+                 f"{format_bytes(t['harmonized_bytes']):>12}")
+    memory = report["memory"]
+    default, suggested = memory["default"], memory["suggested"]
+    lines.append(f"harmonize onto {target.rows}x{target.cols} at {target.step_x:.6g}°: "
+                 f"{default['workers']} workers x {default['band_rows']}-row bands peak "
+                 f"{format_bytes(default['peak_bytes'])} ({'fits' if default['fits'] else 'exceeds'} "
+                 f"{format_bytes(memory['ram_bytes'])})")
+    if suggested is None:
+        lines.append("no worker layout fits the RAM budget; use a smaller basin or a coarser target")
+    else:
+        lines.append(f"suggested: --workers {suggested['workers']} --band-rows {suggested['band_rows']} "
+                     f"(peak {format_bytes(suggested['peak_bytes'])}, output chunks "
+                     f"{suggested['chunk']} = {format_bytes(suggested['chunk_bytes'])})")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Estimate acquisition volumes and harmonization memory")
+    area = parser.add_mutually_exclusive_group()
+    area.add_argument("--bbox", nargs=4, type=float, metavar=("W", "S", "E", "N"),
+                      help=f"basin bounding box (default {' '.join(map(str, intro_harmonize.DEFAULT_BBOX))})")
+    area.add_argument("--polygon", help="basin outline as GeoJSON")
+    parser.add_argument("--period", nargs=2, default=("2015-01", "2024-12"), metavar=("START", "END"),
+                        help="YYYY[-MM[-DD]] bounds, inclusive")
+    parser.add_argument("--products", nargs="+", default=DEFAULT_PRODUCTS, metavar="ID",
+                        help="catalog ids ('all' for every gridded product)")
+    parser.add_argument("--target", default="wapor_eta", help="harmonized grid: catalog id, degrees or metres")
+    parser.add_argument("--ram", type=float, default=8.0, help="RAM budget per node in GB")
+    parser.add_argument("--cores", type=int, help="cores per node (default: this machine)")
+    parser.add_argument("--json", action="store_true", help="print the plan as JSON")
+    args = parser.parse_args(argv)
+    require_numpy()
+
+    products = list(product_grids()) if args.products == ["all"] else args.products
+    polygon = load_polygon(args.polygon) if args.polygon else None
+    try:
+        report = plan(args.bbox, args.period, products, args.target, args.ram, args.cores, polygon)
+    except (KeyError, ValueError) as exc:
+        print(f"planner: {exc}", file=sys.stderr)
+        return 2
+    print(json.dumps(report, indent=2) if args.json else format_plan(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,511 @@
+# intro_preview.py
+# Preview thumbnails for Data Sources entries that have a local copy
+# - A catalog entry's local copy is its "local" field, or the first file named
+#   after its id in $WA_INTRO_DATA (os.pathsep-separated) or in data/ next to
+#   this module (chirps.nc, wapor_eta_2015_2024.tif, mod15_lai.npy, ...)
+# - Only a sample of the raster is read: strided reads through np.memmap
+#   (.npy), strided slices through intro_harmonize.NetCDFSource (NetCDF, needs
+#   netCDF4), or the smallest fitting overview of a GeoTIFF through mmap
+#   (stdlib TIFF reader below: strips or tiles, uncompressed or deflate with
+#   integer/float predictor, BigTIFF)
+# - A preview is a small RGBA map (mean of a few time steps, 2-98 % stretch) and
+#   a sparkline of spatial means per time step (or per band)
+# - Previews are cached in the shared DiskCache (LRU eviction) keyed by path,
+#   mtime and size, so a warm Data Sources tab reads a few KB per entry
+#
+# Usage:
+#   python intro_preview.py [ID ...]      # build/time previews of local copies
+#   python intro_preview.py --check       # TIFF decoder round trip (dtypes, predictors, deflate)
+
+import argparse
+import hashlib
+import io
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import warnings
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from intro_cache import DiskCache
+from intro_catalog import load_catalog
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIRS_ENV = "WA_INTRO_DATA"
+SUFFIXES = (".npy", ".nc", ".nc4", ".tif", ".tiff")
+PREVIEW_VERSION = 2
+THUMB_PX = 64            # longest side of the cached map
+MAP_STEPS = 12           # time steps averaged into the map
+SERIES_POINTS = 16       # per side, sampled per time step for the sparkline
+MAX_SERIES = 240         # time steps in the sparkline (strided beyond)
+# Viridis anchors, interpolated into a 256-entry lookup table
+_ANCHORS = ((68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37))
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("previews need numpy (pip install numpy)")
+
+
+# ---------- Local copies ----------
+def data_dirs():
+    dirs = [d for d in os.environ.get(DATA_DIRS_ENV, "").split(os.pathsep) if d]
+    return dirs + [os.path.join(BASE_DIR, "data")]
+
+
+_listings = {}
+
+
+def _listing(directory: str):
+    # Sorted raster file names of a directory, re-read only when it changes
+    try:
+        stamp = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+    cached = _listings.get(directory)
+    if cached is None or cached[0] != stamp:
+        names = sorted(n for n in os.listdir(directory) if n.lower().endswith(SUFFIXES))
+        cached = _listings[directory] = (stamp, names)
+    return cached[1]
+
+
+def find_local(row: dict, dirs=None):
+    # Path of the entry's local copy, or None
+    explicit = row.get("local")
+    if explicit:
+        path = explicit if os.path.isabs(explicit) else os.path.join(BASE_DIR, explicit)
+        return path if os.path.exists(path) else None
+    dataset_id = row.get("id", "").lower()
+    if not dataset_id:
+        return None
+    for directory in dirs or data_dirs():
+        for name in _listing(directory):
+            stem = os.path.splitext(name)[0].lower()
+            if stem == dataset_id or stem.startswith((dataset_id + "_", dataset_id + ".")):
+                return os.path.join(directory, name)
+    return None
+
+
+# ---------- GeoTIFF ----------
+_TIFF_TYPES = {1: "B", 2: "s", 3: "H", 4: "I", 5: "II", 6: "b", 7: "B", 8: "h", 9: "i", 10: "ii",
+               11: "f", 12: "d", 16: "Q", 17: "q", 18: "Q"}
+_DEFLATE = (8, 32946)
+
+
+class TiffRaster:
+    # Minimal memory-mapped (Geo)TIFF reader for previews: picks an image file
+    # directory (full resolution or an overview) and reads single pixels on a
+    # row/column lattice, decoding only the strips or tiles that contain them
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._order = {b"II": "<", b"MM": ">"}.get(self._mm[:2])
+        if self._order is None:
+            self.close()
+            raise ValueError(f"{path}: not a TIFF file")
+        magic = self._unpack("H", 2)[0]
+        self._big = magic == 43
+        offset = self._unpack("Q", 8)[0] if self._big else self._unpack("I", 4)[0]
+        self.images = []
+        while offset and len(self.images) < 64:
+            ifd, offset = self._read_ifd(offset)
+            subfile = ifd.get(254, (0,))[0]
+            if subfile & 4:  # transparency masks
+                continue
+            self.images.append(self._image(ifd))
+        if not self.images:
+            self.close()
+            raise ValueError(f"{path}: no images")
+        # Overviews are only usable with the same layout as the full image
+        full = self.images[0]
+        self.images = [full] + [im for im in self.images[1:] if im["bands"] == full["bands"]
+                                and im["dtype"] == full["dtype"] and im["width"] < full["width"]]
+
+    def _unpack(self, fmt: str, offset: int):
+        return struct.unpack_from(self._order + fmt, self._mm, offset)
+
+    def _read_ifd(self, offset: int):
+        count_fmt, entry_size, value_size = ("Q", 20, 8) if self._big else ("H", 12, 4)
+        count = self._unpack(count_fmt, offset)[0]
+        pos = offset + (8 if self._big else 2)
+        ifd = {}
+        for _ in range(count):
+            tag, kind = self._unpack("HH", pos)
+            n = self._unpack("Q" if self._big else "I", pos + 4)[0]
+            fmt = _TIFF_TYPES.get(kind)
+            if fmt is not None:
+                size = struct.calcsize(self._order + fmt) * n
+                where = pos + 4 + value_size
+                if size > value_size:
+                    where = self._unpack("Q" if self._big else "I", pos + 4 + value_size)[0]
+                if fmt == "s":
+                    ifd[tag] = bytes(self._mm[where:where + n]).rstrip(b"\0").decode("latin-1")
+                else:
+                    ifd[tag] = struct.unpack_from(self._order + fmt * n, self._mm, where)
+            pos += entry_size
+        return ifd, self._unpack("Q" if self._big else "I", pos)[0]
+
+    def _image(self, ifd: dict) -> dict:
+        width, height = ifd[256][0], ifd[257][0]
+        bits = ifd.get(258, (1,))[0]
+        kind = {1: "u", 2: "i", 3: "f"}[ifd.get(339, (1,))[0]]
+        if bits not in (8, 16, 32, 64):
+            raise ValueError(f"unsupported TIFF sample size: {bits} bits")
+        tiled = 322 in ifd
+        nodata = ifd.get(42113)
+        try:
+            nodata = float(nodata) if nodata is not None else None
+        except ValueError:
+            nodata = None
+        return {
+            "width": width, "height": height, "bands": ifd.get(277, (1,))[0], "planar": ifd.get(284, (1,))[0],
+            "dtype": np.dtype(f"{self._order}{kind}{bits // 8}"), "compression": ifd.get(259, (1,))[0],
+            "predictor": ifd.get(317, (1,))[0], "nodata": nodata,
+            "block": (ifd[323][0], ifd[322][0]) if tiled else (min(ifd.get(278, (height,))[0], height), width),
+            "offsets": ifd[324] if tiled else ifd[273], "counts": ifd[325] if tiled else ifd[279],
+        }
+
+    @property
+    def shape(self):
+        full = self.images[0]
+        return full["bands"], full["height"], full["width"]
+
+    def overview(self, longest: int) -> dict:
+        # Smallest image whose longest side still covers `longest` pixels
+        fitting = [im for im in self.images if max(im["width"], im["height"]) >= longest]
+        return min(fitting, key=lambda im: im["width"]) if fitting else self.images[0]
+
+    def _block(self, image: dict, index: int, band: int):
+        # One decoded strip/tile as (block rows, block cols, bands or 1)
+        rows, cols = image["block"]
+        if image["planar"] == 2:
+            index += band * (len(image["offsets"]) // image["bands"])
+        start, size = image["offsets"][index], image["counts"][index]
+        if image["compression"] in _DEFLATE:
+            raw = zlib.decompress(self._mm[start:start + size])
+        elif image["compression"] == 1:
+            raw = memoryview(self._mm)[start:start + size]  # no copy: only sampled pages are read
+        else:
+            raise ValueError(f"unsupported TIFF compression {image['compression']}")
+        samples = 1 if image["planar"] == 2 else image["bands"]
+        dtype = image["dtype"]
+        usable = len(raw) // (cols * samples * dtype.itemsize)
+        if image["predictor"] == 3:
+            # Floating point predictor: byte-differenced rows of byte planes, most significant first
+            planes = np.frombuffer(raw, np.uint8)[:usable * cols * samples * dtype.itemsize].reshape(usable, -1)
+            planes = np.cumsum(planes, axis=1, dtype=np.uint8).reshape(usable, dtype.itemsize, cols * samples)
+            data = np.ascontiguousarray(planes.transpose(0, 2, 1)[..., ::-1]).view(dtype.newbyteorder("<"))
+        else:
+            data = np.frombuffer(raw, dtype=dtype, count=usable * cols * samples)
+            if image["predictor"] == 2:
+                # Horizontal differencing works on the (native) integer bit patterns, floats included
+                native, unsigned = dtype.newbyteorder("="), np.dtype(f"u{dtype.itemsize}")
+                bits = data.astype(native).view(unsigned).reshape(usable, cols, samples)
+                data = np.cumsum(bits, axis=1, dtype=unsigned).view(native)
+            elif image["predictor"] != 1:
+                raise ValueError(f"unsupported TIFF predictor {image['predictor']}")
+        return data.reshape(usable, cols, samples)[:rows]
+
+    def read(self, image: dict, rows, cols, bands=(0,)):
+        # Pixels at rows x cols (sorted index arrays) of some bands, as float32
+        # (bands, rows, cols) with NaN gaps; each strip/tile is decoded once
+        block_rows, block_cols = image["block"]
+        per_row = -(-image["width"] // block_cols)
+        bands = list(bands)
+        out = np.empty((len(bands), len(rows), len(cols)), dtype=np.float32)
+        block_of_col = cols // block_cols
+        for block_row in np.unique(rows // block_rows):
+            row_sel = np.nonzero(rows // block_rows == block_row)[0]
+            local_rows = rows[row_sel] - block_row * block_rows
+            for block_col in np.unique(block_of_col):
+                col_sel = np.nonzero(block_of_col == block_col)[0]
+                index = int(block_row * per_row + block_col)
+                local_cols = cols[col_sel] - block_col * block_cols
+                if image["planar"] == 2:
+                    picked = [(self._block(image, index, band), 0) for band in bands]
+                else:
+                    block = self._block(image, index, 0)
+                    picked = [(block, band) for band in bands]
+                for i, (block, sample) in enumerate(picked):
+                    rr = np.minimum(local_rows, len(block) - 1)
+                    out[i][np.ix_(row_sel, col_sel)] = block[np.ix_(rr, local_cols)][..., sample]
+        if image["nodata"] is not None:
+            out[out == np.float32(image["nodata"])] = np.nan
+        return out
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # a sampled block is still referenced (error traceback); the map goes with it
+        finally:
+            self._file.close()
+
+
+def write_tiff(path: str, stack, predictor: int = 1, deflate: bool = True, strip_rows: int = 16):
+    # Minimal little-endian striped TIFF of a (bands, rows, cols) stack with
+    # pixel-interleaved bands, encoded like GDAL's PREDICTOR / COMPRESS options
+    bands, rows, cols = stack.shape
+    dtype = np.dtype(stack.dtype).newbyteorder("<")
+    pixels = np.ascontiguousarray(np.moveaxis(stack, 0, -1), dtype=dtype)
+    strips = []
+    for top in range(0, rows, strip_rows):
+        block = pixels[top:top + strip_rows]
+        if predictor == 2:
+            unsigned = np.dtype(f"<u{dtype.itemsize}")
+            block = np.diff(block.view(unsigned), axis=1, prepend=unsigned.type(0))
+        elif predictor == 3:
+            planes = block.view(np.uint8).reshape(len(block), -1, dtype.itemsize)[..., ::-1]
+            planes = planes.transpose(0, 2, 1).reshape(len(block), -1)
+            block = np.diff(planes, axis=1, prepend=np.uint8(0))
+        data = block.tobytes()
+        strips.append(zlib.compress(data) if deflate else data)
+    kind = {"u": 1, "i": 2, "f": 3}[dtype.kind]
+    offsets = [8]
+    for data in strips[:-1]:
+        offsets.append(offsets[-1] + len(data))
+    tags = [(256, 4, [cols]), (257, 4, [rows]), (258, 3, [8 * dtype.itemsize] * bands),
+            (259, 3, [8 if deflate else 1]), (262, 3, [1]), (273, 4, offsets), (277, 3, [bands]),
+            (278, 4, [strip_rows]), (279, 4, [len(data) for data in strips]), (284, 3, [1]),
+            (317, 3, [predictor]), (339, 3, [kind] * bands)]
+    body = b"".join(strips)
+    extra = bytearray()
+    ifd_at = 8 + len(body)
+    extra_at = ifd_at + 2 + 12 * len(tags) + 4
+    entries = []
+    for tag, kind_, values in tags:
+        packed = struct.pack(f"<{len(values)}{'H' if kind_ == 3 else 'I'}", *values)
+        if len(packed) > 4:
+            entries.append(struct.pack("<HHII", tag, kind_, len(values), extra_at + len(extra)))
+            extra += packed
+        else:
+            entries.append(struct.pack("<HHI", tag, kind_, len(values)) + packed.ljust(4, b"\0"))
+    with open(path, "wb") as f:
+        f.write(b"II" + struct.pack("<HI", 42, ifd_at) + body)
+        f.write(struct.pack("<H", len(entries)) + b"".join(entries) + struct.pack("<I", 0) + extra)
+
+
+def check() -> list:
+    # Writes and decodes small TIFFs in every supported encoding; returns failures
+    require_numpy()
+    rng = np.random.default_rng(0)
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="wa_preview_") as scratch:
+        for dtype, predictors in (("float32", (1, 2, 3)), ("float64", (1, 2, 3)), ("int16", (1, 2)),
+                                  ("uint8", (1, 2))):
+            stack = (rng.normal(0, 1000, (3, 37, 45)) if dtype.startswith("float")
+                     else rng.integers(0, 200, (3, 37, 45))).astype(dtype)
+            for predictor in predictors:
+                for deflate in (False, True):
+                    label = f"{dtype} predictor {predictor} {'deflate' if deflate else 'raw'}"
+                    path = os.path.join(scratch, f"{label.replace(' ', '_')}.tif")
+                    write_tiff(path, stack, predictor, deflate)
+                    raster = TiffRaster(path)
+                    try:
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("error")
+                            image = raster.images[0]
+                            decoded = raster.read(image, np.arange(37), np.arange(45), range(3))
+                    except (ValueError, RuntimeWarning) as exc:
+                        failures.append(f"{label}: {exc}")
+                        continue
+                    finally:
+                        raster.close()
+                    if not np.array_equal(decoded, stack.astype(np.float32)):
+                        failures.append(f"{label}: decoded values differ")
+    return failures
+
+
+# ---------- Sampling ----------
+def _lattice(n: int, points: int):
+    # Up to `points` evenly spread indices, centred in their strides
+    step = max(1, -(-n // points))
+    return np.arange(step // 2, n, step)
+
+
+def _spatial_mean(block) -> float:
+    finite = block[np.isfinite(block)]
+    return float(finite.mean()) if finite.size else np.nan
+
+
+def _sample_array(data, steps: int):
+    # data: (T, rows, cols) array-like supporting strided basic slicing
+    rows, cols = data.shape[-2:]
+    step = max(1, -(-max(rows, cols) // THUMB_PX))
+    picks = np.unique(np.linspace(0, steps - 1, min(steps, MAP_STEPS)).round().astype(int))
+    stack = np.stack([np.asarray(data[t, step // 2::step, step // 2::step], dtype=np.float32) for t in picks])
+    finite = np.isfinite(stack)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        image = np.where(finite, stack, 0).sum(axis=0) / finite.sum(axis=0)  # NaN where never valid
+    series = []
+    if steps > 1:
+        sy, sx = max(1, rows // SERIES_POINTS), max(1, cols // SERIES_POINTS)
+        for t in _lattice(steps, MAX_SERIES) if steps > MAX_SERIES else range(steps):
+            series.append(_spatial_mean(np.asarray(data[t, sy // 2::sy, sx // 2::sx], dtype=np.float32)))
+    return image, series
+
+
+def _sample_npy(path: str):
+    data = np.load(path, mmap_mode="r")
+    if data.ndim == 2:
+        data = data[None]
+    elif data.ndim != 3:
+        raise ValueError(f"{path}: expected a (rows, cols) or (T, rows, cols) array")
+    image, series = _sample_array(data, data.shape[0])
+    return image, series, data.shape
+
+
+class _NetCDFStack:
+    # (T, rows, cols) view of a NetCDFSource for _sample_array's strided reads
+    def __init__(self, source):
+        self.source = source
+        self.shape = (source.steps, source.grid.rows, source.grid.cols)
+
+    def __getitem__(self, key):
+        return self.source.read(*key)
+
+
+def _sample_netcdf(path: str):
+    import intro_harmonize
+    source = intro_harmonize.NetCDFSource(path)
+    try:
+        stack = _NetCDFStack(source)
+        image, series = _sample_array(stack, stack.shape[0])
+        return image, series, stack.shape
+    finally:
+        source.close()
+
+
+def _sample_tiff(path: str):
+    raster = TiffRaster(path)
+    try:
+        bands, height, width = raster.shape
+        image = raster.overview(THUMB_PX)
+        longest = max(height, width)
+        rows = _lattice(image["height"], max(1, round(THUMB_PX * height / longest)))
+        cols = _lattice(image["width"], max(1, round(THUMB_PX * width / longest)))
+        picture = raster.read(image, rows, cols)[0]
+        series = []
+        if bands > 1:
+            # Bands of a stacked GeoTIFF are usually time steps
+            small = raster.overview(SERIES_POINTS)
+            srows, scols = _lattice(small["height"], SERIES_POINTS), _lattice(small["width"], SERIES_POINTS)
+            picks = _lattice(bands, MAX_SERIES) if bands > MAX_SERIES else range(bands)
+            series = [_spatial_mean(block) for block in raster.read(small, srows, scols, picks)]
+        return picture, series, (bands, height, width)
+    finally:
+        raster.close()
+
+
+def _colorize(values):
+    # float map -> (h, w, 4) uint8 RGBA and the stretched value range
+    finite = values[np.isfinite(values)]
+    lo, hi = (np.percentile(finite, (2, 98)) if finite.size else (0.0, 1.0))
+    hi = hi if hi > lo else lo + 1.0
+    anchors = np.array(_ANCHORS, dtype=np.float32)
+    positions = np.linspace(0, 255, len(anchors))
+    lut = np.stack([np.interp(np.arange(256), positions, anchors[:, c]) for c in range(3)], axis=1)
+    with np.errstate(invalid="ignore"):
+        index = np.clip((values - lo) / (hi - lo) * 255, 0, 255)
+    index = np.nan_to_num(index).astype(np.uint8)
+    rgba = np.empty(values.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = lut[index].astype(np.uint8)
+    rgba[..., 3] = np.where(np.isfinite(values), 255, 0)
+    return rgba, (float(lo), float(hi))
+
+
+def build_preview(path: str) -> dict:
+    # {"image": (h, w, 4) uint8, "series": float32 array, "range": (lo, hi), "shape": full shape}
+    require_numpy()
+    lower = path.lower()
+    if lower.endswith(".npy"):
+        values, series, shape = _sample_npy(path)
+    elif lower.endswith((".nc", ".nc4")):
+        values, series, shape = _sample_netcdf(path)
+    elif lower.endswith((".tif", ".tiff")):
+        values, series, shape = _sample_tiff(path)
+    else:
+        raise ValueError(f"{path}: no preview for this format")
+    image, value_range = _colorize(np.asarray(values, dtype=np.float32))
+    return {"image": image, "series": np.asarray(series, dtype=np.float32),
+            "range": np.asarray(value_range), "shape": np.asarray(shape)}
+
+
+def preview(path: str, cache: DiskCache = None):
+    # Cached preview of a local raster: (preview dict, True if it came from the cache)
+    require_numpy()
+    cache = cache or DiskCache()
+    st = os.stat(path)
+    stamp = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{PREVIEW_VERSION}|{THUMB_PX}"
+    key = "thumb_" + hashlib.sha1(stamp.encode("utf-8")).hexdigest()[:20] + ".npz"
+    cached = cache.get(key)
+    if cached is not None:
+        try:
+            with np.load(cached) as z:
+                return {name: z[name] for name in z.files}, True
+        except (OSError, ValueError):
+            pass  # damaged entry: rebuild
+    result = build_preview(path)
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **result)
+    try:
+        cache.put(key, buf.getvalue())
+    except OSError:
+        pass
+    return result, False
+
+
+def dataset_preview(row: dict, cache: DiskCache = None):
+    # (local path, preview dict, cached) for a catalog row, or None without a local copy
+    path = find_local(row)
+    if path is None:
+        return None
+    result, cached = preview(path, cache)
+    return path, result, cached
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build preview thumbnails of local dataset copies")
+    parser.add_argument("ids", nargs="*", help="catalog ids (default: all)")
+    parser.add_argument("--check", action="store_true", help="round-trip the TIFF decoder and exit")
+    args = parser.parse_args(argv)
+    require_numpy()
+    if args.check:
+        failures = check()
+        print("\n".join(failures) or "TIFF round trip: all encodings decode exactly")
+        return 1 if failures else 0
+
+    rows = [r for r in load_catalog() if not args.ids or r.get("id") in args.ids]
+    print(f"looking in: {os.pathsep.join(data_dirs())}")
+    status = 0
+    for row in rows:
+        began = time.perf_counter()
+        try:
+            found = dataset_preview(row)
+        except (OSError, ValueError, KeyError, RuntimeError) as exc:
+            print(f"{row['id']:<16} error: {exc}")
+            status = 1
+            continue
+        if found is None:
+            continue
+        path, result, cached = found
+        lo, hi = result["range"]
+        print(f"{row['id']:<16} {'x'.join(map(str, result['shape'])):>18}  {len(result['series']):>4} steps  "
+              f"range {lo:.3g}..{hi:.3g}  {'cached' if cached else 'built '} "
+              f"{1000 * (time.perf_counter() - began):7.1f} ms  {path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# intro_search.py
+# Full-text search over the intro content blocks
+# - Inverted index (token -> block -> character offsets) over the plain text of
+#   every HTML block, with prefix matching on the last query token
+# - Persisted as JSON next to the other intro caches, keyed per block by a
+#   content hash, so a launch only re-indexes blocks whose HTML changed
+# - Subscripts are indexed both as displayed ("ETblue") and as written in the
+#   docs ("ET_blue"), so either spelling finds the equation terms
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from html.parser import HTMLParser
+
+INDEX_VERSION = 1
+SNIPPET_CHARS = 48
+
+_WORD = re.compile(r"\w+")
+_BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "ul", "ol", "table"}
+
+
+class _TextExtractor(HTMLParser):
+    # Plain text as a QTextDocument would display it, plus "_"-joined aliases
+    # for words followed by a subscript
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.aliases = []  # (offset, alias token, displayed text)
+        self._length = 0
+        self._skip = 0
+        self._sub_start = None
+        self._base = None
+
+    def _emit(self, text: str):
+        self.parts.append(text)
+        self._length += len(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("style", "script"):
+            self._skip += 1
+        elif tag == "sub":
+            text = "".join(self.parts)
+            match = re.search(r"(\w+)$", text)
+            self._base = (match.start(), match.group(1)) if match else None
+            self._sub_start = self._length
+        elif tag in _BLOCK_TAGS and self._length:
+            self._emit("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("style", "script"):
+            self._skip = max(0, self._skip - 1)
+        elif tag == "sub" and self._sub_start is not None:
+            sub = "".join(self.parts)[self._sub_start:]
+            if self._base and _WORD.fullmatch(sub.strip() or "-"):
+                start, base = self._base
+                self.aliases.append((start, f"{base}_{sub.strip()}".lower(), base + sub.strip()))
+            self._sub_start = self._base = None
+        elif tag in _BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._emit(re.sub(r"\s+", " ", data))
+
+
+def html_to_text(html: str):
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return "".join(parser.parts), parser.aliases
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+
+class SearchIndex:
+    def __init__(self):
+        self.blocks = {}    # block id -> {"hash", "text"}
+        self.postings = {}  # token -> {block id: [offsets]}
+        self._vocab = None  # sorted tokens for prefix lookups
+        self._dirty = False
+
+    # ---------- Building ----------
+    def update(self, blocks: dict) -> list:
+        # Re-index only blocks whose HTML hash changed; returns the changed ids
+        changed = []
+        for block_id in [b for b in self.blocks if b not in blocks]:
+            self._remove(block_id)
+            changed.append(block_id)
+        for block_id, html in blocks.items():
+            digest = content_hash(html)
+            entry = self.blocks.get(block_id)
+            if entry is not None and entry["hash"] == digest:
+                continue
+            self._remove(block_id)
+            self._add(block_id, digest, html)
+            changed.append(block_id)
+        if changed:
+            self._vocab = sorted(self.postings)
+            self._dirty = True
+        return changed
+
+    def _remove(self, block_id: str):
+        if self.blocks.pop(block_id, None) is None:
+            return
+        for token in [t for t, where in self.postings.items() if block_id in where]:
+            del self.postings[token][block_id]
+            if not self.postings[token]:
+                del self.postings[token]
+
+    def _add(self, block_id: str, digest: str, html: str):
+        text, aliases = html_to_text(html)
+        self.blocks[block_id] = {"hash": digest, "text": text}
+        for match in _WORD.finditer(text):
+            self.postings.setdefault(match.group(0).lower(), {}).setdefault(block_id, []).append(match.start())
+        for offset, alias, _ in aliases:
+            self.postings.setdefault(alias, {}).setdefault(block_id, []).append(offset)
+
+    # ---------- Persistence ----------
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        index = cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                index.blocks, index.postings = data["blocks"], data["postings"]
+        except (OSError, ValueError, KeyError):
+            pass
+        index._vocab = sorted(index.postings)
+        return index
+
+    def save(self, path: str):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "blocks": self.blocks, "postings": self.postings}, f)
+        os.replace(tmp, path)
+        self._dirty = False
+
+    # ---------- Querying ----------
+    def _tokens_with_prefix(self, prefix: str):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        i = bisect.bisect_left(self._vocab, prefix)
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            yield self._vocab[i]
+            i += 1
+
+    def search(self, query: str, limit: int = 20) -> list:
+        # Results: dicts with block, offset, match (text as displayed), snippet.
+        # All tokens must occur in the block; the last one may be a prefix.
+        tokens = [t.lower() for t in _WORD.findall(query)]
+        if not tokens:
+            return []
+        *exact, last = tokens
+        blocks = None
+        for token in exact:
+            where = set(self.postings.get(token, ()))
+            blocks = where if blocks is None else blocks & where
+        hits = {}  # block -> [(offset, token)]
+        for token in self._tokens_with_prefix(last):
+            for block_id, offsets in self.postings[token].items():
+                if blocks is None or block_id in blocks:
+                    hits.setdefault(block_id, []).extend((o, token) for o in offsets)
+
+        results = []
+        for block_id in sorted(hits, key=lambda b: -len(hits[b])):
+            text = self.blocks[block_id]["text"]
+            for offset, token in sorted(hits[block_id])[:limit]:
+                match = re.match(r"\w+", text[offset:])
+                shown = match.group(0) if match else token
+                start = max(0, offset - SNIPPET_CHARS)
+                snippet = re.sub(r"\s+", " ", text[start:offset + len(shown) + SNIPPET_CHARS]).strip()
+                # Which occurrence of the displayed word this is, to find it again in the widget
+                occurrence = text[:offset].lower().count(shown.lower())
+                results.append({"block": block_id, "offset": offset, "match": shown, "occurrence": occurrence,
+                                "snippet": ("..." if start else "") + snippet + "..."})
+                if len(results) >= limit:
+                    return results
+        return results
@@ -0,0 +1,104 @@
+# intro_trace.py
+# Opt-in hot-path tracing for the intro window
+# - Nested timing spans recorded as Chrome trace events ("ph": "X"), viewable in
+#   chrome://tracing or https://ui.perfetto.dev
+# - Enabled with WA_INTRO_TRACE=<path> or `python intro.py --trace [path]`
+# - Disabled tracing costs one attribute check per span
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_TRACE = "intro_trace.json"
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, path: str = DEFAULT_TRACE):
+        self.enabled = True
+        self.path = path
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000.0
+
+    def _record(self, event: dict):
+        event.setdefault("pid", os.getpid())
+        event.setdefault("tid", threading.get_ident())
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "intro", **args):
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": self._now_us() - start}
+            if args:
+                event["args"] = args
+            self._record(event)
+
+    def complete(self, name: str, start_us: float, cat: str = "intro", **args):
+        # Span whose start was captured earlier with now_us() (e.g. show -> first paint)
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": cat, "ph": "X", "ts": start_us, "dur": self._now_us() - start_us}
+        if args:
+            event["args"] = args
+        self._record(event)
+
+    def now_us(self) -> float:
+        return self._now_us() if self.enabled else 0.0
+
+    def instant(self, name: str, cat: str = "intro", **args):
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._now_us()}
+        if args:
+            event["args"] = args
+        self._record(event)
+
+    def summary(self, top: int = 3) -> str:
+        with self._lock:
+            spans = [e for e in self.events if e["ph"] == "X"]
+        if not spans:
+            return "intro trace: no spans recorded"
+        end = max(e["ts"] + e["dur"] for e in spans)
+        slowest = sorted(spans, key=lambda e: e["dur"], reverse=True)[:top]
+        parts = ", ".join(f"{e['name']} {e['dur'] / 1000.0:.1f} ms" for e in slowest)
+        first_paint = next((e for e in spans if e["name"] == "first paint"), None)
+        paint = f", first paint at {(first_paint['ts'] + first_paint['dur']) / 1000.0:.1f} ms" if first_paint else ""
+        return f"intro trace: {len(spans)} spans over {end / 1000.0:.1f} ms{paint}; slowest: {parts}"
+
+    def write(self, path: str = None) -> str:
+        path = path or self.path or DEFAULT_TRACE
+        with self._lock:
+            events = list(self.events)
+        meta = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "WA+ intro"}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": [meta] + events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def finish(self):
+        # Write the trace file and print the one-line summary; no-op when disabled
+        if not self.enabled:
+            return
+        path = self.write()
+        print(f"{self.summary()} -> {path}", file=sys.stderr)
+
+
+tracer = Tracer()
+if os.environ.get("WA_INTRO_TRACE"):
+    tracer.enable(os.environ["WA_INTRO_TRACE"])